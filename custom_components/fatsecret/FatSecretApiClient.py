@@ -0,0 +1,309 @@
+"""Client for the FatSecret platform API."""
+
+import asyncio
+import logging
+import time
+import urllib.parse
+from collections.abc import Callable
+from datetime import date as date_cls
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .FatSecretMetrics import FatSecretMetrics, RequestTimer
+from .FatSecretRateLimiter import FatSecretRequestBudget
+from .json_stream import async_parse_food_entries
+from .oauth_helpers import (
+    OAuthSigner,
+    oauth_build_base_string,
+    oauth_generate_nonce,
+    oauth_generate_signature,
+)
+
+from .const import (
+    ACCESS_TOKEN_URL,
+    API_FOOD_ENTRIES_URL,
+    FATSECRET_CLOCK_SKEW_TOLERANCE,
+    FATSECRET_EXPIRED_TIMESTAMP_ERROR,
+    FATSECRET_FOOD_ENTRIES_ERRORS,
+    FATSECRET_REQUEST_TIMEOUT,
+    FATSECRET_STREAM_CHUNK_SIZE,
+    OAUTH_CALLBACK,
+    OAUTH_PARAM_CALLBACK,
+    OAUTH_PARAM_CONSUMER_KEY,
+    OAUTH_PARAM_NONCE,
+    OAUTH_PARAM_SIGNATURE,
+    OAUTH_PARAM_SIGNATURE_METHOD,
+    OAUTH_PARAM_TIMESTAMP,
+    OAUTH_PARAM_TOKEN,
+    OAUTH_PARAM_TOKEN_SECRET,
+    OAUTH_PARAM_VERIFIER,
+    OAUTH_PARAM_VERSION,
+    OAUTH_SIGNATURE_METHOD,
+    OAUTH_VERSION,
+    REQUEST_TOKEN_URL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+EPOCH_DATE = date_cls(1970, 1, 1)
+
+
+class FatSecretApiError(UpdateFailed):
+    """Error returned by the FatSecret API."""
+
+    def __init__(
+        self, message: str, code: int | None = None, status: int | None = None
+    ) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.code = code
+        self.status = status
+
+
+class FatSecretBudgetExceeded(FatSecretApiError):
+    """The request budget of the consumer key is exhausted."""
+
+
+def _error_name(err: Exception) -> str:
+    """Return the metrics name of a failed request's error."""
+    if isinstance(err, FatSecretApiError):
+        if err.code is not None:
+            return f"api_{err.code}"
+        if err.status is not None:
+            return f"http_{err.status}"
+        return "invalid_response"
+    return type(err).__name__
+
+
+class FatSecretApiClient:
+    """Signed access to the FatSecret API over a shared aiohttp session.
+
+    The session is owned by Home Assistant (see ``async_get_clientsession``),
+    so every request reuses the same pooled keep-alive connections instead of
+    paying a DNS lookup, TCP connect and TLS handshake each time.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        consumer_key: str,
+        consumer_secret: str,
+        token: str = "",
+        token_secret: str = "",
+        food_entries_url: str = API_FOOD_ENTRIES_URL,
+    ) -> None:
+        """Initialize the client."""
+        self.session = session
+        self.consumer_key = consumer_key
+        self.consumer_secret = consumer_secret
+        self.token = token
+        self.token_secret = token_secret
+        self.food_entries_url = food_entries_url
+        self.request_token_url = REQUEST_TOKEN_URL
+        self.access_token_url = ACCESS_TOKEN_URL
+        self.budget: FatSecretRequestBudget | None = None
+        self.metrics: FatSecretMetrics | None = None
+        # Seconds to add to the local clock to match FatSecret's clock
+        self.clock_offset = 0.0
+        self._food_entries_signer = OAuthSigner(
+            "GET",
+            food_entries_url,
+            {
+                OAUTH_PARAM_CONSUMER_KEY: consumer_key,
+                OAUTH_PARAM_SIGNATURE_METHOD: OAUTH_SIGNATURE_METHOD,
+                OAUTH_PARAM_VERSION: OAUTH_VERSION,
+                OAUTH_PARAM_TOKEN: token,
+            },
+            consumer_secret,
+            token_secret,
+        )
+
+    def _timestamp(self) -> str:
+        """Return the current oauth timestamp on FatSecret's clock."""
+        return str(int(time.time() + self.clock_offset))
+
+    def _oauth_params(self, **extra: str) -> dict:
+        """Return the oauth parameters common to every request."""
+        return {
+            OAUTH_PARAM_CONSUMER_KEY: self.consumer_key,
+            OAUTH_PARAM_NONCE: oauth_generate_nonce(),
+            OAUTH_PARAM_TIMESTAMP: self._timestamp(),
+            OAUTH_PARAM_SIGNATURE_METHOD: OAUTH_SIGNATURE_METHOD,
+            OAUTH_PARAM_VERSION: OAUTH_VERSION,
+            **extra,
+        }
+
+    def _learn_clock_offset(self, resp: aiohttp.ClientResponse) -> None:
+        """Update the clock offset from the Date header of a response."""
+        if (server_date := resp.headers.get("Date")) is None:
+            return
+        try:
+            offset = parsedate_to_datetime(server_date).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return
+        if abs(offset) < FATSECRET_CLOCK_SKEW_TOLERANCE:
+            offset = 0.0
+        if offset != self.clock_offset:
+            _LOGGER.debug("FatSecret clock offset is now %.0f seconds", offset)
+            self.clock_offset = offset
+
+    async def async_get_food_entries(
+        self, day: date_cls, on_entry: Callable[[dict], None]
+    ) -> None:
+        """Stream the food entries of the given local date to ``on_entry``.
+
+        A request rejected for an expired timestamp is signed again with the
+        clock offset learned from the rejection and sent once more.
+        """
+        try:
+            await self._async_get_food_entries(day, on_entry)
+        except FatSecretApiError as err:
+            if err.code != FATSECRET_EXPIRED_TIMESTAMP_ERROR:
+                raise
+            _LOGGER.debug(
+                "FatSecret rejected the timestamp, resending with a %.0fs offset",
+                self.clock_offset,
+            )
+            await self._async_get_food_entries(day, on_entry)
+
+    async def _async_get_food_entries(
+        self, day: date_cls, on_entry: Callable[[dict], None]
+    ) -> None:
+        """Send one signed food-entries/v2 request and stream its entries."""
+        if self.budget is not None and not self.budget.try_acquire():
+            raise FatSecretBudgetExceeded("FatSecret request budget exhausted")
+
+        timer = RequestTimer()
+        try:
+            await self._async_stream_food_entries(day, on_entry, timer)
+        except Exception as err:
+            if self.metrics is not None:
+                self.metrics.record_request(timer, _error_name(err))
+            raise
+        if self.metrics is not None:
+            self.metrics.record_request(timer)
+
+    async def _async_stream_food_entries(
+        self, day: date_cls, on_entry: Callable[[dict], None], timer: RequestTimer
+    ) -> None:
+        """Stream the entries of a day, charging the time to ``timer`` phases."""
+        query_params = {
+            "format": "json",
+            "date": str((day - EPOCH_DATE).days),
+        }
+
+        auth_header = self._food_entries_signer.authorization_header(
+            oauth_generate_nonce(), self._timestamp(), query_params
+        )
+        timer.lap("sign")
+
+        async with (
+            asyncio.timeout(FATSECRET_REQUEST_TIMEOUT),
+            self.session.get(
+                self.food_entries_url,
+                headers={"Authorization": auth_header},
+                params=query_params,
+            ) as resp,
+        ):
+            timer.lap("network")
+            self._learn_clock_offset(resp)
+
+            # 1️⃣ Network-level errors
+            try:
+                resp.raise_for_status()
+            except aiohttp.ClientResponseError as e:
+                raise FatSecretApiError(
+                    f"HTTP error {resp.status}: {e.message}", status=resp.status
+                ) from e
+
+            # 2️⃣ Parse JSON, one entry at a time as the body arrives
+            try:
+                data = await async_parse_food_entries(
+                    timer.chunks(
+                        resp.content.iter_chunked(FATSECRET_STREAM_CHUNK_SIZE)
+                    ),
+                    timer.entries_to(on_entry),
+                )
+                timer.lap("parse")
+            except ValueError as exc:
+                raise FatSecretApiError("FatSecret response is not valid JSON") from exc
+
+        # 3️⃣ API-level error handling (OAuth or API error codes)
+        if isinstance(data, dict) and "error" in data:
+            err = data["error"]
+            code = err.get("code")
+            message = err.get("message", "No message provided")
+
+            # Known OAuth errors
+            if code in FATSECRET_FOOD_ENTRIES_ERRORS:
+                explanation = FATSECRET_FOOD_ENTRIES_ERRORS[code]
+                _LOGGER.error(
+                    "FatSecret API error %s: %s — %s", code, explanation, message
+                )
+                raise FatSecretApiError(f"OAuth error {code}: {explanation}", code)
+
+            # Unknown error code — still raise
+            raise FatSecretApiError(
+                f"FatSecret returned error {code}: {message}", code
+            )
+
+    async def _async_get_token(
+        self, url: str, token_secret: str, **extra: str
+    ) -> dict[str, str]:
+        """Send a signed token request and return its decoded response.
+
+        A request rejected while its response moved the learned clock offset
+        (an expired timestamp) is signed again with the new offset and sent
+        once more, like food-entries requests.
+        """
+        for resend in (True, False):
+            offset = self.clock_offset
+            oauth_params = self._oauth_params(**extra)
+            base_string = oauth_build_base_string("GET", url, oauth_params)
+            oauth_params[OAUTH_PARAM_SIGNATURE] = oauth_generate_signature(
+                base_string, self.consumer_secret, token_secret
+            )
+
+            async with self.session.get(url, params=oauth_params) as resp:
+                self._learn_clock_offset(resp)
+                try:
+                    resp.raise_for_status()
+                except aiohttp.ClientResponseError:
+                    if resend and self.clock_offset != offset:
+                        _LOGGER.debug(
+                            "FatSecret rejected the token request, resending "
+                            "with a %.0fs offset",
+                            self.clock_offset,
+                        )
+                        continue
+                    raise
+                text = await resp.text()
+                _LOGGER.debug("Token response: %s", text)
+            break
+
+        return dict(urllib.parse.parse_qsl(text))
+
+    async def async_get_request_token(self) -> tuple[str, str]:
+        """Request a temporary request token and its secret."""
+        qs = await self._async_get_token(
+            self.request_token_url, "", **{OAUTH_PARAM_CALLBACK: OAUTH_CALLBACK}
+        )
+
+        if OAUTH_PARAM_TOKEN not in qs:
+            raise ValueError(f"Failed to obtain request token: {qs}")
+
+        return qs[OAUTH_PARAM_TOKEN], qs[OAUTH_PARAM_TOKEN_SECRET]
+
+    async def async_get_access_token(
+        self, request_token: str, request_token_secret: str, verifier: str
+    ) -> tuple[str, str]:
+        """Exchange a request token for an access token and its secret."""
+        qs = await self._async_get_token(
+            self.access_token_url,
+            request_token_secret,
+            **{OAUTH_PARAM_TOKEN: request_token, OAUTH_PARAM_VERIFIER: verifier},
+        )
+        return qs[OAUTH_PARAM_TOKEN], qs[OAUTH_PARAM_TOKEN_SECRET]
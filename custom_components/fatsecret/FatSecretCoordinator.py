@@ -1,47 +1,125 @@
 """Module for managing the FatSecret component."""
 
+import asyncio
+import hashlib
 import logging
-import random
 import time
-from datetime import date as date_cls, timedelta
-import aiohttp
+from collections import Counter
+from collections.abc import AsyncIterator, Callable
+from contextlib import aclosing
+from datetime import date as date_cls, datetime, timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_change
 from homeassistant.util import dt as dt_util
 
-from .oauth_helpers import (
-    oauth_build_authorization_header,
-    oauth_build_base_string,
-    oauth_generate_signature,
+from .FatSecretApiClient import FatSecretApiClient, FatSecretBudgetExceeded
+from .FatSecretDiaryCache import FatSecretDiaryCache
+from .FatSecretFoodLog import FoodLogEntry, food_log_of
+from .FatSecretMetrics import FatSecretMetrics
+from .FatSecretPollingScheduler import FatSecretPollingScheduler
+from .FatSecretRateLimiter import async_get_request_budget
+from .FatSecretRollingWindow import FatSecretRollingWindow
+from .FatSecretScheduler import async_get_scheduler
+from .FatSecretStateStore import FatSecretStateStore
+from .aggregation_helpers import FIELDS, NutrientSums
+from .fetch_helpers import async_fetch_in_order
+from .retry_helpers import (
+    ErrorClass,
+    RetryStats,
+    async_call_with_retry,
+    classify_error,
 )
+from .statistics_helpers import async_import_daily_statistics
 
 from .const import (
     CONF_CONSUMER_KEY,
     CONF_CONSUMER_SECRET,
     CONF_TOKEN,
     CONF_TOKEN_SECRET,
-    OAUTH_PARAM_CONSUMER_KEY,
-    OAUTH_PARAM_NONCE,
-    OAUTH_PARAM_TIMESTAMP,
-    OAUTH_PARAM_TOKEN,
-    OAUTH_PARAM_VERSION,
-    OAUTH_PARAM_SIGNATURE,
-    OAUTH_PARAM_SIGNATURE_METHOD,
-    OAUTH_SIGNATURE_METHOD,
-    OAUTH_VERSION,
-    API_FOOD_ENTRIES_URL,
-    FATSECRET_FOOD_ENTRIES,
-    FATSECRET_FOOD_ENTRY,
+    CONF_HOURLY_BUDGET,
+    CONF_DAILY_BUDGET,
+    CONF_FETCH_CONCURRENCY,
+    CONF_FORCED_REFRESH_INTERVAL,
+    CONF_STALE_LIMIT,
+    CONF_TRACKED_FIELDS,
+    FATSECRET_DEFAULT_FORCED_REFRESH_INTERVAL,
+    FATSECRET_DEFAULT_STALE_LIMIT,
+    FATSECRET_DAY_FINALIZE_TIME,
+    FATSECRET_DAY_LATE_FETCH_TIME,
+    FATSECRET_DEFAULT_TRACKED_FIELDS,
+    FATSECRET_DEFAULT_HOURLY_BUDGET,
+    FATSECRET_DEFAULT_DAILY_BUDGET,
+    FATSECRET_ENTRY_KEYS,
+    FATSECRET_DEFAULT_FETCH_CONCURRENCY,
     FATSECRET_FIELDS,
-    DOMAIN,
     FATSECRET_UPDATE_INTERVAL,
-    FATSECRET_FOOD_ENTRIES_ERRORS,
+    FATSECRET_FINGERPRINT_KEYS,
+    FATSECRET_POLL_FAST_INTERVAL,
+    FATSECRET_ROLLING_WINDOWS,
+    ATTR_FOOD_LOG,
+    ATTR_MEALS,
+    ATTR_STALE_SINCE,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+class FoodEntriesFold:
+    """Nutrient sums, fingerprint and compact entries of one diary day.
+
+    Entries are folded in one at a time as they are parsed from the response,
+    so the full payload never has to be held in memory. Only the keys in
+    FATSECRET_ENTRY_KEYS are kept for the diary cache and the food log. Only
+    ``fields`` are summed, but every field is part of the fingerprint.
+    """
+
+    def __init__(self, day: date_cls, fields: tuple[str, ...] = FIELDS) -> None:
+        """Initialize an empty fold."""
+        self.sums = NutrientSums(fields=fields)
+        self.food_entries: list[dict] = []
+        # Entry ids, serving/amount data and the nutrient values are hashed,
+        # so any edit that can move a total changes the fingerprint
+        self._digest = hashlib.blake2b(day.isoformat().encode(), digest_size=16)
+
+    def add(self, entry: dict) -> None:
+        """Fold one food entry into the totals and the fingerprint."""
+        self._digest.update(
+            repr(
+                [entry.get(key) for key in FATSECRET_FINGERPRINT_KEYS]
+                + [entry.get(field) for field in FATSECRET_FIELDS]
+            ).encode()
+        )
+        self.sums.add(entry)
+        self.food_entries.append(
+            {key: entry[key] for key in FATSECRET_ENTRY_KEYS if key in entry}
+        )
+
+    @property
+    def totals(self) -> dict[str, float]:
+        """Return the sum of every summed field over the entries."""
+        if self.sums.invalid:
+            _LOGGER.debug("Ignored %d invalid nutrient values", self.sums.invalid)
+        return self.sums.totals()
+
+    @property
+    def meal_totals(self) -> dict[str, dict[str, float]]:
+        """Return the sum of every field for each meal."""
+        return self.sums.meal_totals()
+
+    @property
+    def fingerprint(self) -> str:
+        """Return a digest identifying the content of the day's food diary."""
+        return self._digest.hexdigest()
+
+    @property
+    def food_log(self) -> tuple[FoodLogEntry, ...]:
+        """Return the entries as compact records."""
+        return food_log_of(self.food_entries)
+
 
 class FatSecretCoordinator(DataUpdateCoordinator):
     """Class to handle FatSecret API."""
@@ -56,114 +134,562 @@ class FatSecretCoordinator(DataUpdateCoordinator):
                 minutes=FATSECRET_UPDATE_INTERVAL
             ),  # periodic update interval
             config_entry=config_entry,
+            # Only notify entities when the summed totals actually changed
+            always_update=False,
         )
         self.entry = config_entry
         self.latest_data = {}
+        self._fingerprint: str | None = None
+        self.diary = FatSecretDiaryCache(hass, config_entry.entry_id)
+        self.state_store = FatSecretStateStore(hass, config_entry.entry_id)
+        self._statistics_day: date_cls | None = None
+        self._fingerprint_day: date_cls | None = None
+        self.polling = FatSecretPollingScheduler()
+        self.rolling = {
+            days: FatSecretRollingWindow(days) for days in FATSECRET_ROLLING_WINDOWS
+        }
+        self._rolling_fill_scheduled = False
+        # Enabled rolling sensors: the windows are only filled for them
+        self._rolling_sensors = 0
+        # Fields summed on every refresh: the tracked ones, plus those of any
+        # sensor the user enabled by hand
+        self.tracked_fields = frozenset(
+            config_entry.options.get(
+                CONF_TRACKED_FIELDS, FATSECRET_DEFAULT_TRACKED_FIELDS
+            )
+        )
+        self._entity_fields: Counter[str] = Counter()
+        self._fields_summed: tuple[str, ...] | None = None
+        self._resum_scheduled = False
+        # First failed refresh since the last successful one
+        self.stale_since: datetime | None = None
+        self._stale_retries = 0
+        # Polls of several accounts are staggered over the interval
+        self.scheduler = async_get_scheduler(hass)
+        config_entry.async_on_unload(
+            self.scheduler.async_register(config_entry.entry_id)
+        )
+        self.retry_stats = RetryStats()
+        self.metrics = FatSecretMetrics()
+        self.api = FatSecretApiClient(
+            async_get_clientsession(hass),
+            config_entry.data[CONF_CONSUMER_KEY],
+            config_entry.data[CONF_CONSUMER_SECRET],
+            config_entry.data[CONF_TOKEN],
+            config_entry.data[CONF_TOKEN_SECRET],
+        )
+        self.api.budget = async_get_request_budget(
+            hass,
+            config_entry.data[CONF_CONSUMER_KEY],
+            config_entry.options.get(
+                CONF_HOURLY_BUDGET, FATSECRET_DEFAULT_HOURLY_BUDGET
+            ),
+            config_entry.options.get(CONF_DAILY_BUDGET, FATSECRET_DEFAULT_DAILY_BUDGET),
+        )
+        self.api.metrics = self.metrics
 
-        async def handle_update_fatsecret(_call: ServiceCall):
-            await self.async_refresh()
+        self._forced_refresh_done: asyncio.Event | None = None
+        self._last_forced_refresh: float | None = None
+        self.forced_refreshes_executed = 0
+        self.forced_refreshes_coalesced = 0
 
-        self.hass.services.async_register(
-            DOMAIN, "update_fatsecret", handle_update_fatsecret
+    async def async_forced_refresh(self) -> None:
+        """Refresh on demand, sharing one in-flight request between callers.
+
+        Calls arriving while a forced refresh is running wait for it and
+        share its result. Calls arriving less than the configured minimum
+        interval after the previous forced refresh reuse its result too.
+        """
+        if self._forced_refresh_done is not None:
+            self.forced_refreshes_coalesced += 1
+            await self._forced_refresh_done.wait()
+            return
+
+        min_interval = self.entry.options.get(
+            CONF_FORCED_REFRESH_INTERVAL, FATSECRET_DEFAULT_FORCED_REFRESH_INTERVAL
         )
+        now = time.monotonic()
+        if (
+            self._last_forced_refresh is not None
+            and now - self._last_forced_refresh < min_interval
+        ):
+            self.forced_refreshes_coalesced += 1
+            _LOGGER.debug("Forced FatSecret refresh skipped, last one is too recent")
+            return
+
+        self.forced_refreshes_executed += 1
+        self._last_forced_refresh = now
+        self._forced_refresh_done = done = asyncio.Event()
+        try:
+            if self.api.budget.is_low:
+                # Debounced: bursts of service calls share a single request
+                await self.async_request_refresh()
+            else:
+                await self.async_refresh()
+        finally:
+            self._forced_refresh_done = None
+            done.set()
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """Return the fields to sum, in FATSECRET_FIELDS order."""
+        return tuple(
+            field
+            for field in FIELDS
+            if field in self.tracked_fields or self._entity_fields[field]
+        )
+
+    @callback
+    def async_track_field(self, field: str) -> Callable[[], None]:
+        """Sum ``field`` for an enabled sensor until the returned callback runs."""
+        self._entity_fields[field] += 1
+        if (
+            self.data is not None
+            and field not in self.data
+            and not self._resum_scheduled
+        ):
+            # Once for all the sensors added in the same loop iteration
+            self._resum_scheduled = True
+            self.hass.loop.call_soon(self._async_resum_cached_day)
+
+        @callback
+        def untrack() -> None:
+            self._entity_fields[field] -= 1
+
+        return untrack
+
+    @callback
+    def _async_resum_cached_day(self) -> None:
+        """Sum the fields again from the cached diary, without an API call."""
+        self._resum_scheduled = False
+        day = self._fingerprint_day
+        if day is None or (food_entries := self.diary.get(day)) is None:
+            return
+        fields = self.fields
+        fold = FoodEntriesFold(day, fields)
+        for entry in food_entries:
+            fold.add(entry)
+        self._fields_summed = fields
+        data = {
+            **fold.totals,
+            ATTR_MEALS: fold.meal_totals,
+            ATTR_FOOD_LOG: fold.food_log,
+        }
+        if self.stale_since is not None:
+            data[ATTR_STALE_SINCE] = self.stale_since.isoformat()
+        self.async_set_updated_data(data)
+
+    async def async_restore(self) -> bool:
+        """Load the persisted diary cache and last totals.
+
+        The totals are served right away when they belong to today, so the
+        first refresh can run in the background. Otherwise the entities are
+        unavailable until it succeeds. Returns whether totals were restored.
+        """
+        await self.diary.async_load()
+        state = await self.state_store.async_load()
+        if state is not None and len(state.get("hour_activity", ())) == 24:
+            self.polling.hour_activity = list(state["hour_activity"])
+
+        today = dt_util.now().date()
+        # The rolling sensors are added before the first refresh: they need
+        # the closed days of their window to find the missing ones
+        for window in self.rolling.values():
+            window.advance(today, self.diary.totals)
+        if (state := self.state_store.totals_of(today)) is None:
+            self.last_update_success = False
+            return False
+
+        totals = state["totals"]
+        self.data = self.latest_data = {
+            **totals,
+            ATTR_MEALS: state["meals"],
+            ATTR_FOOD_LOG: food_log_of(self.diary.get(today) or ()),
+        }
+        self._fields_summed = tuple(totals)
+        self._fingerprint = state["fingerprint"]
+        self._fingerprint_day = today
+        _LOGGER.debug("Restored the FatSecret totals of %s", today)
+        return True
 
     async def _async_update_data(self):
         """Fetch data from FatSecret API."""
+        start = time.perf_counter()
         try:
             # Call your API client once
             data = await self.fetch_fatsecret_data()
-            self.latest_data = data
-            return data
         except Exception as err:
+            self.metrics.record_refresh(time.perf_counter() - start)
+            if classify_error(err) is ErrorClass.AUTH:
+                raise ConfigEntryAuthFailed(
+                    f"FatSecret authorization failed: {err}"
+                ) from err
+            if (stale := self._stale_data(err)) is not None:
+                return stale
             raise UpdateFailed(f"FatSecret update failed: {err}") from err
 
+        self.metrics.record_refresh(time.perf_counter() - start)
+        if self.stale_since is not None:
+            _LOGGER.info("FatSecret update succeeded again, totals are fresh")
+            self.stale_since = None
+            self._stale_retries = 0
+            # Days the failed refreshes missed, e.g. across midnight
+            self._async_fill_missing_days()
+            data = {
+                key: value for key, value in data.items() if key != ATTR_STALE_SINCE
+            }
+        self.latest_data = data
+        return data
+
+    def _stale_data(self, err: Exception) -> dict | None:
+        """Return the last totals flagged as stale, None once they are too old.
+
+        Totals are only served for the day they belong to, and for at most
+        the configured staleness limit since the first failed refresh. The
+        next refreshes back off until the API answers again.
+        """
+        if self.data is None or self._fingerprint_day != dt_util.now().date():
+            return None
+        now = dt_util.utcnow()
+        if self.stale_since is None:
+            self.stale_since = now
+        limit = timedelta(
+            minutes=self.entry.options.get(
+                CONF_STALE_LIMIT, FATSECRET_DEFAULT_STALE_LIMIT
+            )
+        )
+        if now - self.stale_since >= limit:
+            return None
+
+        self.update_interval = timedelta(
+            minutes=min(
+                FATSECRET_POLL_FAST_INTERVAL * 2**self._stale_retries,
+                FATSECRET_UPDATE_INTERVAL,
+            )
+        )
+        self._stale_retries += 1
+        _LOGGER.warning(
+            "FatSecret update failed, serving totals stale since %s: %s",
+            self.stale_since.isoformat(),
+            err,
+        )
+        return {**self.data, ATTR_STALE_SINCE: self.stale_since.isoformat()}
+
+    async def async_fetch_day(
+        self, day: date_cls, fields: tuple[str, ...] = FIELDS
+    ) -> FoodEntriesFold:
+        """Fetch and fold the food entries of a day, retrying transient errors."""
+
+        async def fetch() -> FoodEntriesFold:
+            # A fresh fold per attempt: a failed attempt may have folded a part
+            fold = FoodEntriesFold(day, fields)
+            await self.api.async_get_food_entries(day, fold.add)
+            return fold
+
+        return await async_call_with_retry(fetch, self.retry_stats)
+
+    async def async_fetch_days(
+        self, days: list[date_cls]
+    ) -> AsyncIterator[tuple[date_cls, FoodEntriesFold]]:
+        """Fetch and fold several days concurrently, yielding them in order.
+
+        Every request is signed on its own and retried on its own, and they
+        share Home Assistant's connection pool. At most the configured
+        number of days are requested at the same time.
+        """
+        concurrency = self.entry.options.get(
+            CONF_FETCH_CONCURRENCY, FATSECRET_DEFAULT_FETCH_CONCURRENCY
+        )
+        async with aclosing(
+            async_fetch_in_order(days, self.async_fetch_day, concurrency)
+        ) as folds:
+            async for day, fold in folds:
+                yield day, fold
+
     async def fetch_fatsecret_data(self) -> dict:
         """Fetch latest FatSecret food entries and return summed metrics.
 
-        Returns a dict with all fields in FATSECRET_FIELDS as keys and their summed
-        values as floats.
+        Returns a dict with the summed fields (see ``fields``) as keys and
+        their values as floats, plus the same sums per meal under ATTR_MEALS
+        and the entries of the day under ATTR_FOOD_LOG.
         """
 
         # Request entries for the current local date to ensure day boundaries
         # match Home Assistant's configured timezone rather than UTC.
         today = dt_util.now().date()
-        epoch_date = date_cls(1970, 1, 1)
-        query_params = {
-            "format": "json",
-            "date": str((today - epoch_date).days),
-        }
+        fields = self.fields
+        try:
+            fold = await self.async_fetch_day(today, fields)
+        except FatSecretBudgetExceeded:
+            if self.data is None:
+                raise
+            # Defer instead of failing: keep serving the current totals and
+            # poll again once a request fits in the budget
+            delay = max(self.api.budget.seconds_until_available(), 60)
+            _LOGGER.warning(
+                "FatSecret request budget exhausted, next refresh in %d seconds",
+                delay,
+            )
+            self.update_interval = timedelta(seconds=delay)
+            return self.data
 
-        oauth_params = {
-            OAUTH_PARAM_CONSUMER_KEY: self.entry.data[CONF_CONSUMER_KEY],
-            OAUTH_PARAM_NONCE: str(random.randint(0, 100000000)),
-            OAUTH_PARAM_TIMESTAMP: str(int(time.time())),
-            OAUTH_PARAM_SIGNATURE_METHOD: OAUTH_SIGNATURE_METHOD,
-            OAUTH_PARAM_VERSION: OAUTH_VERSION,
-            OAUTH_PARAM_TOKEN: self.entry.data[CONF_TOKEN],
-        }
-        all_params = {**oauth_params, **query_params}
-        base_string = oauth_build_base_string("GET", API_FOOD_ENTRIES_URL, all_params)
-        oauth_params[OAUTH_PARAM_SIGNATURE] = oauth_generate_signature(
-            base_string,
-            self.entry.data[CONF_CONSUMER_SECRET],
-            self.entry.data[CONF_TOKEN_SECRET],
-        )
-        auth_header = oauth_build_authorization_header(oauth_params)
-
-        async with (
-            aiohttp.ClientSession() as session,
-            session.get(
-                API_FOOD_ENTRIES_URL,
-                headers={"Authorization": auth_header},
-                params=query_params,
-            ) as resp,
+        if dt_util.now().date() != today or (
+            self._fingerprint_day is not None and self._fingerprint_day > today
         ):
-            # 1️⃣ Network-level errors
-            try:
-                resp.raise_for_status()
-            except aiohttp.ClientResponseError as e:
-                raise UpdateFailed(f"HTTP error {resp.status}: {e.message}") from e
+            # The day closed while the request ran, e.g. the refresh just
+            # before midnight: the entries are those of the closed day, never
+            # the current totals
+            self._cache_day(today, fold)
+            if self.data is None:
+                raise UpdateFailed(f"The FatSecret diary of {today} is closed")
+            return self.data
 
-            # 2️⃣ Parse JSON
-            try:
-                data = await resp.json()
-            except aiohttp.ContentTypeError as exc:
-                raise UpdateFailed("FatSecret response is not valid JSON") from exc
-
-        # 3️⃣ API-level error handling (OAuth or API error codes)
-        if isinstance(data, dict) and "error" in data:
-            err = data["error"]
-            code = err.get("code")
-            message = err.get("message", "No message provided")
-
-            # Known OAuth errors
-            if code in FATSECRET_FOOD_ENTRIES_ERRORS:
-                explanation = FATSECRET_FOOD_ENTRIES_ERRORS[code]
-                _LOGGER.error(
-                    "FatSecret API error %s: %s — %s", code, explanation, message
+        # Days closed since the last import become long-term statistics
+        if self._statistics_day != today:
+            self.async_import_statistics()
+        for window in self.rolling.values():
+            window.advance(today, self.diary.totals)
+
+        # Keep the current totals when the diary is identical to the last fetch
+        fingerprint = fold.fingerprint
+        changed = fingerprint != self._fingerprint
+        if changed and self._fingerprint_day == today:
+            # A same-day edit, not a restart or a new day: learn from it
+            self.polling.record_change(dt_util.now())
+        self.update_interval = self.polling.next_interval(changed, dt_util.now())
+        if self.api.budget.is_low:
+            # Save the remaining budget: no fast polling
+            self.update_interval = max(
+                self.update_interval, timedelta(minutes=FATSECRET_UPDATE_INTERVAL)
+            )
+        self.update_interval = self.scheduler.align(
+            self.entry.entry_id, self.update_interval, time.time()
+        )
+
+        if not changed and self.data is not None and fields == self._fields_summed:
+            _LOGGER.debug("FatSecret diary unchanged since last fetch")
+            return self.data
+
+        totals = fold.totals
+        # Partial totals are not cached: the diary sums all fields on demand
+        self.diary.set(
+            today, fold.food_entries, totals if fields == FIELDS else None
+        )
+
+        return self._serve_day(today, fields, fold, totals)
+
+    def _serve_day(
+        self,
+        day: date_cls,
+        fields: tuple[str, ...],
+        fold: FoodEntriesFold,
+        totals: dict[str, float],
+    ) -> dict:
+        """Remember the fold as the served diary, save it and return its data."""
+        self._fields_summed = fields
+        self._fingerprint = fold.fingerprint
+        self._fingerprint_day = day
+        meal_totals = fold.meal_totals
+        self.state_store.save(
+            {
+                "day": day.isoformat(),
+                "totals": totals,
+                "meals": meal_totals,
+                "fingerprint": self._fingerprint,
+                "hour_activity": self.polling.hour_activity,
+            }
+        )
+        # Per-meal values come from the same pass, exposed as sensor attributes
+        return {**totals, ATTR_MEALS: meal_totals, ATTR_FOOD_LOG: fold.food_log}
+
+    def food_log(self, day: date_cls) -> tuple[FoodLogEntry, ...] | None:
+        """Return the food entries of a day, None if it is not cached.
+
+        Today's entries are those of the served totals; other days come
+        from the diary cache, without an API call.
+        """
+        if day == self._fingerprint_day and self.data is not None:
+            return self.data.get(ATTR_FOOD_LOG, ())
+        if (food_entries := self.diary.get(day)) is None:
+            return None
+        return food_log_of(food_entries)
+
+    @callback
+    def async_track_day_boundary(self) -> None:
+        """Schedule the refreshes around midnight, in the HA timezone.
+
+        The diary is fetched one last time just before midnight, the sensors
+        are reset at midnight without a request, and the closed day is
+        fetched once more a bit later so that its statistics include edits
+        logged after midnight.
+        """
+        for action, (hour, minute, second) in (
+            (self._async_finalize_day, FATSECRET_DAY_FINALIZE_TIME),
+            (self._async_roll_over, (0, 0, 0)),
+            (self._async_fetch_closed_day, FATSECRET_DAY_LATE_FETCH_TIME),
+        ):
+            self.entry.async_on_unload(
+                async_track_time_change(
+                    self.hass, action, hour=hour, minute=minute, second=second
                 )
-                raise UpdateFailed(f"OAuth error {code}: {explanation}")
-            else:
-                # Unknown error code — still raise
-                raise UpdateFailed(f"FatSecret returned error {code}: {message}")
+            )
+
+    async def _async_finalize_day(self, now: datetime) -> None:
+        """Capture the totals of the day just before it closes."""
+        await self.async_refresh()
+
+    @callback
+    def _async_roll_over(self, now: datetime) -> None:
+        """Reset the totals to zero for the new day, without an API call."""
+        today = dt_util.now().date()
+        if self._fingerprint_day == today:
+            # A refresh already saw the new day
+            return
+        fields = self.fields
+        # Fingerprint of an empty diary: an empty first fetch changes nothing
+        fold = FoodEntriesFold(today, fields)
+        data = self._serve_day(today, fields, fold, fold.totals)
+        self.stale_since = None
+        self._stale_retries = 0
+        for window in self.rolling.values():
+            window.advance(today, self.diary.totals)
+        _LOGGER.debug("FatSecret totals reset for %s", today)
+        self.async_set_updated_data(data)
+        self._async_fill_missing_days()
+
+    async def _async_fetch_closed_day(self, now: datetime) -> None:
+        """Fetch the previous day once more and import its final statistics."""
+        day = dt_util.now().date() - timedelta(days=1)
+        try:
+            fold = await self.async_fetch_day(day)
+        except Exception as err:
+            _LOGGER.warning(
+                "Could not fetch the final FatSecret diary of %s: %s", day, err
+            )
+            return
+        self._cache_day(day, fold)
+        self.async_import_statistics()
+        # The totals of today did not move: notify the rolling sensors directly
+        self.async_update_listeners()
+        self._async_fill_missing_days()
 
-        # 4️⃣ Normal data processing
-        totals = dict.fromkeys(FATSECRET_FIELDS, 0.0)
-        food_entries = (
-            (data.get(FATSECRET_FOOD_ENTRIES) or {}).get(FATSECRET_FOOD_ENTRY, [])
-            if isinstance(data, dict)
-            else []
+    def _cache_day(self, day: date_cls, fold: FoodEntriesFold) -> None:
+        """Cache the entries of a fetched day and update the rolling windows."""
+        # Partial totals are not cached: the diary sums all fields on demand
+        self.diary.set(
+            day, fold.food_entries, fold.totals if fold.sums.fields == FIELDS else None
         )
+        totals = self.diary.totals(day)
+        for window in self.rolling.values():
+            window.update_day(day, totals)
 
-        for entry in food_entries:
-            for field in FATSECRET_FIELDS:
-                try:
-                    totals[field] += float(entry.get(field, 0) or 0)
-                except (TypeError, ValueError):
-                    _LOGGER.debug(
-                        "Invalid value for field %s: %s",
-                        field,
-                        entry.get(field),
-                    )
-
-        return totals
+    async def async_backfill(self, start: date_cls, end: date_cls) -> int:
+        """Cache the food entries of every day in [start, end].
+
+        Closed days already in the cache are skipped, so importing a range
+        costs one API call per day exactly once. Returns the number of days
+        fetched from the API.
+        """
+        days = self.diary.days_to_fetch(start, end, dt_util.now().date())
+        _LOGGER.debug(
+            "Backfilling %d FatSecret days between %s and %s", len(days), start, end
+        )
+        try:
+            async with aclosing(self.async_fetch_days(days)) as folds:
+                async for day, fold in folds:
+                    self._cache_day(day, fold)
+        finally:
+            # Days fetched before an error are kept
+            self.async_import_statistics()
+        return len(days)
+
+    async def async_fetch_missing_days(self, start: date_cls, end: date_cls) -> int:
+        """Cache the days of [start, end] missing from the diary cache.
+
+        Cached days, open or not, are never requested again. Returns the
+        number of days fetched from the API.
+        """
+        days = self.diary.missing_days(start, end)
+        if not days:
+            return 0
+        try:
+            async with aclosing(self.async_fetch_days(days)) as folds:
+                async for day, fold in folds:
+                    self._cache_day(day, fold)
+        finally:
+            # Days fetched before an error are kept
+            self.async_import_statistics()
+        return len(days)
+
+    @callback
+    def async_track_rolling_window(self) -> Callable[[], None]:
+        """Keep the rolling windows filled until the returned callback runs."""
+        self._rolling_sensors += 1
+        self.async_schedule_rolling_fill()
+
+        @callback
+        def untrack() -> None:
+            self._rolling_sensors -= 1
+
+        return untrack
+
+    @callback
+    def _async_fill_missing_days(self) -> None:
+        """Schedule a fill if a rolling sensor lacks closed days."""
+        if self._rolling_sensors and any(
+            window.missing_days() for window in self.rolling.values()
+        ):
+            self.async_schedule_rolling_fill()
+
+    @callback
+    def async_schedule_rolling_fill(self) -> None:
+        """Fetch, in the background, the rolling window days not cached.
+
+        Calls made while a fill is scheduled or running share it.
+        """
+        if self._rolling_fill_scheduled:
+            return
+        self._rolling_fill_scheduled = True
+        self.entry.async_create_background_task(
+            self.hass, self.async_fill_rolling_windows(), "fatsecret_rolling_fill"
+        )
+
+    async def async_fill_rolling_windows(self) -> None:
+        """Backfill the closed days missing from the rolling windows.
+
+        Days that could not be fetched are tried again by the next fill:
+        when a rolling sensor is added, at the day boundary or once the API
+        answers again after failed refreshes.
+        """
+        try:
+            # Empty while the windows do not know today yet
+            missing = sorted(
+                {
+                    day
+                    for window in self.rolling.values()
+                    for day in window.missing_days()
+                }
+            )
+            if not missing:
+                return
+            try:
+                await self.async_backfill(missing[0], missing[-1])
+            except Exception as err:
+                _LOGGER.warning(
+                    "Could not fill the FatSecret rolling windows: %s", err
+                )
+            # The totals of today did not move: notify the rolling sensors
+            self.async_update_listeners()
+        finally:
+            self._rolling_fill_scheduled = False
+
+    @callback
+    def async_import_statistics(self) -> None:
+        """Import the totals of every closed cached day as statistics."""
+        today = dt_util.now().date()
+        # Each day is summed once and reused by every later import
+        daily_totals = {
+            day: self.diary.totals(day) for day, _ in self.diary.items() if day < today
+        }
+        async_import_daily_statistics(self.hass, self.entry, daily_totals)
+        self._statistics_day = today
@@ -0,0 +1,195 @@
+"""Persistent per-day cache of FatSecret food entries."""
+
+import asyncio
+import logging
+from datetime import date as date_cls, timedelta
+from typing import TypedDict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .aggregation_helpers import sum_food_entries
+from .const import (
+    DOMAIN,
+    FATSECRET_DIARY_OPEN_DAYS,
+    FATSECRET_DIARY_SAVE_DELAY,
+    FATSECRET_DIARY_STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DiaryDays = dict[str, list[dict]]
+
+
+class FatSecretDiaryIndex(TypedDict):
+    """Main file of the diary cache: the open days and the stored months."""
+
+    months: list[str]
+    open_days: DiaryDays
+
+
+class FatSecretDiaryCache:
+    """Food entries of past days, keyed by date and kept in HA storage.
+
+    Days older than FATSECRET_DIARY_OPEN_DAYS are considered closed: once
+    cached they are never requested from the API again. Open days (today and
+    yesterday) can still be edited in FatSecret and are always re-fetched.
+
+    Closed days are stored in one file per month, only written when one of
+    its days changes. Open days change on every poll with a new entry: they
+    are stored apart, in a small main file listing the months.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the cache."""
+        self._hass = hass
+        self._key = f"{DOMAIN}.{entry_id}.diary"
+        self._store: Store[FatSecretDiaryIndex] = Store(
+            hass, FATSECRET_DIARY_STORAGE_VERSION, self._key
+        )
+        self._month_stores: dict[str, Store[DiaryDays]] = {}
+        self._days: DiaryDays = {}
+        # Days stored in the main file, and months with a file of their own
+        self._open: set[str] = set()
+        self._months: set[str] = set()
+        # Summed nutrients of each day, computed once per day content
+        self._totals: dict[str, dict[str, float]] = {}
+
+    async def async_load(self) -> None:
+        """Load the cached days from storage."""
+        index = await self._store.async_load() or {}
+        self._months = set(index.get("months", ()))
+        self._days = {}
+        for days in await asyncio.gather(
+            *(self._month_store(month).async_load() for month in self._months)
+        ):
+            self._days.update(days or {})
+        # Saved last if a day was closed just before a shutdown
+        open_days = index.get("open_days", {})
+        self._days.update(open_days)
+        self._open = set(open_days)
+        self._totals = {}
+        self._close_days(dt_util.now().date())
+        _LOGGER.debug("Loaded %d cached FatSecret days", len(self._days))
+
+    def _month_store(self, month: str) -> Store[DiaryDays]:
+        """Return the store of the closed days of a month (YYYY-MM)."""
+        if (store := self._month_stores.get(month)) is None:
+            store = self._month_stores[month] = Store(
+                self._hass, FATSECRET_DIARY_STORAGE_VERSION, f"{self._key}.{month}"
+            )
+        return store
+
+    def _save_index(self) -> None:
+        """Schedule a save of the main file."""
+        self._store.async_delay_save(
+            lambda: FatSecretDiaryIndex(
+                months=sorted(self._months),
+                open_days={day: self._days[day] for day in sorted(self._open)},
+            ),
+            FATSECRET_DIARY_SAVE_DELAY,
+        )
+
+    def _save_month(self, month: str) -> None:
+        """Schedule a save of the closed days of a month."""
+        if month not in self._months:
+            self._months.add(month)
+            self._save_index()
+        self._month_store(month).async_delay_save(
+            lambda: {
+                day: entries
+                for day, entries in sorted(self._days.items())
+                if day[:7] == month and day not in self._open
+            },
+            FATSECRET_DIARY_SAVE_DELAY,
+        )
+
+    def _close_days(self, today: date_cls) -> None:
+        """Move the days closed since they were stored to their month's file."""
+        closed = [
+            day
+            for day in self._open
+            if not self.is_open(date_cls.fromisoformat(day), today)
+        ]
+        if not closed:
+            return
+        for day in closed:
+            self._open.discard(day)
+            self._save_month(day[:7])
+        self._save_index()
+
+    def __contains__(self, day: date_cls) -> bool:
+        """Return whether the day is cached."""
+        return day.isoformat() in self._days
+
+    def get(self, day: date_cls) -> list[dict] | None:
+        """Return the cached entries of a day, or None if not cached."""
+        return self._days.get(day.isoformat())
+
+    def totals(self, day: date_cls) -> dict[str, float] | None:
+        """Return the summed nutrients of a day, or None if not cached."""
+        key = day.isoformat()
+        if key not in self._days:
+            return None
+        if (totals := self._totals.get(key)) is None:
+            totals = self._totals[key] = sum_food_entries(self._days[key])
+        return totals
+
+    def set(
+        self,
+        day: date_cls,
+        food_entries: list[dict],
+        totals: dict[str, float] | None = None,
+    ) -> None:
+        """Cache the entries of a day and schedule a save of its file.
+
+        ``totals`` are the already summed entries, if known.
+        """
+        key = day.isoformat()
+        self._days[key] = list(food_entries)
+        if totals is None:
+            self._totals.pop(key, None)
+        else:
+            self._totals[key] = totals
+        today = dt_util.now().date()
+        self._close_days(today)
+        if self.is_open(day, today):
+            self._open.add(key)
+            self._save_index()
+        else:
+            self._save_month(key[:7])
+
+    def items(self) -> list[tuple[date_cls, list[dict]]]:
+        """Return every cached day with its entries, oldest first."""
+        return [
+            (date_cls.fromisoformat(day), entries)
+            for day, entries in sorted(self._days.items())
+        ]
+
+    @staticmethod
+    def is_open(day: date_cls, today: date_cls) -> bool:
+        """Return whether the day may still change in FatSecret."""
+        return day > today - timedelta(days=FATSECRET_DIARY_OPEN_DAYS)
+
+    def days_to_fetch(
+        self, start: date_cls, end: date_cls, today: date_cls
+    ) -> list[date_cls]:
+        """Return the days of [start, end] that are open or not cached yet."""
+        days = []
+        day = start
+        while day <= end:
+            if day not in self or self.is_open(day, today):
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def missing_days(self, start: date_cls, end: date_cls) -> list[date_cls]:
+        """Return the days of [start, end] not cached yet."""
+        days = []
+        day = start
+        while day <= end:
+            if day not in self:
+                days.append(day)
+            day += timedelta(days=1)
+        return days
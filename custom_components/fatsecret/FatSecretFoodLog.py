@@ -0,0 +1,71 @@
+"""Compact records of the food entries of a FatSecret diary day."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .aggregation_helpers import FIELDS, _parse_value, meal_of
+
+
+def _parse_units(value: object) -> float | None:
+    """Return a number of units as a float, None if unknown."""
+    if value is None:
+        return None
+    return _parse_value(value)
+
+
+@dataclass(frozen=True, slots=True)
+class FoodLogEntry:
+    """One food entry of the diary, without the rest of the API's JSON.
+
+    Nutrient values are a tuple in FIELDS order rather than a dict, so a
+    record costs a handful of pointers whatever the number of nutrients.
+    """
+
+    food_entry_id: str
+    name: str
+    description: str | None
+    meal: str
+    number_of_units: float | None
+    nutrients: tuple[float, ...]
+
+    @classmethod
+    def from_entry(cls, entry: dict) -> "FoodLogEntry":
+        """Return the record of a food entry of the API or the diary cache."""
+        return cls(
+            food_entry_id=str(entry.get("food_entry_id", "")),
+            name=str(entry.get("food_entry_name") or ""),
+            description=entry.get("food_entry_description"),
+            meal=meal_of(entry),
+            number_of_units=_parse_units(entry.get("number_of_units")),
+            nutrients=tuple(
+                _parse_value(entry.get(field)) or 0.0 for field in FIELDS
+            ),
+        )
+
+    def as_dict(self, fields: Iterable[str] = FIELDS) -> dict:
+        """Return the entry with the nutrients in ``fields``."""
+        values = dict(zip(FIELDS, self.nutrients))
+        return {
+            "id": self.food_entry_id,
+            "name": self.name,
+            "description": self.description,
+            "meal": self.meal,
+            "units": self.number_of_units,
+            **{field: values[field] for field in fields},
+        }
+
+
+def food_log_of(food_entries: Iterable[dict]) -> tuple[FoodLogEntry, ...]:
+    """Return the records of food entries, in diary order."""
+    return tuple(FoodLogEntry.from_entry(entry) for entry in food_entries)
+
+
+def food_log_page(
+    food_log: tuple[FoodLogEntry, ...],
+    offset: int,
+    limit: int,
+    fields: Iterable[str] = FIELDS,
+) -> list[dict]:
+    """Return ``limit`` entries of a food log from ``offset``, as dicts."""
+    fields = tuple(fields)
+    return [entry.as_dict(fields) for entry in food_log[offset : offset + limit]]
@@ -0,0 +1,204 @@
+"""Timings, counters and payload sizes of FatSecret requests."""
+
+import bisect
+import time
+from collections import Counter
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+
+from homeassistant.core import callback
+
+from .const import FATSECRET_METRIC_BUCKETS, FATSECRET_METRIC_PHASES
+
+
+class PhaseHistogram:
+    """Durations of a phase counted in fixed buckets of milliseconds.
+
+    Memory stays constant however many observations are recorded; the
+    percentiles are the upper bound of the bucket they fall in.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        # One bucket per bound in FATSECRET_METRIC_BUCKETS, plus one above
+        self.buckets = [0] * (len(FATSECRET_METRIC_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record a duration."""
+        ms = seconds * 1000
+        self.buckets[bisect.bisect_left(FATSECRET_METRIC_BUCKETS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.last = ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, q: float) -> float | None:
+        """Return the bucket bound below which ``q`` of the durations fall."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(FATSECRET_METRIC_BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return float(bound)
+        return self.max
+
+    def as_dict(self) -> dict:
+        """Return the histogram for diagnostics."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max, 3),
+            "last_ms": round(self.last, 3),
+            "buckets_ms": {
+                **{
+                    f"<={bound}": count
+                    for bound, count in zip(FATSECRET_METRIC_BUCKETS, self.buckets)
+                },
+                f">{FATSECRET_METRIC_BUCKETS[-1]}": self.buckets[-1],
+            },
+        }
+
+
+class SizeStats:
+    """Count, total and extremes of a size."""
+
+    def __init__(self) -> None:
+        """Initialize empty stats."""
+        self.count = 0
+        self.total = 0
+        self.min: int | None = None
+        self.max = 0
+        self.last = 0
+
+    def observe(self, size: int) -> None:
+        """Record a size."""
+        self.count += 1
+        self.total += size
+        self.last = size
+        self.max = max(self.max, size)
+        self.min = size if self.min is None else min(self.min, size)
+
+    def as_dict(self) -> dict:
+        """Return the stats for diagnostics."""
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "last": self.last,
+        }
+
+
+class RequestTimer:
+    """Split the time of one streamed request into FATSECRET_METRIC_PHASES.
+
+    Each ``lap`` charges the time elapsed since the previous one to a phase.
+    Waiting for body chunks counts as network time and the ``on_entry``
+    callback as aggregation; what is left between them is JSON parsing.
+    """
+
+    __slots__ = ("_last", "bytes", "entries", "phases")
+
+    def __init__(self) -> None:
+        """Start timing."""
+        self._last = time.perf_counter()
+        self.phases = dict.fromkeys(FATSECRET_METRIC_PHASES, 0.0)
+        self.bytes = 0
+        self.entries = 0
+
+    def lap(self, phase: str) -> None:
+        """Charge the time since the previous lap to ``phase``."""
+        now = time.perf_counter()
+        self.phases[phase] += now - self._last
+        self._last = now
+
+    async def chunks(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """Yield the chunks of a body, timing the waits and counting bytes."""
+        iterator = aiter(chunks)
+        while True:
+            self.lap("parse")
+            try:
+                chunk = await anext(iterator)
+            except StopAsyncIteration:
+                self.lap("network")
+                return
+            self.lap("network")
+            self.bytes += len(chunk)
+            yield chunk
+
+    def entries_to(self, on_entry: Callable[[dict], None]) -> Callable[[dict], None]:
+        """Wrap ``on_entry`` so that its time counts as aggregation."""
+
+        def timed_on_entry(entry: dict) -> None:
+            self.lap("parse")
+            self.entries += 1
+            on_entry(entry)
+            self.lap("aggregate")
+
+        return timed_on_entry
+
+
+class FatSecretMetrics:
+    """Per-phase timings, request counters and payload sizes of one entry."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.phases = {phase: PhaseHistogram() for phase in FATSECRET_METRIC_PHASES}
+        self.refresh = PhaseHistogram()
+        self.requests = 0
+        self.errors: Counter[str] = Counter()
+        self.payload_bytes = SizeStats()
+        self.payload_entries = SizeStats()
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def failed_requests(self) -> int:
+        """Return the number of requests that ended with an error."""
+        return self.errors.total()
+
+    def record_request(self, timer: RequestTimer, error: str | None = None) -> None:
+        """Record a finished request; ``error`` names its failure, if any."""
+        self.requests += 1
+        for phase, seconds in timer.phases.items():
+            self.phases[phase].observe(seconds)
+        if error is not None:
+            self.errors[error] += 1
+            return
+        self.payload_bytes.observe(timer.bytes)
+        self.payload_entries.observe(timer.entries)
+
+    def record_refresh(self, seconds: float) -> None:
+        """Record the duration of a whole refresh and notify the listeners."""
+        self.refresh.observe(seconds)
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable:
+        """Listen for finished refreshes; returns a function removing the listener."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def as_dict(self) -> dict:
+        """Return the metrics for diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "refresh": self.refresh.as_dict(),
+            "phases": {phase: hist.as_dict() for phase, hist in self.phases.items()},
+            "payload_bytes": self.payload_bytes.as_dict(),
+            "payload_entries": self.payload_entries.as_dict(),
+        }
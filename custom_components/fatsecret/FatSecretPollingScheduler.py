@@ -0,0 +1,67 @@
+"""Adaptive polling interval for the FatSecret coordinator."""
+
+from datetime import datetime, timedelta
+
+from .const import (
+    FATSECRET_POLL_ACTIVITY_DECAY,
+    FATSECRET_POLL_ACTIVITY_THRESHOLD,
+    FATSECRET_POLL_FAST_INTERVAL,
+    FATSECRET_POLL_MAX_INTERVAL,
+    FATSECRET_UPDATE_INTERVAL,
+)
+
+
+class FatSecretPollingScheduler:
+    """Learn when the diary changes and pick the next polling interval.
+
+    Every time a fetch returns a changed diary, the local hour is scored as
+    active (older observations decay). During active hours the diary is
+    polled every FATSECRET_POLL_FAST_INTERVAL minutes; elsewhere the regular
+    FATSECRET_UPDATE_INTERVAL is used. In both cases the interval doubles
+    for every fetch that returns an unchanged diary, up to a ceiling.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self.hour_activity: list[float] = [0.0] * 24
+        self.unchanged_polls = 0
+
+    def record_change(self, now: datetime) -> None:
+        """Record that the diary changed during the hour of ``now``."""
+        self.hour_activity = [
+            score * FATSECRET_POLL_ACTIVITY_DECAY for score in self.hour_activity
+        ]
+        self.hour_activity[now.hour] += 1.0
+
+    def is_active_hour(self, hour: int) -> bool:
+        """Return whether diary changes are expected during the hour."""
+        return self.hour_activity[hour] >= FATSECRET_POLL_ACTIVITY_THRESHOLD
+
+    def next_interval(self, changed: bool, now: datetime) -> timedelta:
+        """Return the delay before the next poll after a fetch at ``now``."""
+        self.unchanged_polls = 0 if changed else self.unchanged_polls + 1
+        backoff = 2 ** min(self.unchanged_polls, 16)
+
+        if self.is_active_hour(now.hour):
+            minutes = min(
+                FATSECRET_POLL_FAST_INTERVAL * backoff, FATSECRET_UPDATE_INTERVAL
+            )
+            return timedelta(minutes=minutes)
+
+        interval = timedelta(
+            minutes=min(
+                FATSECRET_UPDATE_INTERVAL * backoff, FATSECRET_POLL_MAX_INTERVAL
+            )
+        )
+
+        # Never sleep through the start of the next active hour
+        next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(
+            hours=1
+        )
+        while next_hour < now + interval:
+            if self.is_active_hour(next_hour.hour):
+                return max(
+                    next_hour - now, timedelta(minutes=FATSECRET_POLL_FAST_INTERVAL)
+                )
+            next_hour += timedelta(hours=1)
+        return interval
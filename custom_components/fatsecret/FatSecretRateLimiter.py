@@ -0,0 +1,135 @@
+"""Request budget shared by every FatSecret entry using the same consumer key."""
+
+import logging
+import time
+from collections.abc import Callable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_REQUEST_BUDGETS, FATSECRET_BUDGET_LOW_RATIO
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket refilling ``capacity`` tokens every ``period`` seconds."""
+
+    def __init__(self, capacity: int, period: float) -> None:
+        """Initialize a full bucket."""
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def resize(self, capacity: int, period: float) -> None:
+        """Change the capacity, keeping at most ``capacity`` tokens."""
+        self._refill()
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = min(self._tokens, capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Return the number of tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self) -> bool:
+        """Take one token if available."""
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def seconds_until_available(self) -> float:
+        """Return the delay until one token is available."""
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class FatSecretRequestBudget:
+    """Hourly and daily request budget of one FatSecret consumer key."""
+
+    def __init__(self, hourly: int, daily: int) -> None:
+        """Initialize the budget."""
+        self.hourly = TokenBucket(hourly, 3600)
+        self.daily = TokenBucket(daily, 86400)
+        self.denied = 0
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of requests that can be issued right now."""
+        return int(min(self.hourly.tokens, self.daily.tokens))
+
+    @property
+    def is_full(self) -> bool:
+        """Return whether both buckets are full."""
+        return all(
+            bucket.tokens >= bucket.capacity for bucket in (self.hourly, self.daily)
+        )
+
+    @property
+    def is_low(self) -> bool:
+        """Return whether less than FATSECRET_BUDGET_LOW_RATIO of a bucket is left."""
+        return any(
+            bucket.tokens < bucket.capacity * FATSECRET_BUDGET_LOW_RATIO
+            for bucket in (self.hourly, self.daily)
+        )
+
+    def seconds_until_available(self) -> float:
+        """Return the delay until a request fits in both buckets."""
+        return max(
+            self.hourly.seconds_until_available(),
+            self.daily.seconds_until_available(),
+        )
+
+    def try_acquire(self) -> bool:
+        """Reserve one request from both buckets."""
+        if self.hourly.tokens < 1 or self.daily.tokens < 1:
+            self.denied += 1
+            _LOGGER.debug("FatSecret request budget exhausted")
+            return False
+        self.hourly.try_acquire()
+        self.daily.try_acquire()
+        self._notify()
+        return True
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable:
+        """Listen for budget changes; returns a function removing the listener."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def _notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+
+@callback
+def async_get_request_budget(
+    hass: HomeAssistant, consumer_key: str, hourly: int, daily: int
+) -> FatSecretRequestBudget:
+    """Return the budget shared by all entries using the consumer key."""
+    budgets: dict[str, FatSecretRequestBudget] = hass.data.setdefault(
+        DATA_REQUEST_BUDGETS, {}
+    )
+    if (budget := budgets.get(consumer_key)) is None:
+        budget = budgets[consumer_key] = FatSecretRequestBudget(hourly, daily)
+    else:
+        # The latest configured limits apply to every entry sharing the key
+        budget.hourly.resize(hourly, 3600)
+        budget.daily.resize(daily, 86400)
+    return budget
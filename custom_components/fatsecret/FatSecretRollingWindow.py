@@ -0,0 +1,102 @@
+"""Rolling multi-day nutrient sums for the FatSecret coordinator."""
+
+from collections.abc import Callable
+from datetime import date as date_cls, timedelta
+
+from .const import FATSECRET_FIELDS
+
+DayTotals = dict[str, float]
+
+
+class FatSecretRollingWindow:
+    """Nutrient sums over the last ``days`` days, today included.
+
+    The closed part of the window (the days before today) is kept as running
+    sums: when the day advances, the new closed day is added and the day that
+    left the window is subtracted, so moving the window costs two additions
+    per field whatever its length. Today's live totals are added on read.
+    """
+
+    def __init__(self, days: int) -> None:
+        """Initialize an empty window."""
+        self.days = days
+        # Totals of the closed days in the window, oldest first
+        self._closed: dict[date_cls, DayTotals] = {}
+        self._sums: DayTotals = dict.fromkeys(FATSECRET_FIELDS, 0.0)
+        self._today: date_cls | None = None
+
+    @property
+    def today(self) -> date_cls | None:
+        """Return the last day of the window, None until it is advanced."""
+        return self._today
+
+    def _add(self, totals: DayTotals, sign: float) -> None:
+        for field in FATSECRET_FIELDS:
+            self._sums[field] += sign * totals.get(field, 0.0)
+
+    def _covers(self, day: date_cls) -> bool:
+        """Return whether ``day`` is a closed day of the window."""
+        return (
+            self._today is not None
+            and self._today - timedelta(days=self.days - 1) <= day < self._today
+        )
+
+    def advance(
+        self, today: date_cls, totals_of: Callable[[date_cls], DayTotals | None]
+    ) -> None:
+        """Move the window so that it ends with ``today``.
+
+        ``totals_of`` returns the totals of a past day, None if unknown. It is
+        only called for the days entering the window.
+        """
+        if today == self._today:
+            return
+        first = today - timedelta(days=self.days - 1)
+        if self._today is None or not first <= self._today <= today:
+            # Start over after a restart or a jump back in time
+            self._closed = {}
+            self._sums = dict.fromkeys(FATSECRET_FIELDS, 0.0)
+            day = first
+        else:
+            day = self._today
+        self._today = today
+
+        for old_day in [old for old in self._closed if old < first]:
+            self._add(self._closed.pop(old_day), -1.0)
+        while day < today:
+            if (totals := totals_of(day)) is not None:
+                self._closed[day] = totals
+                self._add(totals, 1.0)
+            day += timedelta(days=1)
+
+    def update_day(self, day: date_cls, totals: DayTotals) -> None:
+        """Replace the totals of a closed day, e.g. after a late fetch."""
+        if not self._covers(day):
+            return
+        if (old := self._closed.get(day)) is not None:
+            self._add(old, -1.0)
+        self._closed[day] = totals
+        self._add(totals, 1.0)
+
+    def sums(self, today_totals: DayTotals | None) -> DayTotals:
+        """Return the sums of the window, ``today_totals`` included."""
+        if not today_totals:
+            return dict(self._sums)
+        return {
+            field: value + today_totals.get(field, 0.0)
+            for field, value in self._sums.items()
+        }
+
+    def days_covered(self, today_totals: DayTotals | None) -> int:
+        """Return the number of days of the window with known totals."""
+        return len(self._closed) + (1 if today_totals else 0)
+
+    def missing_days(self) -> list[date_cls]:
+        """Return the closed days of the window with unknown totals."""
+        if self._today is None:
+            return []
+        return [
+            day
+            for offset in range(self.days - 1, 0, -1)
+            if (day := self._today - timedelta(days=offset)) not in self._closed
+        ]
@@ -0,0 +1,56 @@
+"""Polling schedule shared by every FatSecret config entry."""
+
+from collections.abc import Callable
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_SCHEDULER
+
+
+class FatSecretScheduler:
+    """Stagger the polls of several FatSecret accounts.
+
+    Each registered entry owns a slot. Its polls are aligned on a grid of the
+    polling interval shifted by ``slot / entries`` of that interval, so N
+    accounts polling every 15 minutes are spread 15/N minutes apart instead
+    of all hitting the API in the same second.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self._entries: list[str] = []
+
+    @callback
+    def async_register(self, entry_id: str) -> Callable[[], None]:
+        """Give the entry a slot; returns a function releasing it."""
+        if entry_id not in self._entries:
+            self._entries.append(entry_id)
+
+        @callback
+        def unregister() -> None:
+            if entry_id in self._entries:
+                self._entries.remove(entry_id)
+
+        return unregister
+
+    def align(self, entry_id: str, interval: timedelta, now: float) -> timedelta:
+        """Return the delay until the entry's next slot, about ``interval`` away.
+
+        The delay is between half and one and a half ``interval``. A single
+        entry is never shifted.
+        """
+        if len(self._entries) < 2 or entry_id not in self._entries:
+            return interval
+        period = interval.total_seconds()
+        offset = period * self._entries.index(entry_id) / len(self._entries)
+        earliest = now + period / 2
+        return timedelta(seconds=earliest + (offset - earliest) % period - now)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> FatSecretScheduler:
+    """Return the scheduler shared by all entries."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = FatSecretScheduler()
+    return scheduler
@@ -1,29 +1,86 @@
 """FatSecret Sensor."""
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+
 from propcache.api import cached_property
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
 )
 
-from .const import DOMAIN, FATSECRET_FIELDS
+from .const import (
+    ATTR_ENTRIES,
+    ATTR_FOOD_LOG,
+    ATTR_MEALS,
+    ATTR_STALE_SINCE,
+    DOMAIN,
+    FATSECRET_BUDGET_REFILL_WRITE_INTERVAL,
+    FATSECRET_FIELDS,
+    FATSECRET_FOOD_LOG_MAX_ENTRIES,
+)
+from .FatSecretFoodLog import food_log_page
+from .FatSecretMetrics import FatSecretMetrics
+from .FatSecretRateLimiter import FatSecretRequestBudget
+
+
+def entity_unique_id(entry_id: str, key: str) -> str:
+    """Return the unique id of an entity of a config entry."""
+    return f"{DOMAIN}_{entry_id}_{key}"
+
+
+def device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the device grouping the entities of one FatSecret account."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, entry.entry_id)},
+        name=entry.title,
+        manufacturer="FatSecret",
+        entry_type=DeviceEntryType.SERVICE,
+    )
 
 
 class FatSecretSensor(CoordinatorEntity, SensorEntity):
     """Representation of a FatSecret sensor."""
 
-    def __init__(self, coordinator: DataUpdateCoordinator, field: str) -> None:
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        field: str,
+        enabled_default: bool = True,
+    ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._field: str = field
+        self._attr_entity_registry_enabled_default = enabled_default
 
         field_meta = FATSECRET_FIELDS[field]
         self._attr_name = f"{field_meta['name']}"
-        self._attr_unique_id = f"{DOMAIN}_{field}"
+        self._attr_unique_id = entity_unique_id(
+            coordinator.config_entry.entry_id, field
+        )
+        self._attr_device_info = device_info(coordinator.config_entry)
         self._attr_native_unit_of_measurement = field_meta["unit"]
         self.coordinator: DataUpdateCoordinator = coordinator
+        self._last_written: tuple | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Have the coordinator sum this sensor's field while it is enabled."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_track_field(self._field))
 
     @property  # type: ignore[override]
     def native_value(self) -> float | None:
@@ -38,3 +95,293 @@ class FatSecretSensor(CoordinatorEntity, SensorEntity):
     def native_unit_of_measurement(self) -> str | None:
         """Return the unit of measurement."""
         return self._attr_native_unit_of_measurement
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float | str] | None:
+        """Return the value of this sensor's field for each meal.
+
+        While refreshes fail, ``stale_since`` tells since when the value is
+        the last known one.
+        """
+        data = self.coordinator.data
+        attributes: dict[str, float | str] = {
+            meal: totals.get(self._field, 0.0)
+            for meal, totals in (data.get(ATTR_MEALS) or {}).items()
+        }
+        if (stale_since := data.get(ATTR_STALE_SINCE)) is not None:
+            attributes[ATTR_STALE_SINCE] = stale_since
+        return attributes or None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when this sensor's value or availability moved."""
+        if not self.available:
+            # No totals yet if the first refresh failed
+            written: tuple = (False,)
+        else:
+            attributes = self.extra_state_attributes
+            written = (
+                True,
+                self.native_value,
+                tuple(attributes.items()) if attributes else None,
+            )
+        if written == self._last_written:
+            return
+        self._last_written = written
+        self.async_write_ha_state()
+
+
+class FatSecretRollingSensor(CoordinatorEntity, SensorEntity):
+    """Daily average of a field over the last days, today included."""
+
+    _attr_entity_registry_enabled_default = False
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: DataUpdateCoordinator, field: str, days: int):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._field = field
+        self._window = coordinator.rolling[days]
+
+        field_meta = FATSECRET_FIELDS[field]
+        self._attr_name = f"{field_meta['name']} {days}-day average"
+        self._attr_unique_id = entity_unique_id(
+            coordinator.config_entry.entry_id, f"{field}_{days}d"
+        )
+        self._attr_device_info = device_info(coordinator.config_entry)
+        self._attr_native_unit_of_measurement = field_meta["unit"]
+
+    async def async_added_to_hass(self) -> None:
+        """Fetch the days of the window missing from the diary cache."""
+        await super().async_added_to_hass()
+        # Today's value of the field is part of the average
+        self.async_on_remove(self.coordinator.async_track_field(self._field))
+        self.async_on_remove(self.coordinator.async_track_rolling_window())
+
+    @property  # type: ignore[override]
+    def native_value(self) -> float | None:
+        """Return the average per day with known totals."""
+        if not (days := self._window.days_covered(self.coordinator.data)):
+            return None
+        return self._window.sums(self.coordinator.data)[self._field] / days
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the sum over the window and the number of days it covers."""
+        attributes = {
+            "sum": self._window.sums(self.coordinator.data)[self._field],
+            "days": self._window.days_covered(self.coordinator.data),
+        }
+        if (stale_since := self.coordinator.data.get(ATTR_STALE_SINCE)) is not None:
+            attributes[ATTR_STALE_SINCE] = stale_since
+        return attributes
+
+
+class FatSecretFoodLogSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor with the number of food entries logged today.
+
+    Its ``entries`` attribute lists the first FATSECRET_FOOD_LOG_MAX_ENTRIES
+    entries with the summed nutrients only, and is not recorded: the
+    get_food_log service returns the others.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+    _attr_native_unit_of_measurement = "entries"
+    _unrecorded_attributes = frozenset({ATTR_ENTRIES})
+
+    def __init__(self, coordinator: DataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_name = "Food log"
+        self._attr_unique_id = entity_unique_id(
+            coordinator.config_entry.entry_id, ATTR_FOOD_LOG
+        )
+        self._attr_device_info = device_info(coordinator.config_entry)
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of entries."""
+        return len(self.coordinator.data.get(ATTR_FOOD_LOG, ()))
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the first entries and how many were left out."""
+        food_log = self.coordinator.data.get(ATTR_FOOD_LOG, ())
+        attributes = {
+            ATTR_ENTRIES: food_log_page(
+                food_log,
+                0,
+                FATSECRET_FOOD_LOG_MAX_ENTRIES,
+                self.coordinator.fields,
+            ),
+            "truncated": max(len(food_log) - FATSECRET_FOOD_LOG_MAX_ENTRIES, 0),
+        }
+        if (stale_since := self.coordinator.data.get(ATTR_STALE_SINCE)) is not None:
+            attributes[ATTR_STALE_SINCE] = stale_since
+        return attributes
+
+
+class FatSecretBudgetSensor(SensorEntity):
+    """Diagnostic sensor with the remaining FatSecret request budget."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+    _attr_native_unit_of_measurement = "requests"
+    _attr_should_poll = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, entry: ConfigEntry, budget: FatSecretRequestBudget) -> None:
+        """Initialize the sensor."""
+        self._budget = budget
+        self._cancel_refill_write: Callable[[], None] | None = None
+        self._attr_name = "Request budget"
+        self._attr_unique_id = entity_unique_id(entry.entry_id, "request_budget")
+        self._attr_device_info = device_info(entry)
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state when a request is charged and as the budget refills."""
+        self.async_on_remove(
+            self._budget.async_add_listener(self._async_write_budget)
+        )
+        self.async_on_remove(self._async_cancel_refill_write)
+        self._async_schedule_refill_write()
+
+    @callback
+    def _async_write_budget(self, _now: datetime | None = None) -> None:
+        """Write the state, then schedule the next one while the budget refills."""
+        self.async_write_ha_state()
+        self._async_schedule_refill_write()
+
+    @callback
+    def _async_schedule_refill_write(self) -> None:
+        """Write the state again once the buckets have refilled.
+
+        Nothing charges the budget while it refills: the next write happens
+        once a request fits again, and at most every
+        FATSECRET_BUDGET_REFILL_WRITE_INTERVAL seconds until the buckets are
+        full.
+        """
+        self._async_cancel_refill_write()
+        if self._budget.is_full:
+            return
+        self._cancel_refill_write = async_call_later(
+            self.hass,
+            max(
+                self._budget.seconds_until_available(),
+                FATSECRET_BUDGET_REFILL_WRITE_INTERVAL,
+            ),
+            self._async_write_budget,
+        )
+
+    @callback
+    def _async_cancel_refill_write(self) -> None:
+        if self._cancel_refill_write is not None:
+            self._cancel_refill_write()
+            self._cancel_refill_write = None
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of requests that can be issued right now."""
+        return self._budget.remaining
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the state of both budget buckets."""
+        return {
+            "hourly_remaining": int(self._budget.hourly.tokens),
+            "hourly_limit": self._budget.hourly.capacity,
+            "daily_remaining": int(self._budget.daily.tokens),
+            "daily_limit": self._budget.daily.capacity,
+            "denied_requests": self._budget.denied,
+        }
+
+
+@dataclass(frozen=True, kw_only=True)
+class FatSecretMetricsSensorDescription(SensorEntityDescription):
+    """Describe a sensor reading the request metrics of an entry."""
+
+    value_fn: Callable[[FatSecretMetrics], float | int | None]
+    attributes_fn: Callable[[FatSecretMetrics], dict] | None = None
+
+
+METRICS_SENSORS = (
+    FatSecretMetricsSensorDescription(
+        key="refresh_duration",
+        name="Refresh duration",
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: (
+            round(metrics.refresh.last, 1) if metrics.refresh.count else None
+        ),
+        attributes_fn=lambda metrics: {
+            "p50_ms": metrics.refresh.percentile(0.5),
+            "p99_ms": metrics.refresh.percentile(0.99),
+        },
+    ),
+    FatSecretMetricsSensorDescription(
+        key="requests",
+        name="API requests",
+        native_unit_of_measurement="requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.requests,
+    ),
+    FatSecretMetricsSensorDescription(
+        key="failed_requests",
+        name="Failed API requests",
+        native_unit_of_measurement="requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.failed_requests,
+        attributes_fn=lambda metrics: dict(metrics.errors),
+    ),
+    FatSecretMetricsSensorDescription(
+        key="payload_size",
+        name="Response size",
+        native_unit_of_measurement="B",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: (
+            metrics.payload_bytes.last if metrics.payload_bytes.count else None
+        ),
+    ),
+)
+
+
+class FatSecretMetricsSensor(SensorEntity):
+    """Diagnostic sensor with a request metric, disabled by default."""
+
+    entity_description: FatSecretMetricsSensorDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        metrics: FatSecretMetrics,
+        description: FatSecretMetricsSensorDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._metrics = metrics
+        self._attr_unique_id = entity_unique_id(entry.entry_id, description.key)
+        self._attr_device_info = device_info(entry)
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state after every refresh."""
+        self.async_on_remove(
+            self._metrics.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the metric."""
+        return self.entity_description.value_fn(self._metrics)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Return the details of the metric, if any."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self._metrics)
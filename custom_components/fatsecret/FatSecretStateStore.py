@@ -0,0 +1,62 @@
+"""Persistent last-known state of a FatSecret coordinator."""
+
+import logging
+from datetime import date as date_cls
+from typing import TypedDict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    FATSECRET_DIARY_SAVE_DELAY,
+    FATSECRET_STATE_STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FatSecretState(TypedDict):
+    """Totals of a day and the data needed to resume polling after a restart."""
+
+    day: str
+    totals: dict[str, float]
+    meals: dict[str, dict[str, float]]
+    fingerprint: str
+    hour_activity: list[float]
+
+
+class FatSecretStateStore:
+    """Last totals served by the coordinator, kept in HA storage.
+
+    Restoring them on startup lets the sensors show the current values before
+    the first request to the API, or while it is unreachable. The totals are
+    stored with the day they belong to, so they are never served for another
+    day.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[FatSecretState] = Store(
+            hass,
+            FATSECRET_STATE_STORAGE_VERSION,
+            f"{DOMAIN}.{entry_id}.state",
+        )
+        self._state: FatSecretState | None = None
+
+    async def async_load(self) -> FatSecretState | None:
+        """Load the last saved state, None if there is none."""
+        self._state = await self._store.async_load()
+        return self._state
+
+    def totals_of(self, day: date_cls) -> FatSecretState | None:
+        """Return the loaded state if its totals belong to the day."""
+        if self._state is None or self._state.get("day") != day.isoformat():
+            return None
+        return self._state
+
+    def save(self, state: FatSecretState) -> None:
+        """Schedule a save of the state."""
+        self._state = state
+        self._store.async_delay_save(lambda: state, FATSECRET_DIARY_SAVE_DELAY)
+        _LOGGER.debug("Saving the FatSecret totals of %s", state["day"])
@@ -3,18 +3,60 @@
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.loader import IntegrationNotLoaded
-from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .config_flow import account_unique_id
+from .const import CONF_TOKEN, DOMAIN
 from .FatSecretCoordinator import FatSecretCoordinator
+from .FatSecretSensor import entity_unique_id
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services shared by every FatSecret entry."""
+    async_setup_services(hass)
+    return True
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an entry to the current config entry version.
+
+    1.2 namespaces the unique ids of the entities by entry id, 1.3 gives the
+    entry the unique id of its FatSecret account.
+    """
+    if entry.version == 1 and entry.minor_version < 2:
+        legacy_prefix = f"{DOMAIN}_"
+
+        @callback
+        def migrate_unique_id(entity_entry: er.RegistryEntry) -> dict | None:
+            unique_id = entity_entry.unique_id
+            if unique_id.startswith(entity_unique_id(entry.entry_id, "")):
+                return None
+            key = unique_id.removeprefix(legacy_prefix)
+            return {"new_unique_id": entity_unique_id(entry.entry_id, key)}
+
+        await er.async_migrate_entries(hass, entry.entry_id, migrate_unique_id)
+        hass.config_entries.async_update_entry(entry, minor_version=2)
+        _LOGGER.debug("Migrated FatSecret entry %s to version 1.2", entry.entry_id)
+
+    if entry.version == 1 and entry.minor_version < 3:
+        hass.config_entries.async_update_entry(
+            entry,
+            unique_id=account_unique_id(entry.data[CONF_TOKEN]),
+            minor_version=3,
+        )
+        _LOGGER.debug("Migrated FatSecret entry %s to version 1.3", entry.entry_id)
+
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up the integration from a config entry."""
 
@@ -22,8 +64,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # with the entry ID as the key
     coordinator = FatSecretCoordinator(hass, entry)
 
-    # Ensure first refresh happens
-    await coordinator.async_config_entry_first_refresh()
+    # Serve the last known totals: startup never waits for the API
+    await coordinator.async_restore()
 
     # Store coordinator in hass.data
     hass.data.setdefault(DOMAIN, {})
@@ -32,9 +74,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Forward to platforms (e.g., sensor)
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
 
+    # Refreshes around midnight keep the day boundary exact
+    coordinator.async_track_day_boundary()
+
+    # First refresh in the background, once the entities listen
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), f"{DOMAIN}_first_refresh"
+    )
+
+    # Reload the entry when its options change
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload the coordinator and its entities."""
 
@@ -44,6 +102,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except IntegrationNotLoaded:
         pass
 
+    hass.data[DOMAIN].pop(entry.entry_id, None)
+
     # Optionally remove the domain if empty
     if not hass.data[DOMAIN]:
         hass.data.pop(DOMAIN)
@@ -0,0 +1,88 @@
+"""Aggregation of the nutrient values of FatSecret food entries."""
+
+import logging
+from collections.abc import Iterable
+
+from .const import FATSECRET_FIELDS, FATSECRET_MEAL_OTHER, FATSECRET_MEALS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Order of the summed fields
+FIELDS = tuple(FATSECRET_FIELDS)
+
+
+def _parse_value(value: object) -> float | None:
+    """Return a nutrient value as a float, None if it is not a number."""
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def meal_of(entry: dict) -> str:
+    """Return the meal of a food entry, one of FATSECRET_MEALS."""
+    meal = str(entry.get("meal") or "").lower()
+    return meal if meal in FATSECRET_MEALS else FATSECRET_MEAL_OTHER
+
+
+class NutrientSums:
+    """Running sums of the nutrient values of food entries, per meal.
+
+    Entries are added one at a time, cell by cell: parsing the API's numeric
+    strings dominates, and a plain loop is as fast as any other layout in
+    pure Python. Only the fields in ``fields`` are parsed, the others are
+    skipped.
+    """
+
+    __slots__ = ("fields", "invalid", "meals")
+
+    def __init__(
+        self, food_entries: Iterable[dict] = (), fields: tuple[str, ...] = FIELDS
+    ) -> None:
+        """Initialize the sums with the values of ``food_entries``."""
+        self.fields = fields
+        # Sums of the meals with entries, in the order they first appear
+        self.meals: dict[str, dict[str, float]] = {}
+        # Cells whose value was not a number and counted as 0
+        self.invalid = 0
+        self.extend(food_entries)
+
+    def add(self, entry: dict) -> None:
+        """Add the values of one food entry to the sums of its meal."""
+        meal = meal_of(entry)
+        if (sums := self.meals.get(meal)) is None:
+            sums = self.meals[meal] = dict.fromkeys(self.fields, 0.0)
+        get = entry.get
+        for field in self.fields:
+            try:
+                sums[field] += float(get(field, 0) or 0)
+            except (TypeError, ValueError):
+                self.invalid += 1
+
+    def extend(self, food_entries: Iterable[dict]) -> None:
+        """Add the values of food entries."""
+        for entry in food_entries:
+            self.add(entry)
+
+    def meal_totals(self) -> dict[str, dict[str, float]]:
+        """Return the sum of every field for each of FATSECRET_MEALS."""
+        return {
+            meal: dict(self.meals.get(meal) or dict.fromkeys(self.fields, 0.0))
+            for meal in FATSECRET_MEALS
+        }
+
+    def totals(self) -> dict[str, float]:
+        """Return the sum of every field."""
+        totals = dict.fromkeys(self.fields, 0.0)
+        for sums in self.meals.values():
+            for field, value in sums.items():
+                totals[field] += value
+        return totals
+
+
+def sum_food_entries(food_entries: Iterable[dict]) -> dict[str, float]:
+    """Return the sum of every field in FATSECRET_FIELDS over the entries."""
+    sums = NutrientSums(food_entries)
+    if sums.invalid:
+        _LOGGER.debug("Ignored %d invalid nutrient values", sums.invalid)
+    return sums.totals()
@@ -1,57 +1,77 @@
 """Config flow for the FatSecret integration."""
 
+import hashlib
 import logging
-import random
-import time
-import urllib.parse
 
 import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
-    ACCESS_TOKEN_URL,
     AUTHORIZE_URL,
     CONF_CONSUMER_KEY,
     CONF_CONSUMER_SECRET,
     CONF_TOKEN,
     CONF_TOKEN_SECRET,
+    CONF_HOURLY_BUDGET,
+    CONF_DAILY_BUDGET,
+    CONF_FETCH_CONCURRENCY,
+    CONF_FORCED_REFRESH_INTERVAL,
+    CONF_STALE_LIMIT,
+    CONF_TRACKED_FIELDS,
     DOMAIN,
-    OAUTH_PARAM_CONSUMER_KEY,
-    OAUTH_PARAM_NONCE,
-    OAUTH_PARAM_TIMESTAMP,
+    FATSECRET_DEFAULT_FETCH_CONCURRENCY,
+    FATSECRET_DEFAULT_FORCED_REFRESH_INTERVAL,
+    FATSECRET_DEFAULT_STALE_LIMIT,
+    FATSECRET_DEFAULT_TRACKED_FIELDS,
+    FATSECRET_FIELDS,
+    FATSECRET_DEFAULT_HOURLY_BUDGET,
+    FATSECRET_DEFAULT_DAILY_BUDGET,
+    FATSECRET_MAX_FETCH_CONCURRENCY,
     OAUTH_PARAM_TOKEN,
-    OAUTH_PARAM_VERSION,
-    OAUTH_PARAM_SIGNATURE,
-    OAUTH_PARAM_SIGNATURE_METHOD,
-    OAUTH_PARAM_CALLBACK,
-    OAUTH_PARAM_VERIFIER,
-    OAUTH_PARAM_TOKEN_SECRET,
-    OAUTH_SIGNATURE_METHOD,
-    OAUTH_VERSION,
-    OAUTH_CALLBACK,
-    REQUEST_TOKEN_URL,
-)
-from .oauth_helpers import (
-    oauth_build_base_string,
-    oauth_generate_signature,
 )
+from .FatSecretApiClient import FatSecretApiClient
+from .FatSecretSensor import entity_unique_id
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def account_unique_id(token: str) -> str:
+    """Return the unique id of the FatSecret account of an access token."""
+    # The token identifies the account but is a credential: only its digest
+    # is used
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
 class FatSecretConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for FatSecret."""
 
+    VERSION = 1
+    # 1.2: entity unique ids namespaced by entry id
+    # 1.3: one unique id per FatSecret account
+    MINOR_VERSION = 3
+
     def is_matching(self, other_flow: config_entries.ConfigFlow) -> bool:
         """Check if the other flow matches this config flow."""
         return getattr(other_flow, "DOMAIN", None) == DOMAIN
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Return the options flow."""
+        return FatSecretOptionsFlow()
+
     def __init__(self):
         self.consumer_key: str = ""
         self.consumer_secret: str = ""
         self.request_token: str = ""
         self.request_token_secret: str = ""
+        self._client: FatSecretApiClient | None = None
 
     async def async_step_user(self, user_input=None):
         errors = {}
@@ -92,7 +112,15 @@ class FatSecretConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_TOKEN: access_token,
                     CONF_TOKEN_SECRET: access_token_secret,
                 }
-                return self.async_create_entry(title="FatSecret", data=data)
+                await self.async_set_unique_id(account_unique_id(access_token))
+                if self.source == config_entries.SOURCE_REAUTH:
+                    return self.async_update_reload_and_abort(
+                        self._get_reauth_entry(),
+                        unique_id=self.unique_id,
+                        data_updates=data,
+                    )
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(title=self._entry_title(), data=data)
             except (aiohttp.ClientError, ValueError) as err:
                 _LOGGER.exception("Failed to obtain access token: %s", err)
                 return self.async_show_form(
@@ -108,59 +136,158 @@ class FatSecretConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description_placeholders={"auth_url": auth_url},
         )
 
-    async def _get_request_token(self):
-        """Request a temporary request token."""
+    async def async_step_reauth(self, entry_data):
+        """Authorize again after FatSecret rejected the access token."""
+        self.consumer_key = entry_data[CONF_CONSUMER_KEY]
+        self.consumer_secret = entry_data[CONF_CONSUMER_SECRET]
+        return await self.async_step_reauth_confirm()
 
-        oauth_params = {
-            OAUTH_PARAM_CONSUMER_KEY: self.consumer_key,
-            OAUTH_PARAM_NONCE: str(random.randint(0, 100000000)),
-            OAUTH_PARAM_TIMESTAMP: str(int(time.time())),
-            OAUTH_PARAM_SIGNATURE_METHOD: OAUTH_SIGNATURE_METHOD,
-            OAUTH_PARAM_VERSION: OAUTH_VERSION,
-            OAUTH_PARAM_CALLBACK: OAUTH_CALLBACK,
-        }
+    async def async_step_reauth_confirm(self, user_input=None):
+        """Confirm the new authorization and request a new token."""
+        errors = {}
+        if user_input is not None:
+            try:
+                await self._get_request_token()
+                return await self.async_step_authorize()
+            except (aiohttp.ClientError, ValueError) as err:
+                _LOGGER.exception("Failed to obtain request token: %s", err)
+                errors["base"] = "auth_failed"
 
-        base_string = oauth_build_base_string("GET", REQUEST_TOKEN_URL, oauth_params)
-        oauth_params[OAUTH_PARAM_SIGNATURE] = oauth_generate_signature(
-            base_string, self.consumer_secret, ""
-        )
+        return self.async_show_form(step_id="reauth_confirm", errors=errors)
+
+    def _entry_title(self) -> str:
+        """Return a title telling the accounts of a household apart.
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(REQUEST_TOKEN_URL, params=oauth_params) as resp:
-                resp.raise_for_status()
-                resp_text = await resp.text()
-                _LOGGER.debug("Request token response: %s", resp_text)
+        The first title not in use is taken, so removing an account frees
+        its number.
+        """
+        titles = {
+            entry.title
+            for entry in self._async_current_entries(include_ignore=False)
+        }
+        if "FatSecret" not in titles:
+            return "FatSecret"
+        number = 2
+        while f"FatSecret {number}" in titles:
+            number += 1
+        return f"FatSecret {number}"
 
-        qs = dict(urllib.parse.parse_qsl(resp_text))
+    def _api_client(self) -> FatSecretApiClient:
+        """Return the API client of the flow, sharing HA's aiohttp session.
 
-        if OAUTH_PARAM_TOKEN not in qs:
-            raise ValueError(f"Failed to obtain request token: {qs}")
+        The same client signs every request of the flow, so the clock offset
+        learned from one response applies to the next request.
+        """
+        if self._client is None or (
+            self._client.consumer_key,
+            self._client.consumer_secret,
+        ) != (self.consumer_key, self.consumer_secret):
+            self._client = FatSecretApiClient(
+                async_get_clientsession(self.hass),
+                self.consumer_key,
+                self.consumer_secret,
+            )
+        return self._client
 
-        self.request_token = qs[OAUTH_PARAM_TOKEN]
-        self.request_token_secret = qs[OAUTH_PARAM_TOKEN_SECRET]
+    async def _get_request_token(self):
+        """Request a temporary request token."""
+        (
+            self.request_token,
+            self.request_token_secret,
+        ) = await self._api_client().async_get_request_token()
 
     async def _get_access_token(self, verifier: str):
         """Exchange the request token for an access token."""
-        oauth_params = {
-            OAUTH_PARAM_CONSUMER_KEY: self.consumer_key,
-            OAUTH_PARAM_NONCE: str(random.randint(0, 100000000)),
-            OAUTH_PARAM_TIMESTAMP: str(int(time.time())),
-            OAUTH_PARAM_SIGNATURE_METHOD: OAUTH_SIGNATURE_METHOD,
-            OAUTH_PARAM_VERSION: OAUTH_VERSION,
-            OAUTH_PARAM_TOKEN: self.request_token,
-            OAUTH_PARAM_VERIFIER: verifier,
-        }
+        return await self._api_client().async_get_access_token(
+            self.request_token, self.request_token_secret, verifier
+        )
 
-        base_string = oauth_build_base_string("GET", ACCESS_TOKEN_URL, oauth_params)
-        oauth_params[OAUTH_PARAM_SIGNATURE] = oauth_generate_signature(
-            base_string,
-            self.consumer_secret,
-            self.request_token_secret,
+
+class FatSecretOptionsFlow(config_entries.OptionsFlow):
+    """Handle FatSecret options."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the tracked nutrients, request budget and refresh throttling."""
+        if user_input is not None:
+            self._async_update_tracked_entities(user_input)
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_TRACKED_FIELDS,
+                    default=list(
+                        options.get(
+                            CONF_TRACKED_FIELDS, FATSECRET_DEFAULT_TRACKED_FIELDS
+                        )
+                    ),
+                ): cv.multi_select(
+                    {field: meta["name"] for field, meta in FATSECRET_FIELDS.items()}
+                ),
+                vol.Required(
+                    CONF_HOURLY_BUDGET,
+                    default=options.get(
+                        CONF_HOURLY_BUDGET, FATSECRET_DEFAULT_HOURLY_BUDGET
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_DAILY_BUDGET,
+                    default=options.get(
+                        CONF_DAILY_BUDGET, FATSECRET_DEFAULT_DAILY_BUDGET
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_FORCED_REFRESH_INTERVAL,
+                    default=options.get(
+                        CONF_FORCED_REFRESH_INTERVAL,
+                        FATSECRET_DEFAULT_FORCED_REFRESH_INTERVAL,
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_STALE_LIMIT,
+                    default=options.get(
+                        CONF_STALE_LIMIT, FATSECRET_DEFAULT_STALE_LIMIT
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_FETCH_CONCURRENCY,
+                    default=options.get(
+                        CONF_FETCH_CONCURRENCY, FATSECRET_DEFAULT_FETCH_CONCURRENCY
+                    ),
+                ): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(min=1, max=FATSECRET_MAX_FETCH_CONCURRENCY),
+                ),
+            }
         )
+        return self.async_show_form(step_id="init", data_schema=schema)
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(ACCESS_TOKEN_URL, params=oauth_params) as resp:
-                text = await resp.text()
-                _LOGGER.debug("Access token response: %s", text)
-                qs = dict(urllib.parse.parse_qsl(text))
-                return qs[OAUTH_PARAM_TOKEN], qs[OAUTH_PARAM_TOKEN_SECRET]
+    @callback
+    def _async_update_tracked_entities(self, user_input: dict) -> None:
+        """Enable the sensors of newly tracked nutrients, disable the others.
+
+        Only the nutrients whose tracking changed are touched, so a sensor
+        the user enabled or disabled by hand keeps its state.
+        """
+        entry = self.config_entry
+        previous = set(
+            entry.options.get(CONF_TRACKED_FIELDS, FATSECRET_DEFAULT_TRACKED_FIELDS)
+        )
+        tracked = set(user_input.get(CONF_TRACKED_FIELDS, previous))
+        if tracked == previous:
+            return
+
+        registry = er.async_get(self.hass)
+        for field in tracked ^ previous:
+            entity_id = registry.async_get_entity_id(
+                "sensor", DOMAIN, entity_unique_id(entry.entry_id, field)
+            )
+            if entity_id is None:
+                continue
+            if field in tracked:
+                registry.async_update_entity(entity_id, disabled_by=None)
+            elif registry.async_get(entity_id).disabled_by is None:
+                registry.async_update_entity(
+                    entity_id, disabled_by=er.RegistryEntryDisabler.INTEGRATION
+                )
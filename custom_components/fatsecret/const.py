@@ -6,6 +6,15 @@ CONF_CONSUMER_KEY = "consumer_key"
 CONF_CONSUMER_SECRET = "consumer_secret"
 CONF_TOKEN = "token"
 CONF_TOKEN_SECRET = "token_secret"
+CONF_HOURLY_BUDGET = "hourly_budget"
+CONF_DAILY_BUDGET = "daily_budget"
+CONF_FORCED_REFRESH_INTERVAL = "forced_refresh_interval"
+CONF_TRACKED_FIELDS = "tracked_fields"
+CONF_STALE_LIMIT = "stale_limit"
+CONF_FETCH_CONCURRENCY = "fetch_concurrency"
+
+DATA_REQUEST_BUDGETS = f"{DOMAIN}_request_budgets"
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
 
 REQUEST_TOKEN_URL = "https://authentication.fatsecret.com/oauth/request_token"
 AUTHORIZE_URL = "https://authentication.fatsecret.com/oauth/authorize"
@@ -49,6 +58,104 @@ FATSECRET_FIELDS = {
     "vitamin_c": {"unit": "mg", "name": "Vitamin C"},
 }
 FATSECRET_UPDATE_INTERVAL = 15
+# Nutrients with an enabled sensor until the user picks them in the options
+FATSECRET_DEFAULT_TRACKED_FIELDS = tuple(FATSECRET_FIELDS)
+
+# Meals of the FatSecret diary; entries with any other meal count as "other"
+FATSECRET_MEAL_OTHER = "other"
+FATSECRET_MEALS = ("breakfast", "lunch", "dinner", FATSECRET_MEAL_OTHER)
+ATTR_MEALS = "meals"
+
+# Days of the rolling sums/averages sensors (disabled by default)
+FATSECRET_ROLLING_WINDOWS = (7, 30)
+
+# Adaptive polling: minutes between polls during hours where the diary usually
+# changes, ceiling of the exponential backoff, and how the learned hourly
+# activity decays and when an hour counts as active
+FATSECRET_POLL_FAST_INTERVAL = 2
+FATSECRET_POLL_MAX_INTERVAL = 120
+FATSECRET_POLL_ACTIVITY_DECAY = 0.95
+FATSECRET_POLL_ACTIVITY_THRESHOLD = 1.0
+
+# Request budget per consumer key; below FATSECRET_BUDGET_LOW_RATIO of either
+# bucket, fast polling stops and forced refreshes are debounced
+FATSECRET_DEFAULT_HOURLY_BUDGET = 500
+FATSECRET_DEFAULT_DAILY_BUDGET = 5000
+FATSECRET_BUDGET_LOW_RATIO = 0.1
+# Minimum delay between two writes of the budget sensor while it refills
+FATSECRET_BUDGET_REFILL_WRITE_INTERVAL = 60  # seconds
+
+# Minimum seconds between two update_fatsecret calls hitting the API
+FATSECRET_DEFAULT_FORCED_REFRESH_INTERVAL = 0
+
+# Days still editable in FatSecret (today and yesterday) are never served
+# from the diary cache
+FATSECRET_DIARY_OPEN_DAYS = 2
+FATSECRET_DIARY_STORAGE_VERSION = 1
+FATSECRET_DIARY_SAVE_DELAY = 10  # seconds
+FATSECRET_BACKFILL_MAX_DAYS = 366
+# Days requested from the API at the same time by backfills and get_nutrition
+FATSECRET_DEFAULT_FETCH_CONCURRENCY = 4
+FATSECRET_MAX_FETCH_CONCURRENCY = 10
+
+# Day boundary (local time): last fetch of the day, then the sensors reset at
+# midnight and the closed day is fetched once more to catch late edits
+FATSECRET_DAY_FINALIZE_TIME = (23, 59, 0)
+FATSECRET_DAY_LATE_FETCH_TIME = (0, 30, 0)
+
+# Phases timed on every food-entries request and the upper bounds, in
+# milliseconds, of the buckets of their histograms
+FATSECRET_METRIC_PHASES = ("sign", "network", "parse", "aggregate")
+FATSECRET_METRIC_BUCKETS = (
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000
+)
+
+# Last totals and learned polling activity, restored on startup
+FATSECRET_STATE_STORAGE_VERSION = 1
+
+# Minutes the last totals of the day are served, flagged with ATTR_STALE_SINCE,
+# while refreshes fail; retries back off from FATSECRET_POLL_FAST_INTERVAL up
+# to FATSECRET_UPDATE_INTERVAL
+FATSECRET_DEFAULT_STALE_LIMIT = 120
+ATTR_STALE_SINCE = "stale_since"
+
+SERVICE_UPDATE = "update_fatsecret"
+SERVICE_BACKFILL = "backfill_fatsecret"
+SERVICE_GET_FOOD_LOG = "get_food_log"
+SERVICE_GET_NUTRITION = "get_nutrition"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+ATTR_DATE = "date"
+ATTR_OFFSET = "offset"
+ATTR_LIMIT = "limit"
+ATTR_FIELDS = "fields"
+
+# Food entries of the served day, as FoodLogEntry records. The food log sensor
+# shows the first FATSECRET_FOOD_LOG_MAX_ENTRIES of them, get_food_log returns
+# pages of up to FATSECRET_FOOD_LOG_MAX_PAGE entries
+ATTR_FOOD_LOG = "food_log"
+ATTR_ENTRIES = "entries"
+FATSECRET_FOOD_LOG_MAX_ENTRIES = 50
+FATSECRET_FOOD_LOG_MAX_PAGE = 200
+
+# Entry keys identifying a diary entry and its amount, hashed together with the
+# nutrient values to detect unchanged diaries between fetches
+FATSECRET_FINGERPRINT_KEYS = (
+    "food_entry_id",
+    "food_id",
+    "serving_id",
+    "number_of_units",
+    "meal",
+)
+# Entry keys kept in the diary cache; the rest of each entry is dropped
+FATSECRET_ENTRY_KEYS = (
+    *FATSECRET_FINGERPRINT_KEYS,
+    "food_entry_name",
+    "food_entry_description",
+    "date_int",
+    *FATSECRET_FIELDS,
+)
 
 
 FATSECRET_FOOD_ENTRIES_ERRORS = {
@@ -61,3 +168,17 @@ FATSECRET_FOOD_ENTRIES_ERRORS = {
     8: "Invalid signature",
     9: "Invalid access token",
 }
+# A used nonce succeeds once the request is signed again; an expired timestamp
+# is only resent by the client, once, with the clock offset it just learned.
+# An invalid consumer key, signature or token needs a new authorization
+FATSECRET_EXPIRED_TIMESTAMP_ERROR = 6
+FATSECRET_RETRYABLE_ERROR_CODES = (7,)
+FATSECRET_AUTH_ERROR_CODES = (5, 8, 9)
+
+FATSECRET_REQUEST_TIMEOUT = 30  # seconds
+FATSECRET_STREAM_CHUNK_SIZE = 4096  # bytes
+# Clock differences below this are ignored (the Date header has a 1s resolution)
+FATSECRET_CLOCK_SKEW_TOLERANCE = 5  # seconds
+FATSECRET_RETRY_ATTEMPTS = 3
+FATSECRET_RETRY_BASE_DELAY = 2  # seconds
+FATSECRET_RETRY_MAX_DELAY = 30  # seconds
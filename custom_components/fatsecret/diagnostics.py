@@ -0,0 +1,59 @@
+"""Diagnostics support for the FatSecret integration."""
+
+from dataclasses import asdict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .FatSecretCoordinator import FatSecretCoordinator
+from .const import (
+    CONF_CONSUMER_KEY,
+    CONF_CONSUMER_SECRET,
+    CONF_TOKEN,
+    CONF_TOKEN_SECRET,
+    DOMAIN,
+)
+
+TO_REDACT = {CONF_CONSUMER_KEY, CONF_CONSUMER_SECRET, CONF_TOKEN, CONF_TOKEN_SECRET}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    """Return the metrics and state of an entry, without its credentials."""
+    coordinator: FatSecretCoordinator = hass.data[DOMAIN][entry.entry_id]
+    budget = coordinator.api.budget
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "metrics": coordinator.metrics.as_dict(),
+        "retries": asdict(coordinator.retry_stats),
+        "forced_refreshes": {
+            "executed": coordinator.forced_refreshes_executed,
+            "coalesced": coordinator.forced_refreshes_coalesced,
+        },
+        "budget": {
+            "remaining": budget.remaining,
+            "hourly_remaining": int(budget.hourly.tokens),
+            "daily_remaining": int(budget.daily.tokens),
+            "denied_requests": budget.denied,
+        },
+        "polling": {
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval
+                else None
+            ),
+            "unchanged_polls": coordinator.polling.unchanged_polls,
+            "hour_activity": coordinator.polling.hour_activity,
+            "clock_offset": coordinator.api.clock_offset,
+        },
+        "data": {
+            "last_update_success": coordinator.last_update_success,
+            "stale_since": (
+                coordinator.stale_since.isoformat() if coordinator.stale_since else None
+            ),
+            "summed_fields": list(coordinator.fields),
+            "cached_days": len(coordinator.diary.items()),
+        },
+    }
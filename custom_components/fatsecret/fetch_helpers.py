@@ -0,0 +1,53 @@
+"""Bounded concurrent fetches of FatSecret diary days."""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from typing import TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+async def async_fetch_in_order(
+    keys: Sequence[K],
+    fetch: Callable[[K], Awaitable[V]],
+    concurrency: int,
+) -> AsyncIterator[tuple[K, V]]:
+    """Fetch every key with at most ``concurrency`` calls in flight.
+
+    Calls are started in key order and results are yielded in the same
+    order, each as soon as it and every result before it are done: a slow
+    key holds back the results after it, not their calls. The first error,
+    in key order, is raised and the calls still running are cancelled;
+    close the iterator (``contextlib.aclosing``) when stopping early for the
+    same effect.
+    """
+    loop = asyncio.get_running_loop()
+    futures: list[asyncio.Future[V]] = [loop.create_future() for _ in keys]
+    # Shared by the workers: each index is taken by exactly one of them
+    pending = iter(range(len(keys)))
+
+    async def worker() -> None:
+        for index in pending:
+            try:
+                result = await fetch(keys[index])
+            except Exception as err:
+                # Raised to the caller when it reaches this key
+                futures[index].set_exception(err)
+            else:
+                futures[index].set_result(result)
+
+    workers = [
+        asyncio.create_task(worker()) for _ in range(min(concurrency, len(keys)))
+    ]
+    try:
+        for key, future in zip(keys, futures):
+            yield key, await future
+    finally:
+        for task in workers:
+            task.cancel()
+        for future in futures:
+            if future.done() and not future.cancelled():
+                # Errors after the raised one are dropped, not logged as
+                # never retrieved
+                future.exception()
@@ -0,0 +1,117 @@
+"""Incremental parsing of FatSecret food-entries responses."""
+
+import codecs
+import json
+import re
+from collections.abc import AsyncIterable, Callable
+
+from .const import FATSECRET_FOOD_ENTRIES, FATSECRET_FOOD_ENTRY
+
+# Start of the food_entry value: the prefix before it is only a few bytes
+_FOOD_ENTRY_RE = re.compile(rf'"{FATSECRET_FOOD_ENTRY}"\s*:\s*(\S)')
+_WHITESPACE_RE = re.compile(r"[\s,]*")
+_PREFIX_LIMIT = 65536
+
+_DECODER = json.JSONDecoder()
+
+
+class _ChunkReader:
+    """Decode UTF-8 chunks into a text buffer on demand."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]) -> None:
+        self._chunks = aiter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.eof = False
+
+    async def read_more(self) -> bool:
+        """Append the next chunk to the buffer; False at end of stream."""
+        if self.eof:
+            return False
+        try:
+            chunk = await anext(self._chunks)
+        except StopAsyncIteration:
+            self.eof = True
+            self.buffer += self._decoder.decode(b"", final=True)
+            return False
+        self.buffer += self._decoder.decode(chunk)
+        return True
+
+    async def read_all(self) -> str:
+        """Return the buffer followed by the rest of the stream."""
+        while await self.read_more():
+            pass
+        return self.buffer
+
+
+async def _decode_value(reader: _ChunkReader, pos: int) -> tuple[object, int]:
+    """Decode the JSON value at ``pos``, reading chunks until it is complete."""
+    while True:
+        try:
+            return _DECODER.raw_decode(reader.buffer, pos)
+        except json.JSONDecodeError:
+            if not await reader.read_more():
+                raise
+
+
+async def async_parse_food_entries(
+    chunks: AsyncIterable[bytes], on_entry: Callable[[dict], None]
+) -> dict:
+    """Parse a food-entries response, handing each entry to ``on_entry``.
+
+    Entries are decoded one at a time as their bytes arrive and dropped from
+    the buffer once handed over, so peak memory is proportional to a single
+    entry rather than to the whole day. Returns the rest of the payload (an
+    ``{"error": ...}`` object for instance) with the entries removed.
+    Raises ValueError if the response is not valid JSON.
+    """
+    reader = _ChunkReader(chunks)
+
+    # Find where the food_entry value starts
+    while (match := _FOOD_ENTRY_RE.search(reader.buffer)) is None:
+        if len(reader.buffer) > _PREFIX_LIMIT or not await reader.read_more():
+            # No entries (empty day or error): the payload is small
+            return _fold_payload(json.loads(await reader.read_all()), on_entry)
+
+    prefix = reader.buffer[: match.start(1)]
+    reader.buffer = reader.buffer[match.start(1) :]
+
+    if match.group(1) == "[":
+        pos = 1
+        while True:
+            pos = _WHITESPACE_RE.match(reader.buffer, pos).end()
+            if pos == len(reader.buffer):
+                if not await reader.read_more():
+                    raise ValueError("Unterminated food_entry array")
+                continue
+            if reader.buffer[pos] == "]":
+                pos += 1
+                break
+            entry, pos = await _decode_value(reader, pos)
+            if isinstance(entry, dict):
+                on_entry(entry)
+            reader.buffer = reader.buffer[pos:]
+            pos = 0
+    else:
+        # A single entry is returned as an object rather than a list
+        entry, pos = await _decode_value(reader, 0)
+        if isinstance(entry, dict):
+            on_entry(entry)
+
+    reader.buffer = reader.buffer[pos:]
+    return json.loads(prefix + "[]" + await reader.read_all())
+
+
+def _fold_payload(data: object, on_entry: Callable[[dict], None]) -> dict:
+    """Hand the entries of an already parsed payload to ``on_entry``."""
+    if not isinstance(data, dict):
+        return {}
+    food_entries = data.get(FATSECRET_FOOD_ENTRIES)
+    if isinstance(food_entries, dict):
+        entries = food_entries.pop(FATSECRET_FOOD_ENTRY, [])
+        if isinstance(entries, dict):
+            entries = [entries]
+        for entry in entries:
+            if isinstance(entry, dict):
+                on_entry(entry)
+    return data
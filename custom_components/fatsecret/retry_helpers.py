@@ -0,0 +1,118 @@
+"""Retry helpers for FatSecret API calls."""
+
+import asyncio
+import logging
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TypeVar
+
+import aiohttp
+
+from .FatSecretApiClient import FatSecretApiError, FatSecretBudgetExceeded
+from .const import (
+    FATSECRET_AUTH_ERROR_CODES,
+    FATSECRET_RETRY_ATTEMPTS,
+    FATSECRET_RETRY_BASE_DELAY,
+    FATSECRET_RETRY_MAX_DELAY,
+    FATSECRET_RETRYABLE_ERROR_CODES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class ErrorClass(StrEnum):
+    """How a failed FatSecret call should be handled."""
+
+    RETRYABLE = "retryable"
+    AUTH = "auth"
+    FATAL = "fatal"
+
+
+def classify_error(err: BaseException) -> ErrorClass:
+    """Classify an error raised by a FatSecret API call.
+
+    Network errors, timeouts, 429/5xx responses and the used nonce OAuth
+    error are transient: the request is signed again on every attempt. An
+    expired timestamp was already resent by the client with the corrected
+    clock, so it is not retried again. Invalid consumer key, signature or
+    access token need the user to authorize again; anything else will not
+    get better by retrying.
+    """
+    if isinstance(err, FatSecretBudgetExceeded):
+        return ErrorClass.FATAL
+    if isinstance(err, FatSecretApiError):
+        if err.code in FATSECRET_AUTH_ERROR_CODES:
+            return ErrorClass.AUTH
+        if err.code in FATSECRET_RETRYABLE_ERROR_CODES:
+            return ErrorClass.RETRYABLE
+        if err.status is not None and (err.status == 429 or err.status >= 500):
+            return ErrorClass.RETRYABLE
+        return ErrorClass.FATAL
+    if isinstance(err, aiohttp.ClientResponseError):
+        return (
+            ErrorClass.RETRYABLE
+            if err.status == 429 or err.status >= 500
+            else ErrorClass.FATAL
+        )
+    if isinstance(err, (aiohttp.ClientError, TimeoutError)):
+        return ErrorClass.RETRYABLE
+    return ErrorClass.FATAL
+
+
+@dataclass
+class RetryStats:
+    """Counters describing the retry behaviour of an API caller."""
+
+    calls: int = 0
+    retries: int = 0
+    recovered: int = 0
+    failures: int = 0
+    last_error: str | None = None
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Return a full-jitter exponential backoff delay for a retry attempt."""
+    return random.uniform(0, min(max_delay, base_delay * 2**attempt))
+
+
+async def async_call_with_retry(
+    func: Callable[[], Awaitable[_T]],
+    stats: RetryStats,
+    attempts: int = FATSECRET_RETRY_ATTEMPTS,
+    base_delay: float = FATSECRET_RETRY_BASE_DELAY,
+    max_delay: float = FATSECRET_RETRY_MAX_DELAY,
+) -> _T:
+    """Await ``func()``, retrying retryable errors with backoff and jitter."""
+    stats.calls += 1
+    attempt = 0
+    while True:
+        try:
+            result = await func()
+        except Exception as err:
+            stats.last_error = str(err) or type(err).__name__
+            if (
+                classify_error(err) is not ErrorClass.RETRYABLE
+                or attempt >= attempts - 1
+            ):
+                stats.failures += 1
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            attempt += 1
+            stats.retries += 1
+            _LOGGER.debug(
+                "FatSecret call failed (%s), retry %d/%d in %.1f seconds",
+                stats.last_error,
+                attempt,
+                attempts - 1,
+                delay,
+            )
+            await asyncio.sleep(delay)
+            continue
+
+        if attempt:
+            stats.recovered += 1
+        return result
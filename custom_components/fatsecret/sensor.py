@@ -11,8 +11,15 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .FatSecretCoordinator import FatSecretCoordinator
-from .FatSecretSensor import FatSecretSensor
-from .const import FATSECRET_FIELDS
+from .FatSecretSensor import (
+    METRICS_SENSORS,
+    FatSecretBudgetSensor,
+    FatSecretFoodLogSensor,
+    FatSecretMetricsSensor,
+    FatSecretRollingSensor,
+    FatSecretSensor,
+)
+from .const import FATSECRET_FIELDS, FATSECRET_ROLLING_WINDOWS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,5 +34,22 @@ async def async_setup_entry(
     coordinator: FatSecretCoordinator = hass.data[DOMAIN].get(entry.entry_id)
 
     if coordinator:
-        sensors = [FatSecretSensor(coordinator, field) for field in FATSECRET_FIELDS]
+        # Every nutrient has a sensor, only the tracked ones enabled by default
+        sensors = [
+            FatSecretSensor(
+                coordinator, field, field in coordinator.tracked_fields
+            )
+            for field in FATSECRET_FIELDS
+        ]
+        sensors.extend(
+            FatSecretRollingSensor(coordinator, field, days)
+            for days in FATSECRET_ROLLING_WINDOWS
+            for field in FATSECRET_FIELDS
+        )
+        sensors.append(FatSecretFoodLogSensor(coordinator))
+        sensors.append(FatSecretBudgetSensor(entry, coordinator.api.budget))
+        sensors.extend(
+            FatSecretMetricsSensor(entry, coordinator.metrics, description)
+            for description in METRICS_SENSORS
+        )
         async_add_entities(sensors)
@@ -0,0 +1,206 @@
+"""Services of the FatSecret integration."""
+
+import asyncio
+import logging
+from datetime import date as date_cls, timedelta
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .FatSecretApiClient import FatSecretBudgetExceeded
+from .FatSecretCoordinator import FatSecretCoordinator
+from .FatSecretFoodLog import food_log_page
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DATE,
+    ATTR_END_DATE,
+    ATTR_ENTRIES,
+    ATTR_FIELDS,
+    ATTR_LIMIT,
+    ATTR_OFFSET,
+    ATTR_START_DATE,
+    DOMAIN,
+    FATSECRET_BACKFILL_MAX_DAYS,
+    FATSECRET_FIELDS,
+    FATSECRET_FOOD_LOG_MAX_ENTRIES,
+    FATSECRET_FOOD_LOG_MAX_PAGE,
+    SERVICE_BACKFILL,
+    SERVICE_GET_FOOD_LOG,
+    SERVICE_GET_NUTRITION,
+    SERVICE_UPDATE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+UPDATE_SCHEMA = vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+BACKFILL_SCHEMA = UPDATE_SCHEMA.extend(
+    {
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
+GET_NUTRITION_SCHEMA = BACKFILL_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_FIELDS, default=list(FATSECRET_FIELDS)): vol.All(
+            cv.ensure_list, [vol.In(FATSECRET_FIELDS)]
+        ),
+    }
+)
+
+GET_FOOD_LOG_SCHEMA = UPDATE_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_DATE): cv.date,
+        vol.Optional(ATTR_OFFSET, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_LIMIT, default=FATSECRET_FOOD_LOG_MAX_ENTRIES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=FATSECRET_FOOD_LOG_MAX_PAGE)
+        ),
+    }
+)
+
+
+def _coordinators(hass: HomeAssistant, call: ServiceCall) -> list[FatSecretCoordinator]:
+    """Return the coordinator of the targeted entry, or of every loaded entry."""
+    coordinators: dict[str, FatSecretCoordinator] = hass.data.get(DOMAIN, {})
+    if (entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID)) is not None:
+        if entry_id not in coordinators:
+            raise ServiceValidationError(f"FatSecret entry {entry_id} is not loaded")
+        return [coordinators[entry_id]]
+    if not coordinators:
+        raise ServiceValidationError("No FatSecret entry is loaded")
+    return list(coordinators.values())
+
+
+def _date_range(call: ServiceCall) -> tuple[date_cls, date_cls]:
+    """Return the validated [start, end] range of a call, ending today at most."""
+    today = dt_util.now().date()
+    start = call.data[ATTR_START_DATE]
+    end = min(call.data.get(ATTR_END_DATE, today), today)
+    if start > end:
+        raise ServiceValidationError(f"Start date {start} is after end date {end}")
+    if (end - start).days >= FATSECRET_BACKFILL_MAX_DAYS:
+        raise ServiceValidationError(
+            f"Date ranges are limited to {FATSECRET_BACKFILL_MAX_DAYS} days"
+        )
+    return start, end
+
+
+def _nutrition(
+    coordinator: FatSecretCoordinator,
+    start: date_cls,
+    end: date_cls,
+    fields: list[str],
+) -> dict:
+    """Return the cached daily totals of [start, end] and their sums."""
+    days = {}
+    totals = dict.fromkeys(fields, 0.0)
+    day = start
+    while day <= end:
+        if (day_totals := coordinator.diary.totals(day)) is not None:
+            days[day.isoformat()] = {field: day_totals[field] for field in fields}
+            for field in fields:
+                totals[field] += day_totals[field]
+        day += timedelta(days=1)
+    return {
+        ATTR_START_DATE: start.isoformat(),
+        ATTR_END_DATE: end.isoformat(),
+        "days": days,
+        "totals": totals,
+        "daily_average": {
+            field: value / len(days) if days else None
+            for field, value in totals.items()
+        },
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the FatSecret services, once for all entries."""
+
+    async def handle_update_fatsecret(call: ServiceCall) -> None:
+        await asyncio.gather(
+            *(
+                coordinator.async_forced_refresh()
+                for coordinator in _coordinators(hass, call)
+            )
+        )
+
+    async def handle_backfill_fatsecret(call: ServiceCall) -> None:
+        coordinators = _coordinators(hass, call)
+        start, end = _date_range(call)
+        for coordinator in coordinators:
+            try:
+                await coordinator.async_backfill(start, end)
+            except FatSecretBudgetExceeded as err:
+                raise HomeAssistantError(
+                    "FatSecret request budget exhausted, backfill stopped early"
+                ) from err
+
+    async def handle_get_nutrition(call: ServiceCall) -> ServiceResponse:
+        coordinators = _coordinators(hass, call)
+        start, end = _date_range(call)
+        response: dict = {}
+        for coordinator in coordinators:
+            try:
+                fetched = await coordinator.async_fetch_missing_days(start, end)
+            except FatSecretBudgetExceeded as err:
+                raise HomeAssistantError(
+                    "FatSecret request budget exhausted, days are missing"
+                ) from err
+            response[coordinator.entry.entry_id] = {
+                **_nutrition(coordinator, start, end, call.data[ATTR_FIELDS]),
+                "fetched_days": fetched,
+            }
+        return response
+
+    async def handle_get_food_log(call: ServiceCall) -> ServiceResponse:
+        day = call.data.get(ATTR_DATE, dt_util.now().date())
+        offset = call.data[ATTR_OFFSET]
+        response: dict = {}
+        for coordinator in _coordinators(hass, call):
+            # Served from memory and the diary cache: no API call
+            food_log = coordinator.food_log(day)
+            response[coordinator.entry.entry_id] = {
+                ATTR_DATE: day.isoformat(),
+                "cached": food_log is not None,
+                "total": len(food_log or ()),
+                ATTR_OFFSET: offset,
+                ATTR_ENTRIES: food_log_page(
+                    food_log or (), offset, call.data[ATTR_LIMIT]
+                ),
+            }
+        return response
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_UPDATE, handle_update_fatsecret, UPDATE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, handle_backfill_fatsecret, BACKFILL_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FOOD_LOG,
+        handle_get_food_log,
+        GET_FOOD_LOG_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_NUTRITION,
+        handle_get_nutrition,
+        GET_NUTRITION_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,86 @@
+"""Helpers importing FatSecret daily totals as long-term statistics."""
+
+import logging
+from datetime import date as date_cls
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, FATSECRET_FIELDS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def statistic_id(entry_id: str, field: str) -> str:
+    """Return the external statistic id of a field of a config entry."""
+    # Statistic ids only allow lowercase letters, digits and underscores
+    return f"{DOMAIN}:{entry_id.lower()}_{field}"
+
+
+def build_field_statistics(
+    entry: ConfigEntry, field: str, daily_totals: dict[date_cls, dict[str, float]]
+) -> tuple[StatisticMetaData, list[StatisticData]]:
+    """Return the metadata and rows of one field, one row per day.
+
+    Each row starts at local midnight of its day; ``state`` holds the day's
+    total and ``sum`` the running total since the first imported day, so the
+    recorder can aggregate the rows into daily/weekly/monthly statistics.
+    """
+    metadata = StatisticMetaData(
+        mean_type=StatisticMeanType.NONE,
+        has_sum=True,
+        name=f"{entry.title} {FATSECRET_FIELDS[field]['name']}",
+        source=DOMAIN,
+        statistic_id=statistic_id(entry.entry_id, field),
+        unit_of_measurement=FATSECRET_FIELDS[field]["unit"],
+    )
+
+    rows: list[StatisticData] = []
+    running_sum = 0.0
+    for day in sorted(daily_totals):
+        value = daily_totals[day].get(field, 0.0)
+        running_sum += value
+        rows.append(
+            StatisticData(
+                start=dt_util.start_of_local_day(day),
+                state=value,
+                sum=running_sum,
+            )
+        )
+    return metadata, rows
+
+
+def async_import_daily_statistics(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    daily_totals: dict[date_cls, dict[str, float]],
+) -> None:
+    """Queue one batched insert per field of the given closed days.
+
+    The whole history is imported each time so the cumulative sums stay
+    consistent; the recorder updates rows that already exist.
+    """
+    if "recorder" not in hass.config.components:
+        _LOGGER.debug("Recorder not loaded, skipping FatSecret statistics import")
+        return
+    if not daily_totals:
+        return
+
+    for field in FATSECRET_FIELDS:
+        metadata, rows = build_field_statistics(entry, field, daily_totals)
+        async_add_external_statistics(hass, metadata, rows)
+
+    _LOGGER.debug(
+        "Queued FatSecret statistics for %d days and %d fields",
+        len(daily_totals),
+        len(FATSECRET_FIELDS),
+    )
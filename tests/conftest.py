@@ -1,3 +1,93 @@
 """pytest fixtures."""
 
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
 import pytest
+
+from custom_components.fatsecret.FatSecretRateLimiter import FatSecretRequestBudget
+from custom_components.fatsecret.FatSecretScheduler import FatSecretScheduler
+from tests.fatsecret_simulator import FatSecretSimulator
+from custom_components.fatsecret.const import (
+    FATSECRET_DEFAULT_DAILY_BUDGET,
+    FATSECRET_DEFAULT_HOURLY_BUDGET,
+)
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the benchmarks unless FATSECRET_BENCHMARK is set."""
+    if os.environ.get("FATSECRET_BENCHMARK"):
+        return
+    skip = pytest.mark.skip(reason="set FATSECRET_BENCHMARK=1 to run benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def mock_clientsession():
+    """Keep coordinators built on a MagicMock hass away from real sessions."""
+    with patch(
+        "custom_components.fatsecret.FatSecretCoordinator.async_get_clientsession",
+        return_value=MagicMock(),
+    ) as mock_get_session:
+        yield mock_get_session
+
+
+@pytest.fixture(autouse=True)
+def mock_diary_store():
+    """Keep the diary cache of MagicMock hass instances off the disk."""
+    with patch(
+        "custom_components.fatsecret.FatSecretDiaryCache.Store"
+    ) as mock_store_cls:
+        mock_store_cls.return_value.async_load = AsyncMock(return_value=None)
+        yield mock_store_cls.return_value
+
+
+@pytest.fixture(autouse=True)
+def mock_state_store():
+    """Keep the last-known state of MagicMock hass instances off the disk."""
+    with patch(
+        "custom_components.fatsecret.FatSecretStateStore.Store"
+    ) as mock_store_cls:
+        mock_store_cls.return_value.async_load = AsyncMock(return_value=None)
+        yield mock_store_cls.return_value
+
+
+@pytest.fixture(autouse=True)
+def mock_request_budget():
+    """Give coordinators built on a MagicMock hass a real, roomy budget."""
+    with patch(
+        "custom_components.fatsecret.FatSecretCoordinator.async_get_request_budget",
+        side_effect=lambda hass, key, hourly, daily: FatSecretRequestBudget(
+            FATSECRET_DEFAULT_HOURLY_BUDGET, FATSECRET_DEFAULT_DAILY_BUDGET
+        ),
+    ) as mock_get_budget:
+        yield mock_get_budget
+
+
+@pytest.fixture(autouse=True)
+def mock_scheduler():
+    """Give coordinators built on a MagicMock hass their own real scheduler."""
+    with patch(
+        "custom_components.fatsecret.FatSecretCoordinator.async_get_scheduler",
+        side_effect=lambda hass: FatSecretScheduler(),
+    ) as mock_get_scheduler:
+        yield mock_get_scheduler
+
+
+@pytest.fixture
+async def fatsecret_simulator(socket_enabled):
+    """Run a local FatSecret API simulator on 127.0.0.1."""
+    simulator = FatSecretSimulator()
+    await simulator.start()
+    yield simulator
+    await simulator.close()
+
+
+@pytest.fixture
+async def client_session(socket_enabled):
+    """Return a real aiohttp session, for requests to the simulator."""
+    async with aiohttp.ClientSession() as session:
+        yield session
@@ -0,0 +1,190 @@
+"""Load benchmark of the coordinator against the local FatSecret simulator."""
+
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.fatsecret.FatSecretCoordinator import FatSecretCoordinator
+from custom_components.fatsecret.FatSecretRateLimiter import FatSecretRequestBudget
+from custom_components.fatsecret.const import (
+    CONF_CONSUMER_KEY,
+    CONF_FETCH_CONCURRENCY,
+    CONF_CONSUMER_SECRET,
+    CONF_TOKEN,
+    CONF_TOKEN_SECRET,
+    FATSECRET_FIELDS,
+)
+from tests.fatsecret_simulator import FatSecretSimulator
+
+
+@dataclass
+class BenchmarkReport:
+    """Latency, memory and request counts of a run of refresh cycles."""
+
+    cycles: int
+    p50_ms: float
+    p99_ms: float
+    requests_per_refresh: float
+    bytes_per_refresh: float
+    allocated_kib: float
+    peak_kib: float
+    failed_refreshes: int
+
+    def __str__(self) -> str:
+        return (
+            f"{self.cycles} refreshes: p50 {self.p50_ms:.2f} ms, "
+            f"p99 {self.p99_ms:.2f} ms, "
+            f"{self.requests_per_refresh:.3f} requests/refresh, "
+            f"{self.bytes_per_refresh:.0f} bytes/refresh, "
+            f"{self.allocated_kib:.1f} KiB retained, "
+            f"{self.peak_kib:.1f} KiB peak, "
+            f"{self.failed_refreshes} failed"
+        )
+
+
+@dataclass
+class RangeReport:
+    """Wall time and request count of a backfill of consecutive days."""
+
+    days: int
+    concurrency: int
+    wall_ms: float
+    requests: int
+
+    def __str__(self) -> str:
+        return (
+            f"{self.days} days, {self.concurrency} at a time: "
+            f"{self.wall_ms:.0f} ms wall, {self.requests} requests"
+        )
+
+
+def make_coordinator(simulator: FatSecretSimulator, session) -> FatSecretCoordinator:
+    """Return a coordinator on a MagicMock hass talking to the simulator."""
+    entry = MagicMock()
+    token = next(iter(simulator.tokens))
+    entry.data = {
+        CONF_CONSUMER_KEY: simulator.consumer_key,
+        CONF_CONSUMER_SECRET: simulator.consumer_secret,
+        CONF_TOKEN: token,
+        CONF_TOKEN_SECRET: simulator.tokens[token],
+    }
+    entry.options = {}
+    coordinator = FatSecretCoordinator(MagicMock(), entry)
+    coordinator.api = simulator.client(session)
+    coordinator.api.metrics = coordinator.metrics
+    # Thousands of refreshes would exhaust the default budget
+    coordinator.api.budget = FatSecretRequestBudget(10**9, 10**9)
+    return coordinator
+
+
+def food_entry(i: int) -> dict:
+    """Return a food entry shaped like the API's."""
+    return {
+        "food_entry_id": str(i),
+        "food_entry_name": f"Food {i}",
+        "meal": ("Breakfast", "Lunch", "Dinner", "Other")[i % 4],
+        "number_of_units": "1.000",
+        **{
+            field: f"{(i * 7 + n) % 300}.50"
+            for n, field in enumerate(FATSECRET_FIELDS)
+        },
+    }
+
+
+async def async_run_cycles(
+    coordinator: FatSecretCoordinator,
+    simulator: FatSecretSimulator,
+    cycles: int,
+    edit_every: int,
+) -> tuple[list[float], int]:
+    """Refresh ``cycles`` times, logging a new entry every ``edit_every``."""
+    today = dt_util.now().date()
+    diary = simulator.diary.setdefault(today, [])
+    latencies = []
+    failed = 0
+    for cycle in range(cycles):
+        if cycle % edit_every == 0:
+            diary.append(food_entry(len(diary)))
+        start = time.perf_counter()
+        try:
+            coordinator.data = await coordinator._async_update_data()
+        except Exception:
+            failed += 1
+        latencies.append(time.perf_counter() - start)
+    return latencies, failed
+
+
+async def async_run_refresh_benchmark(
+    coordinator: FatSecretCoordinator,
+    simulator: FatSecretSimulator,
+    cycles: int,
+    edit_every: int = 50,
+) -> BenchmarkReport:
+    """Drive the coordinator through refresh cycles and report on them.
+
+    Latencies come from a first pass; retained and peak memory from a
+    second, shorter pass under tracemalloc, which slows everything down.
+    """
+    requests_before = simulator.requests["food_entries"]
+    bytes_before = simulator.bytes_sent
+    latencies, failed = await async_run_cycles(
+        coordinator, simulator, cycles, edit_every
+    )
+    requests = simulator.requests["food_entries"] - requests_before
+    sent = simulator.bytes_sent - bytes_before
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await async_run_cycles(
+            coordinator, simulator, max(cycles // 10, 1), edit_every
+        )
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return BenchmarkReport(
+        cycles=cycles,
+        p50_ms=quantiles[49] * 1e3,
+        p99_ms=quantiles[98] * 1e3,
+        requests_per_refresh=requests / cycles,
+        bytes_per_refresh=sent / cycles,
+        allocated_kib=(current - baseline) / 1024,
+        peak_kib=(peak - baseline) / 1024,
+        failed_refreshes=failed,
+    )
+
+
+async def async_run_range_benchmark(
+    simulator: FatSecretSimulator,
+    session,
+    days: int,
+    concurrency: int,
+    entries_per_day: int = 10,
+) -> RangeReport:
+    """Backfill ``days`` closed days into an empty cache and time it."""
+    coordinator = make_coordinator(simulator, session)
+    coordinator.entry.options = {CONF_FETCH_CONCURRENCY: concurrency}
+    end = dt_util.now().date() - timedelta(days=1)
+    start = end - timedelta(days=days - 1)
+    for offset in range(days):
+        simulator.diary[start + timedelta(days=offset)] = [
+            food_entry(offset * entries_per_day + i) for i in range(entries_per_day)
+        ]
+
+    requests_before = simulator.requests["food_entries"]
+    begin = time.perf_counter()
+    await coordinator.async_backfill(start, end)
+    return RangeReport(
+        days=days,
+        concurrency=concurrency,
+        wall_ms=(time.perf_counter() - begin) * 1e3,
+        requests=simulator.requests["food_entries"] - requests_before,
+    )
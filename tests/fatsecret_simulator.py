@@ -0,0 +1,316 @@
+"""Local stand-in for the FatSecret OAuth 1.0 endpoints and food-entries/v2.
+
+The simulator checks requests the way FatSecret does: every OAuth parameter
+must be present, the signature is recomputed with ``oauth_helpers`` from the
+consumer and token secrets, timestamps must be within five minutes of the
+server clock and nonces cannot be reused. Latency, HTTP 5xx responses and
+any of the API error codes 2-9 can be injected to exercise the client.
+"""
+
+import asyncio
+import hmac
+import json
+import random
+import secrets
+import time
+import urllib.parse
+from collections import Counter, deque
+from datetime import date as date_cls
+from email.utils import formatdate
+
+from aiohttp import web
+
+from custom_components.fatsecret.FatSecretApiClient import (
+    EPOCH_DATE,
+    FatSecretApiClient,
+)
+from custom_components.fatsecret.const import (
+    FATSECRET_FOOD_ENTRIES,
+    FATSECRET_FOOD_ENTRIES_ERRORS,
+    FATSECRET_FOOD_ENTRY,
+    OAUTH_PARAM_CALLBACK,
+    OAUTH_PARAM_CONSUMER_KEY,
+    OAUTH_PARAM_NONCE,
+    OAUTH_PARAM_SIGNATURE,
+    OAUTH_PARAM_SIGNATURE_METHOD,
+    OAUTH_PARAM_TIMESTAMP,
+    OAUTH_PARAM_TOKEN,
+    OAUTH_PARAM_TOKEN_SECRET,
+    OAUTH_PARAM_VERIFIER,
+    OAUTH_PARAM_VERSION,
+    OAUTH_SIGNATURE_METHOD,
+)
+from custom_components.fatsecret.oauth_helpers import (
+    oauth_build_base_string,
+    oauth_generate_signature,
+)
+
+REQUEST_TOKEN_PATH = "/oauth/request_token"
+AUTHORIZE_PATH = "/oauth/authorize"
+ACCESS_TOKEN_PATH = "/oauth/access_token"
+FOOD_ENTRIES_PATH = "/rest/food-entries/v2"
+
+# Seconds a timestamp may differ from the server clock
+TIMESTAMP_WINDOW = 300
+
+_REQUIRED_PARAMS = (
+    OAUTH_PARAM_CONSUMER_KEY,
+    OAUTH_PARAM_NONCE,
+    OAUTH_PARAM_SIGNATURE,
+    OAUTH_PARAM_SIGNATURE_METHOD,
+    OAUTH_PARAM_TIMESTAMP,
+    OAUTH_PARAM_VERSION,
+)
+_SUPPORTED_PARAMS = {
+    *_REQUIRED_PARAMS,
+    OAUTH_PARAM_CALLBACK,
+    OAUTH_PARAM_TOKEN,
+    OAUTH_PARAM_VERIFIER,
+}
+
+
+class OAuthRejected(Exception):
+    """A request failing the OAuth checks, with its FatSecret error code."""
+
+    def __init__(self, code: int) -> None:
+        super().__init__(FATSECRET_FOOD_ENTRIES_ERRORS[code])
+        self.code = code
+
+
+def parse_authorization_header(header: str) -> dict[str, str]:
+    """Return the parameters of an ``OAuth k="v", ...`` header."""
+    if not header.startswith("OAuth "):
+        return {}
+    params = {}
+    for pair in header.removeprefix("OAuth ").split(","):
+        key, _, value = pair.strip().partition("=")
+        params[urllib.parse.unquote(key)] = urllib.parse.unquote(value.strip('"'))
+    return params
+
+
+class FatSecretSimulator:
+    """aiohttp server answering like FatSecret for one consumer key."""
+
+    def __init__(
+        self,
+        consumer_key: str = "key",
+        consumer_secret: str = "secret",
+        token: str = "token",
+        token_secret: str = "token_secret",
+        seed: int = 0,
+    ) -> None:
+        self.consumer_key = consumer_key
+        self.consumer_secret = consumer_secret
+        # Access tokens and request tokens with their secrets
+        self.tokens = {token: token_secret}
+        self.request_tokens: dict[str, str] = {}
+        self.verifiers: dict[str, str] = {}
+        # Food entries served for each day
+        self.diary: dict[date_cls, list[dict]] = {}
+
+        # Fault injection
+        self.latency = 0.0
+        self.clock_skew = 0.0
+        self.server_error_rate = 0.0
+        self.faults: deque[int] = deque()
+        self._rng = random.Random(seed)
+
+        self.requests: Counter[str] = Counter()
+        self.responses: Counter[str] = Counter()
+        self.bytes_sent = 0
+        self._nonces: set[tuple[str, str]] = set()
+
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    def inject(self, *faults: int) -> None:
+        """Answer the next food-entries requests with HTTP statuses (>= 500)
+        or FatSecret error codes (2-9), one per request."""
+        self.faults.extend(faults)
+
+    async def start(self) -> str:
+        """Listen on a free local port and return the base URL."""
+        app = web.Application()
+        app.router.add_get(REQUEST_TOKEN_PATH, self._handle_request_token)
+        app.router.add_get(AUTHORIZE_PATH, self._handle_authorize)
+        app.router.add_get(ACCESS_TOKEN_PATH, self._handle_access_token)
+        app.router.add_get(FOOD_ENTRIES_PATH, self._handle_food_entries)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def close(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def client(self, session, token: str | None = None) -> FatSecretApiClient:
+        """Return an API client pointed at the simulator."""
+        if token is None:
+            token = next(iter(self.tokens))
+        api = FatSecretApiClient(
+            session,
+            self.consumer_key,
+            self.consumer_secret,
+            token,
+            self.tokens.get(token, ""),
+            food_entries_url=self.base_url + FOOD_ENTRIES_PATH,
+        )
+        api.request_token_url = self.base_url + REQUEST_TOKEN_PATH
+        api.access_token_url = self.base_url + ACCESS_TOKEN_PATH
+        return api
+
+    # Checks
+
+    def _check(
+        self, request: web.Request, params: dict[str, str], token_secret: str
+    ) -> None:
+        """Raise OAuthRejected if the signed parameters are not valid."""
+        oauth_params = {k: v for k, v in params.items() if k.startswith("oauth_")}
+        if any(param not in oauth_params for param in _REQUIRED_PARAMS):
+            raise OAuthRejected(2)
+        if set(oauth_params) - _SUPPORTED_PARAMS:
+            raise OAuthRejected(3)
+        if params[OAUTH_PARAM_SIGNATURE_METHOD] != OAUTH_SIGNATURE_METHOD:
+            raise OAuthRejected(4)
+        if params[OAUTH_PARAM_CONSUMER_KEY] != self.consumer_key:
+            raise OAuthRejected(5)
+        try:
+            timestamp = int(params[OAUTH_PARAM_TIMESTAMP])
+        except ValueError:
+            raise OAuthRejected(6) from None
+        if abs(timestamp - self._now()) > TIMESTAMP_WINDOW:
+            raise OAuthRejected(6)
+        nonce = (params[OAUTH_PARAM_NONCE], params[OAUTH_PARAM_TIMESTAMP])
+        if nonce in self._nonces:
+            raise OAuthRejected(7)
+
+        url = str(request.url.with_query(None))
+        signed = {k: v for k, v in params.items() if k != OAUTH_PARAM_SIGNATURE}
+        expected = oauth_generate_signature(
+            oauth_build_base_string(request.method, url, signed),
+            self.consumer_secret,
+            token_secret,
+        )
+        if not hmac.compare_digest(expected, params[OAUTH_PARAM_SIGNATURE]):
+            raise OAuthRejected(8)
+        self._nonces.add(nonce)
+
+    def _now(self) -> float:
+        """Return the server clock."""
+        return time.time() + self.clock_skew
+
+    def _headers(self) -> dict[str, str]:
+        return {"Date": formatdate(self._now(), usegmt=True)}
+
+    async def _delay(self, name: str) -> None:
+        self.requests[name] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _error(self, code: int) -> web.Response:
+        self.responses[f"error_{code}"] += 1
+        body = {
+            "error": {"code": code, "message": FATSECRET_FOOD_ENTRIES_ERRORS[code]}
+        }
+        return web.json_response(body, headers=self._headers())
+
+    # Handlers
+
+    async def _handle_request_token(self, request: web.Request) -> web.Response:
+        await self._delay("request_token")
+        params = dict(request.query)
+        try:
+            self._check(request, params, "")
+        except OAuthRejected as err:
+            return web.Response(status=401, text=str(err), headers=self._headers())
+        token, secret = secrets.token_hex(8), secrets.token_hex(8)
+        self.request_tokens[token] = secret
+        return web.Response(
+            text=urllib.parse.urlencode(
+                {
+                    OAUTH_PARAM_TOKEN: token,
+                    OAUTH_PARAM_TOKEN_SECRET: secret,
+                    "oauth_callback_confirmed": "true",
+                }
+            ),
+            headers=self._headers(),
+        )
+
+    async def _handle_authorize(self, request: web.Request) -> web.Response:
+        """Stand for the user approving access in the browser."""
+        await self._delay("authorize")
+        token = request.query.get(OAUTH_PARAM_TOKEN, "")
+        if token not in self.request_tokens:
+            return web.Response(status=400, text="Unknown request token")
+        verifier = self.verifiers[token] = secrets.token_hex(4)
+        return web.Response(text=verifier)
+
+    async def _handle_access_token(self, request: web.Request) -> web.Response:
+        await self._delay("access_token")
+        params = dict(request.query)
+        request_token = params.get(OAUTH_PARAM_TOKEN, "")
+        if request_token not in self.request_tokens:
+            return web.Response(status=401, text=FATSECRET_FOOD_ENTRIES_ERRORS[9])
+        try:
+            self._check(request, params, self.request_tokens[request_token])
+        except OAuthRejected as err:
+            return web.Response(status=401, text=str(err), headers=self._headers())
+        if params.get(OAUTH_PARAM_VERIFIER) != self.verifiers.pop(request_token, None):
+            return web.Response(status=401, text="Invalid verifier")
+        del self.request_tokens[request_token]
+        token, secret = secrets.token_hex(8), secrets.token_hex(8)
+        self.tokens[token] = secret
+        return web.Response(
+            text=urllib.parse.urlencode(
+                {OAUTH_PARAM_TOKEN: token, OAUTH_PARAM_TOKEN_SECRET: secret}
+            ),
+            headers=self._headers(),
+        )
+
+    async def _handle_food_entries(self, request: web.Request) -> web.Response:
+        await self._delay("food_entries")
+        if self.faults:
+            fault = self.faults.popleft()
+            if fault >= 500:
+                self.responses[f"http_{fault}"] += 1
+                return web.Response(status=fault, text="Injected server error")
+            return self._error(fault)
+        if self.server_error_rate and self._rng.random() < self.server_error_rate:
+            self.responses["http_503"] += 1
+            return web.Response(status=503, text="Injected server error")
+
+        params = {
+            **parse_authorization_header(request.headers.get("Authorization", "")),
+            **request.query,
+        }
+        token = params.get(OAUTH_PARAM_TOKEN, "")
+        if token not in self.tokens:
+            return self._error(9)
+        try:
+            self._check(request, params, self.tokens[token])
+        except OAuthRejected as err:
+            return self._error(err.code)
+
+        try:
+            day = EPOCH_DATE.fromordinal(
+                EPOCH_DATE.toordinal() + int(params.get("date", ""))
+            )
+        except ValueError:
+            return self._error(2)
+        entries = self.diary.get(day)
+        payload = {
+            FATSECRET_FOOD_ENTRIES: (
+                {FATSECRET_FOOD_ENTRY: entries} if entries else None
+            )
+        }
+        body = json.dumps(payload).encode()
+        self.responses["ok"] += 1
+        self.bytes_sent += len(body)
+        return web.Response(
+            body=body, content_type="application/json", headers=self._headers()
+        )
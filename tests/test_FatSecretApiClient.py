@@ -0,0 +1,192 @@
+import json
+import time
+import pytest
+from datetime import date as date_cls
+from email.utils import formatdate
+from unittest.mock import patch
+
+from custom_components.fatsecret.FatSecretApiClient import (
+    FatSecretApiClient,
+    FatSecretApiError,
+)
+from custom_components.fatsecret.const import API_FOOD_ENTRIES_URL
+
+
+class MockContent:
+    def __init__(self, body):
+        self.body = body
+
+    async def iter_chunked(self, n):
+        for i in range(0, len(self.body), n):
+            yield self.body[i : i + n]
+
+
+class MockResp:
+    def __init__(self, response=None, text=""):
+        self.response = response
+        self._text = text
+        self.status = 200
+        self.headers = {}
+        self.content = MockContent(json.dumps(response).encode())
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    def raise_for_status(self):
+        return None
+
+    async def json(self):
+        return self.response
+
+    async def text(self):
+        return self._text
+
+
+class RecordingSession:
+    """Session double recording every request made through it."""
+
+    def __init__(self, resp):
+        self.resp = resp
+        self.calls = []
+
+    def get(self, url, headers=None, params=None):
+        self.calls.append((url, headers, params))
+        return self.resp
+
+
+def ignore_entry(entry):
+    pass
+
+
+def make_client(session) -> FatSecretApiClient:
+    return FatSecretApiClient(session, "key", "secret", "token", "token_secret")
+
+
+@pytest.mark.asyncio
+async def test_food_entries_reuses_shared_session():
+    """Every request goes through the injected session, never a new one."""
+    session = RecordingSession(MockResp({"food_entries": None}))
+    client = make_client(session)
+
+    with patch("aiohttp.ClientSession") as new_session:
+        await client.async_get_food_entries(date_cls(2026, 6, 24), ignore_entry)
+        await client.async_get_food_entries(date_cls(2026, 6, 24), ignore_entry)
+
+    new_session.assert_not_called()
+    assert len(session.calls) == 2
+    url, headers, params = session.calls[0]
+    assert url == API_FOOD_ENTRIES_URL
+    assert headers["Authorization"].startswith("OAuth ")
+    assert 'oauth_token="token"' in headers["Authorization"]
+    assert params == {
+        "format": "json",
+        "date": str((date_cls(2026, 6, 24) - date_cls(1970, 1, 1)).days),
+    }
+
+
+@pytest.mark.asyncio
+async def test_food_entries_api_error_carries_code():
+    session = RecordingSession(MockResp({"error": {"code": 8, "message": "bad"}}))
+    client = make_client(session)
+
+    with pytest.raises(FatSecretApiError, match="OAuth error 8") as exc_info:
+        await client.async_get_food_entries(date_cls(2026, 6, 24), ignore_entry)
+
+    assert exc_info.value.code == 8
+
+
+@pytest.mark.asyncio
+async def test_request_and_access_token():
+    session = RecordingSession(
+        MockResp(text="oauth_token=tok&oauth_token_secret=sec")
+    )
+    client = FatSecretApiClient(session, "key", "secret")
+
+    assert await client.async_get_request_token() == ("tok", "sec")
+    assert await client.async_get_access_token("tok", "sec", "verif") == (
+        "tok",
+        "sec",
+    )
+    assert session.calls[1][2]["oauth_verifier"] == "verif"
+
+
+class SequenceSession(RecordingSession):
+    """Session double answering with a sequence of responses."""
+
+    def __init__(self, responses):
+        super().__init__(None)
+        self.responses = responses
+
+    def get(self, url, headers=None, params=None):
+        self.calls.append((url, headers, params))
+        return self.responses.pop(0)
+
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+@pytest.mark.asyncio
+async def test_clock_offset_learned_from_date_header():
+    resp = MockResp({"food_entries": None})
+    resp.headers = {"Date": http_date(time.time() + 600)}
+    client = make_client(RecordingSession(resp))
+
+    await client.async_get_food_entries(date_cls(2026, 6, 24), ignore_entry)
+
+    assert client.clock_offset == pytest.approx(600, abs=2)
+    params = client._oauth_params()
+    assert int(params["oauth_timestamp"]) == pytest.approx(time.time() + 600, abs=2)
+
+    # Small differences are ignored
+    resp.headers = {"Date": http_date(time.time() + 1)}
+    await client.async_get_food_entries(date_cls(2026, 6, 24), ignore_entry)
+    assert client.clock_offset == 0.0
+
+
+@pytest.mark.asyncio
+async def test_expired_timestamp_resent_once_with_offset():
+    rejected = MockResp({"error": {"code": 6, "message": "Invalid timestamp"}})
+    rejected.headers = {"Date": http_date(time.time() - 3600)}
+    session = SequenceSession([rejected, MockResp({"food_entries": None})])
+    client = make_client(session)
+
+    entries = []
+    await client.async_get_food_entries(date_cls(2026, 6, 24), entries.append)
+
+    assert entries == []
+    assert len(session.calls) == 2
+    resent = session.calls[1][1]["Authorization"]
+    timestamp = int(resent.split('oauth_timestamp="')[1].split('"')[0])
+    assert timestamp == pytest.approx(time.time() - 3600, abs=2)
+
+
+@pytest.mark.asyncio
+async def test_expired_timestamp_not_resent_twice():
+    session = SequenceSession(
+        [
+            MockResp({"error": {"code": 6, "message": "Invalid timestamp"}}),
+            MockResp({"error": {"code": 6, "message": "Invalid timestamp"}}),
+        ]
+    )
+    client = make_client(session)
+
+    with pytest.raises(FatSecretApiError, match="OAuth error 6"):
+        await client.async_get_food_entries(date_cls(2026, 6, 24), ignore_entry)
+    assert len(session.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_food_entries_streamed_to_callback():
+    resp = MockResp(
+        {"food_entries": {"food_entry": [{"calories": "100"}, {"calories": "50"}]}}
+    )
+    client = make_client(RecordingSession(resp))
+
+    entries = []
+    await client.async_get_food_entries(date_cls(2026, 6, 24), entries.append)
+
+    assert entries == [{"calories": "100"}, {"calories": "50"}]
@@ -1,24 +1,33 @@
 import importlib
+import json
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock, Mock
 import aiohttp
-from aiohttp import ClientResponseError, ContentTypeError
-from datetime import date as date_cls, datetime as datetime_cls
+from aiohttp import ClientResponseError
+from datetime import date as date_cls, datetime as datetime_cls, timedelta
 
-from custom_components.fatsecret.FatSecretCoordinator import FatSecretCoordinator
+from custom_components.fatsecret.FatSecretCoordinator import (
+    FatSecretCoordinator,
+    FoodEntriesFold,
+)
+from custom_components.fatsecret.FatSecretRateLimiter import FatSecretRequestBudget
 from custom_components.fatsecret.const import (
     CONF_CONSUMER_KEY,
     CONF_CONSUMER_SECRET,
     CONF_TOKEN,
     CONF_TOKEN_SECRET,
+    CONF_STALE_LIMIT,
+    CONF_TRACKED_FIELDS,
+    ATTR_MEALS,
+    ATTR_STALE_SINCE,
     FATSECRET_FIELDS,
-    DOMAIN,
     FATSECRET_FOOD_ENTRIES,
     FATSECRET_FOOD_ENTRY,
     FATSECRET_FOOD_ENTRIES_ERRORS,  # Added import for error codes
 )
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import UpdateFailed
-from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
 
 def MockConfigEntry() -> MagicMock:
@@ -30,13 +39,32 @@ def MockConfigEntry() -> MagicMock:
         CONF_TOKEN: "token",
         CONF_TOKEN_SECRET: "token_secret",
     }
+    mock_entry.options = {}
     return mock_entry
 
 
+class MockContent:
+    """Response body streamed in small chunks, like aiohttp's StreamReader."""
+
+    def __init__(self, resp):
+        self.resp = resp
+
+    async def iter_chunked(self, n):
+        body = self.resp.body
+        if body is None:
+            body = json.dumps(await self.resp.json()).encode()
+        # Tiny chunks so that entries are split across reads
+        for i in range(0, len(body), 7):
+            yield body[i : i + 7]
+
+
 class MockResp:
     def __init__(self, response, status):
         self.response = response
         self.status = status
+        self.headers = {}
+        self.body = None
+        self.content = MockContent(self)
 
     async def __aenter__(self):
         return self
@@ -66,71 +94,94 @@ class MockSession:
 
 
 @pytest.mark.asyncio
-async def test_coordinator_init_register_service():
+async def test_async_update_data_success():
     hass = MagicMock()
     entry = MockConfigEntry()
 
-    FatSecretCoordinator(hass, entry)
+    coordinator = FatSecretCoordinator(hass, entry)
+
+    with patch.object(
+        coordinator,
+        "fetch_fatsecret_data",
+        new=AsyncMock(return_value={"calories": 100}),
+    ):
+        result = await coordinator._async_update_data()
 
-    # Debe registrar el servicio
-    assert hass.services.async_register.call_count == 1
-    service_args = hass.services.async_register.call_args[0]
-    assert service_args[0] == DOMAIN
-    assert service_args[1] == "update_fatsecret"
+    assert result == {"calories": 100}
+    assert coordinator.latest_data == {"calories": 100}
 
 
 @pytest.mark.asyncio
-async def test_handle_update_fatsecret_service():
-    """Test that calling the update_fatsecret service triggers async_refresh."""
+async def test_async_update_data_failure():
     hass = MagicMock()
     entry = MockConfigEntry()
 
     coordinator = FatSecretCoordinator(hass, entry)
 
-    # Patch async_refresh to check it is called
-    coordinator.async_refresh = AsyncMock()
-
-    # Invoke the registered service handler directly (captured from async_register)
-    registered_call = hass.services.async_register.call_args
-    # handler is the 3rd positional arg passed to async_register
-    handler = registered_call[0][2]
-    await handler(Mock())
-
-    # Ensure async_refresh was awaited
-    coordinator.async_refresh.assert_awaited_once()
+    with patch.object(
+        coordinator,
+        "fetch_fatsecret_data",
+        new=AsyncMock(side_effect=Exception("fail")),
+    ):
+        with pytest.raises(UpdateFailed, match="FatSecret update failed: fail"):
+            await coordinator._async_update_data()
 
 
 @pytest.mark.asyncio
-async def test_async_update_data_success():
+async def test_async_update_data_serves_stale_totals_until_limit():
     hass = MagicMock()
     entry = MockConfigEntry()
+    entry.options = {CONF_STALE_LIMIT: 30}
 
     coordinator = FatSecretCoordinator(hass, entry)
+    coordinator.data = {"calories": 100.0}
+    coordinator._fingerprint_day = dt_util.now().date()
+    failing = AsyncMock(side_effect=Exception("offline"))
+    start = dt_util.utcnow()
+
+    with (
+        patch.object(coordinator, "fetch_fatsecret_data", new=failing),
+        patch.object(dt_util, "utcnow", return_value=start),
+    ):
+        stale = await coordinator._async_update_data()
+        coordinator.data = stale
+        assert stale == {"calories": 100.0, ATTR_STALE_SINCE: start.isoformat()}
+        # Retries back off
+        first_interval = coordinator.update_interval
+        await coordinator._async_update_data()
+        assert coordinator.update_interval == 2 * first_interval
+
+    with (
+        patch.object(coordinator, "fetch_fatsecret_data", new=failing),
+        patch.object(
+            dt_util, "utcnow", return_value=start + timedelta(minutes=30)
+        ),
+    ):
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
 
+    # A successful refresh clears the flag
     with patch.object(
-        coordinator,
-        "fetch_fatsecret_data",
-        new=AsyncMock(return_value={"calories": 100}),
+        coordinator, "fetch_fatsecret_data", new=AsyncMock(return_value=stale)
     ):
-        result = await coordinator._async_update_data()
-
-    assert result == {"calories": 100}
-    assert coordinator.latest_data == {"calories": 100}
+        fresh = await coordinator._async_update_data()
+    assert fresh == {"calories": 100.0}
+    assert coordinator.stale_since is None
 
 
 @pytest.mark.asyncio
-async def test_async_update_data_failure():
+async def test_async_update_data_no_stale_totals_of_another_day():
     hass = MagicMock()
-    entry = MockConfigEntry()
-
-    coordinator = FatSecretCoordinator(hass, entry)
+    coordinator = FatSecretCoordinator(hass, MockConfigEntry())
+    coordinator.data = {"calories": 100.0}
+    coordinator._fingerprint_day = dt_util.now().date() - timedelta(days=1)
 
     with patch.object(
         coordinator,
         "fetch_fatsecret_data",
-        new=AsyncMock(side_effect=Exception("fail")),
+        new=AsyncMock(side_effect=Exception("offline")),
     ):
-        with pytest.raises(UpdateFailed, match="FatSecret update failed: fail"):
+        with pytest.raises(UpdateFailed):
             await coordinator._async_update_data()
 
 
@@ -144,8 +195,8 @@ async def test_fetch_fatsecret_data_normal(monkeypatch):
     fake_response = {
         FATSECRET_FOOD_ENTRIES: {
             FATSECRET_FOOD_ENTRY: [
-                {"calories": "100", "protein": "10"},
-                {"calories": "200", "protein": "20"},
+                {"calories": "100", "protein": "10", "meal": "Breakfast"},
+                {"calories": "200", "protein": "20", "meal": "Dinner"},
             ]
         }
     }
@@ -162,10 +213,7 @@ async def test_fetch_fatsecret_data_normal(monkeypatch):
         def get(self, url, headers=None, params=None):
             return mock_get(url, headers=headers, params=params)
 
-    monkeypatch.setattr(
-        "aiohttp.ClientSession",
-        lambda: MockSessionWithCheck(MockResp(fake_response, 200)),
-    )
+    coordinator.api.session = MockSessionWithCheck(MockResp(fake_response, 200))
     coordinator_module = importlib.import_module(
         "custom_components.fatsecret.FatSecretCoordinator"
     )
@@ -178,6 +226,10 @@ async def test_fetch_fatsecret_data_normal(monkeypatch):
     totals = await coordinator.fetch_fatsecret_data()
     for field in FATSECRET_FIELDS:
         assert field in totals
+    assert totals["calories"] == 300.0
+    assert totals["meals"]["breakfast"]["calories"] == 100.0
+    assert totals["meals"]["dinner"]["protein"] == 20.0
+    assert totals["meals"]["lunch"]["calories"] == 0.0
 
 
 @pytest.mark.asyncio
@@ -208,9 +260,7 @@ async def test_fetch_fatsecret_data_http_error(monkeypatch):
                 message="Unauthorized",
             )
 
-    monkeypatch.setattr(
-        "aiohttp.ClientSession", lambda: MockSession(MockRespUnauthorized())
-    )
+    coordinator.api.session = MockSession(MockRespUnauthorized())
 
     with pytest.raises(UpdateFailed, match="HTTP error 401: Unauthorized"):
         await coordinator.fetch_fatsecret_data()
@@ -236,14 +286,9 @@ async def test_fetch_fatsecret_data_invalid_json(monkeypatch):
         def raise_for_status(self):
             return None
 
-        async def json(self):
-            raise ContentTypeError(
-                request_info=Mock(), history=(), message="Invalid JSON"
-            )
-
-    monkeypatch.setattr(
-        "aiohttp.ClientSession", lambda: MockSession(MockRespInvalidJSON())
-    )
+    resp = MockRespInvalidJSON()
+    resp.body = b"<html>Service Unavailable</html>"
+    coordinator.api.session = MockSession(resp)
 
     with pytest.raises(UpdateFailed, match="FatSecret response is not valid JSON"):
         await coordinator.fetch_fatsecret_data()
@@ -277,9 +322,7 @@ async def test_fetch_fatsecret_data_known_error(monkeypatch):
     # Forzamos un error conocido
     error_code = list(FATSECRET_FOOD_ENTRIES_ERRORS.keys())[0]
 
-    monkeypatch.setattr(
-        "aiohttp.ClientSession", lambda: MockSession(MockRespAPIError(error_code))
-    )
+    coordinator.api.session = MockSession(MockRespAPIError(error_code))
 
     with pytest.raises(UpdateFailed, match=f"OAuth error {error_code}"):
         await coordinator.fetch_fatsecret_data()
@@ -313,9 +356,7 @@ async def test_fetch_fatsecret_data_unknown_error(monkeypatch):
     # Forzamos un error conocido
     error_code = list(FATSECRET_FOOD_ENTRIES_ERRORS.keys())[0]
 
-    monkeypatch.setattr(
-        "aiohttp.ClientSession", lambda: MockSession(MockRespAPIError(error_code))
-    )
+    coordinator.api.session = MockSession(MockRespAPIError(error_code))
 
     with pytest.raises(
         UpdateFailed, match=f"FatSecret returned error 9999: Unknown error"
@@ -339,11 +380,482 @@ async def test_fetch_fatsecret_data_invalid_value(monkeypatch):
         }
     }
 
-    # Parchear aiohttp.ClientSession
-    monkeypatch.setattr(
-        "aiohttp.ClientSession", lambda: MockSession(MockResp(fake_response, 200))
-    )
+    coordinator.api.session = MockSession(MockResp(fake_response, 200))
 
     totals = await coordinator.fetch_fatsecret_data()
     for field in FATSECRET_FIELDS:
         assert field in totals
+
+
+@pytest.mark.asyncio
+async def test_fetch_fatsecret_data_unchanged_diary_short_circuits():
+    """An identical diary returns the previous totals without re-summing."""
+    hass = MagicMock()
+    entry = MockConfigEntry()
+
+    coordinator = FatSecretCoordinator(hass, entry)
+
+    fake_response = {
+        FATSECRET_FOOD_ENTRIES: {
+            FATSECRET_FOOD_ENTRY: [
+                {"food_entry_id": "1", "calories": "100", "number_of_units": "1"},
+            ]
+        }
+    }
+    coordinator.api.session = MockSession(MockResp(fake_response, 200))
+
+    first = await coordinator.fetch_fatsecret_data()
+    coordinator.data = first
+    second = await coordinator.fetch_fatsecret_data()
+    assert second is first
+    # An unchanged diary backs off the polling interval
+    assert coordinator.update_interval == timedelta(minutes=30)
+
+    # Changing the amount of an entry changes the fingerprint
+    fake_response[FATSECRET_FOOD_ENTRIES][FATSECRET_FOOD_ENTRY][0].update(
+        number_of_units="2", calories="200"
+    )
+    third = await coordinator.fetch_fatsecret_data()
+    assert third is not first
+    assert third["calories"] == 200.0
+
+
+@pytest.mark.asyncio
+async def test_fetch_fatsecret_data_sums_tracked_fields_only():
+    """Untracked fields are summed only once a sensor of theirs is enabled."""
+    hass = MagicMock()
+    entry = MockConfigEntry()
+    entry.options = {CONF_TRACKED_FIELDS: ["calories"]}
+
+    coordinator = FatSecretCoordinator(hass, entry)
+    fake_response = {
+        FATSECRET_FOOD_ENTRIES: {
+            FATSECRET_FOOD_ENTRY: [
+                {"food_entry_id": "1", "calories": "100", "protein": "10"},
+            ]
+        }
+    }
+    resp = MockResp(fake_response, 200)
+    resp.json = AsyncMock(wraps=resp.json)
+    coordinator.api.session = MockSession(resp)
+
+    data = await coordinator.fetch_fatsecret_data()
+    assert data["calories"] == 100.0
+    assert "protein" not in data
+    assert "protein" not in data[ATTR_MEALS]["other"]
+    # The cached diary still yields every field for statistics
+    today = next(day for day, _ in coordinator.diary.items())
+    assert coordinator.diary.totals(today)["protein"] == 10.0
+
+    # Enabling the protein sensor sums it from the cache, without a request
+    coordinator.data = data
+    coordinator.async_set_updated_data = MagicMock()
+    untrack = coordinator.async_track_field("protein")
+    hass.loop.call_soon.assert_called_once()
+    hass.loop.call_soon.call_args[0][0]()
+    resumed = coordinator.async_set_updated_data.call_args[0][0]
+    assert resumed["protein"] == 10.0
+    assert ATTR_STALE_SINCE not in resumed
+    assert resp.json.await_count == 1
+
+    # Summing again keeps stale totals flagged as such
+    stale_since = dt_util.utcnow()
+    coordinator.stale_since = stale_since
+    untrack_fat = coordinator.async_track_field("fat")
+    hass.loop.call_soon.call_args[0][0]()
+    resumed = coordinator.async_set_updated_data.call_args[0][0]
+    assert resumed[ATTR_STALE_SINCE] == stale_since.isoformat()
+    assert coordinator.stale_since == stale_since
+
+    untrack()
+    untrack_fat()
+    assert coordinator.fields == ("calories",)
+
+
+@pytest.mark.asyncio
+async def test_restore_serves_last_totals_of_today(mock_state_store, mock_diary_store):
+    """Totals saved by a fetch are served again after a restart, same day only."""
+    hass = MagicMock()
+    entry = MockConfigEntry()
+    coordinator = FatSecretCoordinator(hass, entry)
+    fake_response = {
+        FATSECRET_FOOD_ENTRIES: {
+            FATSECRET_FOOD_ENTRY: [
+                {"food_entry_id": "1", "calories": "100", "meal": "Lunch"},
+            ]
+        }
+    }
+    coordinator.api.session = MockSession(MockResp(fake_response, 200))
+    data = await coordinator.fetch_fatsecret_data()
+
+    saved = mock_state_store.async_delay_save.call_args[0][0]()
+    mock_state_store.async_load = AsyncMock(return_value=saved)
+    # The food log comes back from the diary cache
+    mock_diary_store.async_load = AsyncMock(
+        return_value=mock_diary_store.async_delay_save.call_args[0][0]()
+    )
+
+    restored = FatSecretCoordinator(hass, entry)
+    assert await restored.async_restore() is True
+    assert restored.data == data
+    assert restored.last_update_success is True
+    # The restored fingerprint short-circuits an unchanged diary
+    restored.api.session = MockSession(MockResp(fake_response, 200))
+    assert await restored.fetch_fatsecret_data() is restored.data
+
+    # Totals of another day are not served, but the polling hours are kept
+    saved["day"] = "2000-01-01"
+    saved["hour_activity"] = [1.0] * 24
+    stale = FatSecretCoordinator(hass, entry)
+    assert await stale.async_restore() is False
+    assert stale.data is None
+    assert stale.last_update_success is False
+    assert stale.polling.hour_activity == [1.0] * 24
+
+
+@pytest.mark.asyncio
+async def test_backfill_fetches_each_closed_day_once(monkeypatch):
+    """Closed days are fetched once, open days are always re-fetched."""
+    hass = MagicMock()
+    entry = MockConfigEntry()
+
+    coordinator = FatSecretCoordinator(hass, entry)
+
+    fake_response = {
+        FATSECRET_FOOD_ENTRIES: {FATSECRET_FOOD_ENTRY: [{"calories": "100"}]}
+    }
+
+    async def get_food_entries(day, on_entry):
+        for entry in fake_response[FATSECRET_FOOD_ENTRIES][FATSECRET_FOOD_ENTRY]:
+            on_entry(entry)
+
+    coordinator.api.async_get_food_entries = AsyncMock(side_effect=get_food_entries)
+
+    coordinator_module = importlib.import_module(
+        "custom_components.fatsecret.FatSecretCoordinator"
+    )
+    monkeypatch.setattr(
+        coordinator_module,
+        "dt_util",
+        MagicMock(now=MagicMock(return_value=datetime_cls(2026, 6, 24))),
+    )
+
+    start, end = date_cls(2026, 6, 20), date_cls(2026, 6, 24)
+    assert await coordinator.async_backfill(start, end) == 5
+    assert coordinator.diary.get(date_cls(2026, 6, 21)) == [{"calories": "100"}]
+
+    # Only today and yesterday are still open
+    assert await coordinator.async_backfill(start, end) == 2
+    fetched = [c[0][0] for c in coordinator.api.async_get_food_entries.call_args_list]
+    assert fetched[5:] == [date_cls(2026, 6, 23), date_cls(2026, 6, 24)]
+
+
+@pytest.mark.asyncio
+async def test_day_boundary_resets_then_fetches_closed_day(monkeypatch):
+    """Midnight resets the totals offline, the closed day is fetched later."""
+    hass = MagicMock()
+    entry = MockConfigEntry()
+    coordinator = FatSecretCoordinator(hass, entry)
+    coordinator.data = {"calories": 100.0, ATTR_MEALS: {}}
+    coordinator._fingerprint_day = date_cls(2026, 6, 23)
+    coordinator.async_set_updated_data = MagicMock()
+    coordinator.async_update_listeners = MagicMock()
+    coordinator.async_import_statistics = MagicMock()
+
+    async def get_food_entries(day, on_entry):
+        on_entry({"food_entry_id": "1", "calories": "250"})
+
+    coordinator.api.async_get_food_entries = AsyncMock(side_effect=get_food_entries)
+    coordinator_module = importlib.import_module(
+        "custom_components.fatsecret.FatSecretCoordinator"
+    )
+    midnight = datetime_cls(2026, 6, 24)
+    monkeypatch.setattr(
+        coordinator_module, "dt_util", MagicMock(now=MagicMock(return_value=midnight))
+    )
+
+    coordinator._async_roll_over(midnight)
+    reset = coordinator.async_set_updated_data.call_args[0][0]
+    assert reset["calories"] == 0.0
+    assert reset[ATTR_MEALS]["breakfast"]["calories"] == 0.0
+    coordinator.api.async_get_food_entries.assert_not_awaited()
+    # An empty diary on the first fetch of the day is not a change
+    assert coordinator._fingerprint == FoodEntriesFold(midnight.date()).fingerprint
+
+    await coordinator._async_fetch_closed_day(midnight)
+    coordinator.api.async_get_food_entries.assert_awaited_once()
+    assert coordinator.api.async_get_food_entries.call_args[0][0] == date_cls(
+        2026, 6, 23
+    )
+    assert coordinator.diary.totals(date_cls(2026, 6, 23))["calories"] == 250.0
+    coordinator.async_import_statistics.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_refresh_across_midnight_keeps_the_reset_totals(monkeypatch):
+    """A refresh ending after the midnight reset only caches the closed day."""
+    coordinator = FatSecretCoordinator(MagicMock(), MockConfigEntry())
+    coordinator.data = {"calories": 100.0, ATTR_MEALS: {}}
+    coordinator._fingerprint_day = date_cls(2026, 6, 23)
+    coordinator.async_set_updated_data = MagicMock(
+        side_effect=lambda data: setattr(coordinator, "data", data)
+    )
+    clock = MagicMock(return_value=datetime_cls(2026, 6, 23, 23, 59))
+    coordinator_module = importlib.import_module(
+        "custom_components.fatsecret.FatSecretCoordinator"
+    )
+    monkeypatch.setattr(coordinator_module, "dt_util", MagicMock(now=clock))
+
+    async def get_food_entries(day, on_entry):
+        # The reset runs while the request is in flight
+        clock.return_value = datetime_cls(2026, 6, 24)
+        coordinator._async_roll_over(clock.return_value)
+        clock.return_value = datetime_cls(2026, 6, 24, 0, 0, 5)
+        on_entry({"food_entry_id": "1", "calories": "250"})
+
+    coordinator.api.async_get_food_entries = AsyncMock(side_effect=get_food_entries)
+
+    data = await coordinator.fetch_fatsecret_data()
+
+    assert data is coordinator.data
+    assert data["calories"] == 0.0
+    assert coordinator._fingerprint_day == date_cls(2026, 6, 24)
+    assert coordinator.state_store.totals_of(date_cls(2026, 6, 24)) is not None
+    assert all(
+        window.today == date_cls(2026, 6, 24)
+        for window in coordinator.rolling.values()
+    )
+    assert coordinator.diary.totals(date_cls(2026, 6, 23))["calories"] == 250.0
+
+
+def test_track_day_boundary_registers_three_times(monkeypatch):
+    hass = MagicMock()
+    entry = MockConfigEntry()
+    coordinator = FatSecretCoordinator(hass, entry)
+    coordinator_module = importlib.import_module(
+        "custom_components.fatsecret.FatSecretCoordinator"
+    )
+    track = MagicMock()
+    monkeypatch.setattr(coordinator_module, "async_track_time_change", track)
+
+    coordinator.async_track_day_boundary()
+
+    times = [
+        (call[1]["hour"], call[1]["minute"], call[1]["second"])
+        for call in track.call_args_list
+    ]
+    assert times == [(23, 59, 0), (0, 0, 0), (0, 30, 0)]
+
+
+@pytest.mark.asyncio
+async def test_fetch_fatsecret_data_defers_when_budget_exhausted():
+    """An exhausted budget keeps the current totals instead of failing."""
+    hass = MagicMock()
+    entry = MockConfigEntry()
+
+    coordinator = FatSecretCoordinator(hass, entry)
+    coordinator.api.session = MockSession(MockResp({}, 200))
+    coordinator.api.budget = FatSecretRequestBudget(1, 1)
+
+    first = await coordinator.fetch_fatsecret_data()
+    coordinator.data = first
+
+    assert await coordinator.fetch_fatsecret_data() is first
+    assert coordinator.update_interval >= timedelta(seconds=60)
+    assert coordinator.api.budget.denied == 1
+
+    # Without totals to fall back on, the refresh fails
+    coordinator.data = None
+    with pytest.raises(UpdateFailed, match="budget exhausted"):
+        await coordinator.fetch_fatsecret_data()
+
+
+@pytest.mark.asyncio
+async def test_forced_refresh_min_interval():
+    hass = MagicMock()
+    entry = MockConfigEntry()
+    entry.options = {"forced_refresh_interval": 60}
+
+    coordinator = FatSecretCoordinator(hass, entry)
+    coordinator.async_refresh = AsyncMock()
+
+    await coordinator.async_forced_refresh()
+    await coordinator.async_forced_refresh()
+
+    coordinator.async_refresh.assert_awaited_once()
+    assert coordinator.forced_refreshes_coalesced == 1
+
+
+@pytest.mark.asyncio
+async def test_async_update_data_invalid_token_starts_reauth():
+    hass = MagicMock()
+    entry = MockConfigEntry()
+
+    coordinator = FatSecretCoordinator(hass, entry)
+    coordinator.api.session = MockSession(
+        MockResp({"error": {"code": 9, "message": "Invalid token"}}, 200)
+    )
+
+    with pytest.raises(ConfigEntryAuthFailed):
+        await coordinator._async_update_data()
+    assert coordinator.retry_stats.retries == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_fatsecret_data_retries_used_nonce(monkeypatch):
+    """A used nonce is retried with a freshly signed request."""
+    hass = MagicMock()
+    entry = MockConfigEntry()
+
+    coordinator = FatSecretCoordinator(hass, entry)
+    responses = [
+        MockResp({"error": {"code": 7, "message": "Invalid nonce"}}, 200),
+        MockResp({FATSECRET_FOOD_ENTRIES: None}, 200),
+    ]
+    seen_headers = []
+
+    class SequenceSession(MockSession):
+        def get(self, url, headers=None, params=None):
+            seen_headers.append(headers["Authorization"])
+            return responses.pop(0)
+
+    coordinator.api.session = SequenceSession(None)
+    retry_module = importlib.import_module(
+        "custom_components.fatsecret.retry_helpers"
+    )
+    monkeypatch.setattr(retry_module, "backoff_delay", lambda *args: 0)
+
+    totals = await coordinator.fetch_fatsecret_data()
+
+    assert totals["calories"] == 0.0
+    assert coordinator.retry_stats.recovered == 1
+    assert seen_headers[0] != seen_headers[1]
+
+
+@pytest.mark.asyncio
+async def test_rolling_fill_fetches_missing_days_once(monkeypatch):
+    """The rolling windows are filled from the diary, fetching only gaps."""
+    hass = MagicMock()
+    entry = MockConfigEntry()
+    coordinator = FatSecretCoordinator(hass, entry)
+
+    async def get_food_entries(day, on_entry):
+        on_entry({"calories": "100"})
+
+    coordinator.api.async_get_food_entries = AsyncMock(side_effect=get_food_entries)
+    coordinator_module = importlib.import_module(
+        "custom_components.fatsecret.FatSecretCoordinator"
+    )
+    monkeypatch.setattr(
+        coordinator_module,
+        "dt_util",
+        MagicMock(now=MagicMock(return_value=datetime_cls(2026, 6, 24))),
+    )
+    today = date_cls(2026, 6, 24)
+    for offset in range(1, 30):
+        if offset != 10:
+            coordinator.diary.set(today - timedelta(days=offset), [{"calories": "50"}])
+
+    await coordinator.fetch_fatsecret_data()
+    assert coordinator.rolling[30].days_covered(None) == 28
+    coordinator.api.async_get_food_entries.reset_mock()
+    coordinator.async_update_listeners = Mock()
+
+    await coordinator.async_fill_rolling_windows()
+
+    # Only the missing day is fetched
+    fetched = [c[0][0] for c in coordinator.api.async_get_food_entries.call_args_list]
+    assert fetched == [today - timedelta(days=10)]
+    assert coordinator.rolling[30].days_covered(None) == 29
+    assert coordinator.rolling[30].sums(None)["calories"] == 28 * 50.0 + 100.0
+    assert coordinator.rolling[7].sums(None)["calories"] == 6 * 50.0
+    coordinator.async_update_listeners.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_rolling_fill_runs_before_the_first_refresh(monkeypatch):
+    """Sensors are added right after the restore, before any refresh."""
+    hass = MagicMock()
+    entry = MockConfigEntry()
+    coordinator = FatSecretCoordinator(hass, entry)
+    coordinator.api.async_get_food_entries = AsyncMock()
+    coordinator.async_update_listeners = Mock()
+    coordinator_module = importlib.import_module(
+        "custom_components.fatsecret.FatSecretCoordinator"
+    )
+    monkeypatch.setattr(
+        coordinator_module,
+        "dt_util",
+        MagicMock(now=MagicMock(return_value=datetime_cls(2026, 6, 24))),
+    )
+
+    # A sensor added before the windows know today does not latch the fill
+    coordinator.async_track_rolling_window()
+    await entry.async_create_background_task.call_args[0][1]
+    coordinator.api.async_get_food_entries.assert_not_awaited()
+
+    await coordinator.async_restore()
+    coordinator.async_track_rolling_window()
+    assert entry.async_create_background_task.call_count == 2
+    await entry.async_create_background_task.call_args[0][1]
+
+    # Every closed day of the month is fetched, once
+    assert coordinator.api.async_get_food_entries.await_count == 29
+    assert coordinator.rolling[7].missing_days() == []
+    coordinator.async_track_rolling_window()
+    await entry.async_create_background_task.call_args[0][1]
+    assert coordinator.api.async_get_food_entries.await_count == 29
+
+
+@pytest.mark.asyncio
+async def test_day_boundary_fills_a_day_missed_by_the_rolling_windows(monkeypatch):
+    """A closed day that could not be fetched is filled at the next boundary."""
+    hass = MagicMock()
+    entry = MockConfigEntry()
+    coordinator = FatSecretCoordinator(hass, entry)
+    coordinator.async_set_updated_data = MagicMock()
+    coordinator.async_update_listeners = Mock()
+    coordinator.api.async_get_food_entries = AsyncMock()
+    clock = MagicMock(return_value=datetime_cls(2026, 6, 24))
+    coordinator_module = importlib.import_module(
+        "custom_components.fatsecret.FatSecretCoordinator"
+    )
+    monkeypatch.setattr(coordinator_module, "dt_util", MagicMock(now=clock))
+    today = date_cls(2026, 6, 24)
+    for offset in range(1, 30):
+        coordinator.diary.set(today - timedelta(days=offset), [{"calories": "50"}])
+
+    # Without a rolling sensor, nothing is fetched
+    clock.return_value = datetime_cls(2026, 6, 25)
+    coordinator._async_roll_over(clock.return_value)
+    entry.async_create_background_task.assert_not_called()
+
+    untrack = coordinator.async_track_rolling_window()
+    entry.async_create_background_task.assert_called_once()
+    await entry.async_create_background_task.call_args[0][1]
+    fetched = [c[0][0] for c in coordinator.api.async_get_food_entries.call_args_list]
+    assert fetched == [today]
+
+    # The next day was not cached, e.g. FatSecret was down across midnight
+    coordinator.api.async_get_food_entries.reset_mock()
+    clock.return_value = datetime_cls(2026, 6, 27)
+    coordinator._async_roll_over(clock.return_value)
+    assert entry.async_create_background_task.call_count == 2
+    await entry.async_create_background_task.call_args[0][1]
+    fetched = [c[0][0] for c in coordinator.api.async_get_food_entries.call_args_list]
+    assert fetched == [date_cls(2026, 6, 25), date_cls(2026, 6, 26)]
+    untrack()
+
+
+@pytest.mark.asyncio
+async def test_expired_timestamp_costs_two_requests_per_refresh():
+    """The client resends once; the retry engine does not multiply that."""
+    hass = MagicMock()
+    coordinator = FatSecretCoordinator(hass, MockConfigEntry())
+    resp = MockResp({"error": {"code": 6, "message": "Invalid timestamp"}}, 200)
+    resp.json = AsyncMock(wraps=resp.json)
+    coordinator.api.session = MockSession(resp)
+
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+    assert resp.json.await_count == 2
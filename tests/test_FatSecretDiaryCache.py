@@ -0,0 +1,161 @@
+import pytest
+from datetime import date as date_cls, datetime as datetime_cls
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.fatsecret import FatSecretDiaryCache as diary_module
+from custom_components.fatsecret.FatSecretDiaryCache import FatSecretDiaryCache
+
+INDEX = "fatsecret.entry_123.diary"
+JUNE = "fatsecret.entry_123.diary.2026-06"
+
+
+@pytest.fixture
+def stores():
+    """Return the store of each file of the cache, by key."""
+    created = {}
+
+    def store(hass, version, key):
+        created[key] = MagicMock()
+        created[key].async_load = AsyncMock(return_value=None)
+        return created[key]
+
+    with patch.object(diary_module, "Store", side_effect=store):
+        yield created
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the cache's clock on June 4th, 2026."""
+    now = MagicMock(return_value=datetime_cls(2026, 6, 4, 12))
+    monkeypatch.setattr(diary_module, "dt_util", MagicMock(now=now))
+    return now
+
+
+@pytest.fixture
+def cache(stores, clock):
+    cache = FatSecretDiaryCache(MagicMock(), "entry_123")
+    stores[INDEX].async_load.return_value = {"months": ["2026-06"], "open_days": {}}
+    cache._month_store("2026-06").async_load.return_value = {
+        "2026-06-01": [{"calories": "100"}]
+    }
+    return cache
+
+
+def saved(store) -> dict:
+    """Return the data of the last scheduled save of a store."""
+    return store.async_delay_save.call_args[0][0]()
+
+
+@pytest.mark.asyncio
+async def test_load_and_get(cache):
+    await cache.async_load()
+
+    assert date_cls(2026, 6, 1) in cache
+    assert cache.get(date_cls(2026, 6, 1)) == [{"calories": "100"}]
+    assert cache.get(date_cls(2026, 6, 2)) is None
+
+
+@pytest.mark.asyncio
+async def test_set_schedules_save(cache, stores):
+    await cache.async_load()
+    cache.set(date_cls(2026, 6, 2), [{"calories": "50"}])
+
+    assert cache.get(date_cls(2026, 6, 2)) == [{"calories": "50"}]
+    # A closed day only writes the file of its month
+    stores[INDEX].async_delay_save.assert_not_called()
+    assert saved(stores[JUNE]) == {
+        "2026-06-01": [{"calories": "100"}],
+        "2026-06-02": [{"calories": "50"}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_open_days_are_stored_apart_from_closed_ones(cache, stores, clock):
+    await cache.async_load()
+
+    # Polls of today never write the files of the closed days
+    cache.set(date_cls(2026, 6, 4), [{"calories": "10"}])
+    cache.set(date_cls(2026, 6, 4), [{"calories": "20"}])
+    stores[JUNE].async_delay_save.assert_not_called()
+    assert saved(stores[INDEX]) == {
+        "months": ["2026-06"],
+        "open_days": {"2026-06-04": [{"calories": "20"}]},
+    }
+
+    # Once closed, the day moves to the file of its month
+    clock.return_value = datetime_cls(2026, 7, 1)
+    cache.set(date_cls(2026, 7, 1), [])
+    assert saved(stores[JUNE]) == {
+        "2026-06-01": [{"calories": "100"}],
+        "2026-06-04": [{"calories": "20"}],
+    }
+    assert saved(stores[INDEX]) == {
+        "months": ["2026-06"],
+        "open_days": {"2026-07-01": []},
+    }
+    assert "fatsecret.entry_123.diary.2026-07" not in stores
+
+
+@pytest.mark.asyncio
+async def test_load_merges_the_months_and_the_open_days(stores, clock):
+    cache = FatSecretDiaryCache(MagicMock(), "entry_123")
+    stores[INDEX].async_load.return_value = {
+        "months": ["2026-05", "2026-06"],
+        "open_days": {
+            "2026-06-03": [{"calories": "30"}],
+            "2026-06-04": [{"calories": "40"}],
+        },
+    }
+    cache._month_store("2026-05").async_load.return_value = {
+        "2026-05-31": [{"calories": "10"}]
+    }
+    # Closed on the previous run, but the main file was not saved again
+    cache._month_store("2026-06").async_load.return_value = {
+        "2026-06-02": [{"calories": "20"}],
+        "2026-06-03": [{"calories": "30"}],
+    }
+
+    await cache.async_load()
+
+    assert [day.isoformat() for day, _ in cache.items()] == [
+        "2026-05-31",
+        "2026-06-02",
+        "2026-06-03",
+        "2026-06-04",
+    ]
+    stores[INDEX].async_delay_save.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_days_to_fetch_skips_closed_cached_days(cache):
+    await cache.async_load()
+    cache.set(date_cls(2026, 6, 3), [])
+    cache.set(date_cls(2026, 6, 4), [])
+
+    # June 1st is cached and closed, June 2nd is missing, June 3rd and 4th are
+    # cached but still open relative to June 4th
+    assert cache.days_to_fetch(
+        date_cls(2026, 6, 1), date_cls(2026, 6, 4), date_cls(2026, 6, 4)
+    ) == [date_cls(2026, 6, 2), date_cls(2026, 6, 3), date_cls(2026, 6, 4)]
+    # Open days are only missing when not cached at all
+    assert cache.missing_days(date_cls(2026, 6, 1), date_cls(2026, 6, 5)) == [
+        date_cls(2026, 6, 2),
+        date_cls(2026, 6, 5),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_totals_computed_once_per_day_content(cache):
+    await cache.async_load()
+
+    totals = cache.totals(date_cls(2026, 6, 1))
+    assert totals["calories"] == 100.0
+    assert cache.totals(date_cls(2026, 6, 1)) is totals
+    assert cache.totals(date_cls(2026, 6, 2)) is None
+
+    # New entries invalidate the day, known totals are kept as given
+    cache.set(date_cls(2026, 6, 1), [{"calories": "40"}])
+    assert cache.totals(date_cls(2026, 6, 1))["calories"] == 40.0
+    given = {"calories": 1.0}
+    cache.set(date_cls(2026, 6, 2), [{"calories": "1"}], given)
+    assert cache.totals(date_cls(2026, 6, 2)) is given
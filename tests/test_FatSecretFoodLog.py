@@ -0,0 +1,62 @@
+import pytest
+
+from custom_components.fatsecret.FatSecretFoodLog import (
+    FoodLogEntry,
+    food_log_of,
+    food_log_page,
+)
+from custom_components.fatsecret.aggregation_helpers import FIELDS
+
+
+def test_entry_keeps_the_food_and_every_nutrient():
+    entry = FoodLogEntry.from_entry(
+        {
+            "food_entry_id": "42",
+            "food_entry_name": "Oatmeal",
+            "food_entry_description": "1 cup",
+            "meal": "Breakfast",
+            "number_of_units": "1.500",
+            "calories": "150",
+            "protein": "bad",
+            "unknown_key": "dropped",
+        }
+    )
+
+    assert entry.food_entry_id == "42"
+    assert entry.meal == "breakfast"
+    assert entry.number_of_units == 1.5
+    assert len(entry.nutrients) == len(FIELDS)
+    described = entry.as_dict(("calories", "protein"))
+    assert described == {
+        "id": "42",
+        "name": "Oatmeal",
+        "description": "1 cup",
+        "meal": "breakfast",
+        "units": 1.5,
+        "calories": 150.0,
+        "protein": 0.0,
+    }
+
+
+def test_entries_are_slotted_and_immutable():
+    entry = FoodLogEntry.from_entry({"food_entry_id": "1"})
+
+    assert not hasattr(entry, "__dict__")
+    with pytest.raises(AttributeError):
+        entry.name = "changed"
+    # Equal content, equal records: unchanged logs compare equal
+    assert food_log_of([{"food_entry_id": "1"}]) == (entry,)
+
+
+def test_page_of_the_log():
+    food_log = food_log_of({"food_entry_id": str(i)} for i in range(10))
+
+    assert [e["id"] for e in food_log_page(food_log, 8, 5)] == ["8", "9"]
+    assert food_log_page(food_log, 20, 5) == []
+    assert set(food_log_page(food_log, 0, 1, ())[0]) == {
+        "id",
+        "name",
+        "description",
+        "meal",
+        "units",
+    }
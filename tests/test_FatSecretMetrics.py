@@ -0,0 +1,90 @@
+from datetime import date as date_cls
+
+import pytest
+
+from custom_components.fatsecret.FatSecretMetrics import (
+    FatSecretMetrics,
+    PhaseHistogram,
+    RequestTimer,
+)
+from custom_components.fatsecret.const import FATSECRET_METRIC_PHASES
+
+DAY = date_cls(2026, 6, 1)
+
+
+def test_histogram_percentiles_use_bucket_bounds():
+    histogram = PhaseHistogram()
+    for ms in [0.5] * 98 + [30, 20000]:
+        histogram.observe(ms / 1000)
+
+    assert histogram.count == 100
+    assert histogram.percentile(0.5) == 1.0
+    assert histogram.percentile(0.99) == 50.0
+    assert histogram.percentile(1.0) == pytest.approx(20000)
+    described = histogram.as_dict()
+    assert described["buckets_ms"]["<=1"] == 98
+    assert described["buckets_ms"][">10000"] == 1
+
+
+def test_empty_histogram():
+    assert PhaseHistogram().percentile(0.5) is None
+    assert PhaseHistogram().as_dict()["mean_ms"] is None
+
+
+def test_request_timer_charges_every_phase():
+    timer = RequestTimer()
+    timer.lap("sign")
+    timer.lap("network")
+    entries = []
+    timer.entries_to(entries.append)({"calories": "1"})
+
+    assert entries == [{"calories": "1"}]
+    assert timer.entries == 1
+    assert set(timer.phases) == set(FATSECRET_METRIC_PHASES)
+    assert all(seconds >= 0 for seconds in timer.phases.values())
+
+
+def test_failed_requests_are_counted_by_error():
+    metrics = FatSecretMetrics()
+    metrics.record_request(RequestTimer())
+    metrics.record_request(RequestTimer(), "api_8")
+    metrics.record_request(RequestTimer(), "http_503")
+
+    assert metrics.requests == 3
+    assert metrics.failed_requests == 2
+    assert metrics.payload_bytes.count == 1
+    assert metrics.as_dict()["errors"] == {"api_8": 1, "http_503": 1}
+
+
+def test_refresh_notifies_listeners():
+    metrics = FatSecretMetrics()
+    calls = []
+    remove = metrics.async_add_listener(lambda: calls.append(1))
+
+    metrics.record_refresh(0.01)
+    remove()
+    metrics.record_refresh(0.01)
+
+    assert calls == [1]
+    assert metrics.refresh.count == 2
+
+
+@pytest.mark.asyncio
+async def test_client_records_phases_and_payload(fatsecret_simulator, client_session):
+    fatsecret_simulator.diary[DAY] = [
+        {"food_entry_id": str(i), "calories": "100"} for i in range(50)
+    ]
+    api = fatsecret_simulator.client(client_session)
+    api.metrics = metrics = FatSecretMetrics()
+
+    await api.async_get_food_entries(DAY, lambda entry: None)
+    fatsecret_simulator.inject(503)
+    with pytest.raises(Exception):
+        await api.async_get_food_entries(DAY, lambda entry: None)
+
+    assert metrics.requests == 2
+    assert metrics.errors == {"http_503": 1}
+    assert metrics.payload_entries.last == 50
+    assert metrics.payload_bytes.last == fatsecret_simulator.bytes_sent
+    for phase in FATSECRET_METRIC_PHASES:
+        assert metrics.phases[phase].count == 2
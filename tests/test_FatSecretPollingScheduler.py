@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+from custom_components.fatsecret.FatSecretPollingScheduler import (
+    FatSecretPollingScheduler,
+)
+from custom_components.fatsecret.const import (
+    FATSECRET_POLL_FAST_INTERVAL,
+    FATSECRET_POLL_MAX_INTERVAL,
+    FATSECRET_UPDATE_INTERVAL,
+)
+
+
+def test_backoff_outside_active_hours():
+    scheduler = FatSecretPollingScheduler()
+    now = datetime(2026, 6, 24, 3, 0)
+
+    intervals = [scheduler.next_interval(False, now) for _ in range(5)]
+
+    assert intervals[0] == timedelta(minutes=FATSECRET_UPDATE_INTERVAL * 2)
+    assert intervals[1] == timedelta(minutes=FATSECRET_UPDATE_INTERVAL * 4)
+    assert intervals[-1] == timedelta(minutes=FATSECRET_POLL_MAX_INTERVAL)
+
+    # A change resets the backoff
+    assert scheduler.next_interval(True, now) == timedelta(
+        minutes=FATSECRET_UPDATE_INTERVAL
+    )
+
+
+def test_fast_polling_during_learned_meal_hours():
+    scheduler = FatSecretPollingScheduler()
+    lunch = datetime(2026, 6, 24, 13, 10)
+    scheduler.record_change(lunch)
+
+    assert scheduler.is_active_hour(13)
+    assert scheduler.next_interval(True, lunch) == timedelta(
+        minutes=FATSECRET_POLL_FAST_INTERVAL
+    )
+    # Unchanged polls back off, but never beyond the regular interval
+    for _ in range(10):
+        interval = scheduler.next_interval(False, lunch)
+    assert interval == timedelta(minutes=FATSECRET_UPDATE_INTERVAL)
+
+
+def test_backoff_wakes_up_for_next_active_hour():
+    scheduler = FatSecretPollingScheduler()
+    scheduler.record_change(datetime(2026, 6, 23, 13, 0))
+
+    for _ in range(5):
+        interval = scheduler.next_interval(False, datetime(2026, 6, 24, 12, 20))
+
+    assert interval == timedelta(minutes=40)
+
+
+def test_activity_decays():
+    scheduler = FatSecretPollingScheduler()
+    scheduler.record_change(datetime(2026, 6, 24, 8, 0))
+    for _ in range(30):
+        scheduler.record_change(datetime(2026, 6, 24, 20, 0))
+
+    assert not scheduler.is_active_hour(8)
+    assert scheduler.is_active_hour(20)
@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock, patch
+
+from custom_components.fatsecret import FatSecretRateLimiter
+from custom_components.fatsecret.FatSecretRateLimiter import (
+    FatSecretRequestBudget,
+    TokenBucket,
+    async_get_request_budget,
+)
+
+
+def test_token_bucket_refills_over_time():
+    with patch.object(FatSecretRateLimiter.time, "monotonic", return_value=0.0):
+        bucket = TokenBucket(2, 60)
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+        assert bucket.seconds_until_available() == 30
+
+    with patch.object(FatSecretRateLimiter.time, "monotonic", return_value=30.0):
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+
+def test_budget_charges_both_buckets_and_notifies():
+    budget = FatSecretRequestBudget(hourly=3, daily=100)
+    listener = MagicMock()
+    remove = budget.async_add_listener(listener)
+
+    assert budget.is_full
+    assert budget.try_acquire()
+    assert not budget.is_full
+    assert budget.remaining == 2
+    assert int(budget.daily.tokens) == 99
+    listener.assert_called_once()
+
+    remove()
+    budget.try_acquire()
+    budget.try_acquire()
+    assert budget.is_low
+    assert not budget.try_acquire()
+    assert budget.denied == 1
+    assert listener.call_count == 1
+
+
+def test_budget_shared_per_consumer_key():
+    hass = MagicMock()
+    hass.data = {}
+
+    first = async_get_request_budget(hass, "key", 10, 100)
+    second = async_get_request_budget(hass, "key", 20, 200)
+    other = async_get_request_budget(hass, "other_key", 10, 100)
+
+    assert first is second
+    assert first is not other
+    # The latest configured limits apply
+    assert first.hourly.capacity == 20
+    assert first.daily.capacity == 200
@@ -0,0 +1,92 @@
+from datetime import date as date_cls, timedelta
+
+from custom_components.fatsecret.FatSecretRollingWindow import (
+    FatSecretRollingWindow,
+)
+
+TODAY = date_cls(2026, 6, 24)
+
+
+def day_totals(calories: float) -> dict:
+    return {"calories": calories, "protein": calories / 10}
+
+
+def make_history(days: int) -> dict:
+    """Return totals for the ``days`` days before TODAY, 100 kcal apart."""
+    return {
+        TODAY - timedelta(days=offset): day_totals(100.0 * offset)
+        for offset in range(1, days + 1)
+    }
+
+
+def test_sums_include_today():
+    history = make_history(10)
+    window = FatSecretRollingWindow(7)
+
+    window.advance(TODAY, history.get)
+
+    # Days 1 to 6 before today: 100 + ... + 600
+    sums = window.sums(day_totals(50.0))
+    assert sums["calories"] == 2150.0
+    assert window.days_covered(day_totals(50.0)) == 7
+    assert window.days_covered(None) == 6
+
+
+def test_advance_adds_new_day_and_evicts_oldest():
+    history = make_history(10)
+    calls = []
+
+    def totals_of(day):
+        calls.append(day)
+        return history.get(day)
+
+    window = FatSecretRollingWindow(7)
+    window.advance(TODAY, totals_of)
+    assert len(calls) == 6
+
+    tomorrow = TODAY + timedelta(days=1)
+    history[TODAY] = day_totals(1000.0)
+    calls.clear()
+    window.advance(tomorrow, totals_of)
+
+    # Only the day entering the window is looked up
+    assert calls == [TODAY]
+    # 600 left the window, 1000 entered it
+    assert window.sums(None)["calories"] == 2100.0 - 600.0 + 1000.0
+    assert window.days_covered(None) == 6
+
+    # Same day again is a no-op
+    window.advance(tomorrow, totals_of)
+    assert calls == [TODAY]
+
+
+def test_restart_after_long_gap_rebuilds():
+    history = make_history(40)
+    window = FatSecretRollingWindow(7)
+    window.advance(TODAY - timedelta(days=20), history.get)
+
+    window.advance(TODAY, history.get)
+
+    assert window.sums(None)["calories"] == 2100.0
+
+
+def test_update_day_and_missing_days():
+    history = make_history(3)
+    window = FatSecretRollingWindow(7)
+    window.advance(TODAY, history.get)
+
+    assert window.missing_days() == [
+        TODAY - timedelta(days=offset) for offset in (6, 5, 4)
+    ]
+
+    window.update_day(TODAY - timedelta(days=5), day_totals(500.0))
+    window.update_day(TODAY - timedelta(days=1), day_totals(150.0))
+    # Outside of the closed part of the window
+    window.update_day(TODAY, day_totals(9999.0))
+    window.update_day(TODAY - timedelta(days=30), day_totals(9999.0))
+
+    assert window.sums(None)["calories"] == 500.0 + 150.0 + 200.0 + 300.0
+    assert window.missing_days() == [
+        TODAY - timedelta(days=6),
+        TODAY - timedelta(days=4),
+    ]
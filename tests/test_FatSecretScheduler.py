@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from custom_components.fatsecret.FatSecretScheduler import FatSecretScheduler
+
+INTERVAL = timedelta(minutes=15)
+
+
+def test_single_entry_is_not_shifted():
+    scheduler = FatSecretScheduler()
+    scheduler.async_register("entry_1")
+
+    assert scheduler.align("entry_1", INTERVAL, 1234.5) == INTERVAL
+
+
+def test_entries_staggered_across_the_interval():
+    scheduler = FatSecretScheduler()
+    entries = ["entry_1", "entry_2", "entry_3"]
+    for entry_id in entries:
+        scheduler.async_register(entry_id)
+
+    # All entries polled at the same second
+    now = 1_750_000_000.0
+    targets = [
+        now + scheduler.align(entry_id, INTERVAL, now).total_seconds()
+        for entry_id in entries
+    ]
+
+    period = INTERVAL.total_seconds()
+    for target in targets:
+        assert now + period / 2 <= target < now + period * 1.5
+    # Next polls land a third of the interval apart
+    phases = sorted(target % period for target in targets)
+    assert [b - a for a, b in zip(phases, phases[1:])] == [period / 3] * 2
+
+
+def test_unregister_releases_the_slot():
+    scheduler = FatSecretScheduler()
+    unregister = scheduler.async_register("entry_1")
+    scheduler.async_register("entry_2")
+
+    unregister()
+
+    assert scheduler.align("entry_2", INTERVAL, 1234.5) == INTERVAL
@@ -1,14 +1,34 @@
 import pytest
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock, patch
+
+from custom_components.fatsecret import FatSecretSensor as sensor_module
 
 from custom_components.fatsecret.sensor import FatSecretSensor
-from custom_components.fatsecret.const import DOMAIN, FATSECRET_FIELDS
+from custom_components.fatsecret.FatSecretMetrics import FatSecretMetrics
+from custom_components.fatsecret.FatSecretSensor import (
+    METRICS_SENSORS,
+    FatSecretBudgetSensor,
+    FatSecretFoodLogSensor,
+    FatSecretMetricsSensor,
+    FatSecretRollingSensor,
+)
+from custom_components.fatsecret.FatSecretFoodLog import food_log_of
+from custom_components.fatsecret.FatSecretRateLimiter import FatSecretRequestBudget
+from custom_components.fatsecret.const import (
+    ATTR_FOOD_LOG,
+    DOMAIN,
+    FATSECRET_BUDGET_REFILL_WRITE_INTERVAL,
+    FATSECRET_FIELDS,
+    FATSECRET_FOOD_LOG_MAX_ENTRIES,
+)
 
 
 @pytest.fixture
 def mock_coordinator():
     """Return a mock coordinator with some data."""
     coordinator = Mock()
+    coordinator.config_entry.entry_id = "entry_123"
+    coordinator.config_entry.title = "FatSecret"
     coordinator.data = {
         "calories": 200,
         "protein": 50,
@@ -37,7 +57,8 @@ def test_sensor_init(mock_coordinator, field, expected_name, expected_unit):
 
     assert sensor._field == field
     assert sensor._attr_name == expected_name
-    assert sensor._attr_unique_id == f"{DOMAIN}_{field}"
+    assert sensor._attr_unique_id == f"{DOMAIN}_entry_123_{field}"
+    assert sensor.device_info["identifiers"] == {(DOMAIN, "entry_123")}
     assert sensor._attr_native_unit_of_measurement == expected_unit
     assert sensor.coordinator == mock_coordinator
 
@@ -68,3 +89,143 @@ def test_native_unit_of_measurement(mock_coordinator, field, expected_unit):
     """Test native_unit_of_measurement property."""
     sensor = FatSecretSensor(mock_coordinator, field)
     assert sensor.native_unit_of_measurement == expected_unit
+
+
+def test_coordinator_update_writes_only_changed_values(mock_coordinator):
+    """The sensor skips state writes when its own value did not move."""
+    sensor = FatSecretSensor(mock_coordinator, "calories")
+    sensor.async_write_ha_state = Mock()
+
+    sensor._handle_coordinator_update()
+    mock_coordinator.data["protein"] = 75
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 1
+
+    mock_coordinator.data["calories"] = 300
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+def test_meal_attributes(mock_coordinator):
+    """Each sensor exposes its field's value per meal."""
+    sensor = FatSecretSensor(mock_coordinator, "calories")
+    assert sensor.extra_state_attributes is None
+
+    mock_coordinator.data["meals"] = {
+        "breakfast": {"calories": 150.0, "protein": 10.0},
+        "lunch": {"calories": 50.0, "protein": 40.0},
+    }
+    assert sensor.extra_state_attributes == {"breakfast": 150.0, "lunch": 50.0}
+
+    # A meal moving writes the state even if the daily total did not change
+    sensor.async_write_ha_state = Mock()
+    sensor._handle_coordinator_update()
+    mock_coordinator.data["meals"] = {
+        "breakfast": {"calories": 100.0},
+        "lunch": {"calories": 100.0},
+    }
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+def test_stale_since_attribute(mock_coordinator):
+    """Last known values served while refreshes fail are flagged."""
+    sensor = FatSecretSensor(mock_coordinator, "calories")
+    mock_coordinator.data["stale_since"] = "2026-06-01T10:00:00+00:00"
+
+    assert sensor.native_value == 200.0
+    assert sensor.extra_state_attributes == {
+        "stale_since": "2026-06-01T10:00:00+00:00"
+    }
+
+
+def test_rolling_sensor_average(mock_coordinator):
+    """The rolling sensor averages the window over the days it covers."""
+    window = Mock()
+    window.days_covered.return_value = 4
+    window.sums.return_value = {"calories": 8000.0}
+    mock_coordinator.rolling = {7: window}
+
+    sensor = FatSecretRollingSensor(mock_coordinator, "calories", 7)
+
+    assert sensor.unique_id == f"{DOMAIN}_entry_123_calories_7d"
+    assert sensor.name == "Calories 7-day average"
+    assert sensor.entity_registry_enabled_default is False
+    assert sensor.native_value == 2000.0
+    assert sensor.extra_state_attributes == {"sum": 8000.0, "days": 4}
+    window.sums.assert_called_with(mock_coordinator.data)
+
+    window.days_covered.return_value = 0
+    assert sensor.native_value is None
+
+
+def test_metrics_sensor():
+    """Metrics sensors read the coordinator's metrics, disabled by default."""
+    entry = Mock(entry_id="entry_123", title="FatSecret")
+    metrics = FatSecretMetrics()
+    description = next(d for d in METRICS_SENSORS if d.key == "refresh_duration")
+    sensor = FatSecretMetricsSensor(entry, metrics, description)
+
+    assert sensor.unique_id == f"{DOMAIN}_entry_123_refresh_duration"
+    assert sensor.entity_registry_enabled_default is False
+    assert sensor.native_value is None
+
+    metrics.record_refresh(0.0123)
+    assert sensor.native_value == 12.3
+    assert sensor.extra_state_attributes == {"p50_ms": 20.0, "p99_ms": 20.0}
+
+
+def test_food_log_sensor(mock_coordinator):
+    """The food log lists the first entries with the summed fields only."""
+    mock_coordinator.fields = ("calories",)
+    mock_coordinator.data[ATTR_FOOD_LOG] = food_log_of(
+        {"food_entry_id": str(i), "calories": "10", "protein": "1", "meal": "Lunch"}
+        for i in range(FATSECRET_FOOD_LOG_MAX_ENTRIES + 3)
+    )
+    sensor = FatSecretFoodLogSensor(mock_coordinator)
+
+    assert sensor.unique_id == f"{DOMAIN}_entry_123_food_log"
+    assert sensor.native_value == FATSECRET_FOOD_LOG_MAX_ENTRIES + 3
+    attributes = sensor.extra_state_attributes
+    assert len(attributes["entries"]) == FATSECRET_FOOD_LOG_MAX_ENTRIES
+    assert attributes["truncated"] == 3
+    assert attributes["entries"][0] == {
+        "id": "0",
+        "name": "",
+        "description": None,
+        "meal": "lunch",
+        "units": None,
+        "calories": 10.0,
+    }
+    # Large and changing: kept out of the recorder
+    assert "entries" in sensor._unrecorded_attributes
+
+
+@pytest.mark.asyncio
+async def test_budget_sensor_is_written_as_the_budget_refills():
+    budget = FatSecretRequestBudget(hourly=2, daily=100)
+    sensor = FatSecretBudgetSensor(MagicMock(entry_id="entry_123"), budget)
+    sensor.hass = MagicMock()
+    sensor.async_write_ha_state = Mock()
+
+    with patch.object(sensor_module, "async_call_later") as call_later:
+        # A full budget does not change on its own
+        await sensor.async_added_to_hass()
+        call_later.assert_not_called()
+
+        budget.try_acquire()
+        assert sensor.async_write_ha_state.call_count == 1
+        # A request still fits: the next write comes after the minimum delay
+        assert call_later.call_args[0][1] == FATSECRET_BUDGET_REFILL_WRITE_INTERVAL
+
+        budget.try_acquire()
+        call_later.return_value.assert_called_once()
+        assert sensor.native_value == 0
+        # Half an hour for one request of an hourly budget of two
+        assert call_later.call_args[0][1] == pytest.approx(1800, rel=0.01)
+
+        # Written again when a request fits, without any request charged
+        refilled = call_later.call_args[0][2]
+        refilled(None)
+        assert sensor.async_write_ha_state.call_count == 3
+        assert call_later.call_count == 3
@@ -0,0 +1,173 @@
+import random
+import timeit
+from datetime import date as date_cls, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.fatsecret.aggregation_helpers import (
+    NutrientSums,
+    sum_food_entries,
+)
+from custom_components.fatsecret.const import FATSECRET_FIELDS
+from custom_components.fatsecret.FatSecretDiaryCache import FatSecretDiaryCache
+
+
+def synthetic_diary(entries: int, seed: int = 0) -> list[dict]:
+    """Return food entries shaped like the API's: numeric strings, some missing."""
+    rng = random.Random(seed)
+    return [
+        {
+            "food_entry_id": str(i),
+            "food_entry_name": f"Food {i}",
+            **{
+                field: f"{rng.uniform(0, 500):.2f}"
+                for field in FATSECRET_FIELDS
+                if rng.random() > 0.1
+            },
+        }
+        for i in range(entries)
+    ]
+
+
+def per_cell_sum(food_entries: list[dict]) -> dict[str, float]:
+    """Reference implementation: one float() with try/except per cell."""
+    totals = dict.fromkeys(FATSECRET_FIELDS, 0.0)
+    for entry in food_entries:
+        for field in FATSECRET_FIELDS:
+            try:
+                totals[field] += float(entry.get(field, 0) or 0)
+            except (TypeError, ValueError):
+                pass
+    return totals
+
+
+def test_totals_match_per_cell_sum():
+    diary = synthetic_diary(200)
+
+    totals = sum_food_entries(diary)
+
+    assert totals.keys() == FATSECRET_FIELDS.keys()
+    expected = per_cell_sum(diary)
+    for field in FATSECRET_FIELDS:
+        assert totals[field] == pytest.approx(expected[field])
+
+
+def test_invalid_values_count_as_zero():
+    sums = NutrientSums(
+        [
+            {"calories": "100", "protein": "abc", "fat": None},
+            {"calories": 50, "protein": "", "fat": [1]},
+        ]
+    )
+
+    assert sums.invalid == 2
+    totals = sums.totals()
+    assert totals["calories"] == 150.0
+    assert totals["protein"] == 0.0
+    assert totals["fat"] == 0.0
+
+
+def test_only_selected_fields_are_summed():
+    diary = synthetic_diary(20)
+
+    sums = NutrientSums(diary, fields=("protein", "calories"))
+
+    expected = per_cell_sum(diary)
+    totals = sums.totals()
+    assert list(totals) == ["protein", "calories"]
+    assert totals["calories"] == pytest.approx(expected["calories"])
+    assert sums.meal_totals()["breakfast"].keys() == totals.keys()
+
+
+def test_empty_totals_are_floats():
+    assert sum_food_entries([]) == dict.fromkeys(FATSECRET_FIELDS, 0.0)
+
+
+@pytest.mark.benchmark
+def test_aggregation_benchmark():
+    """Benchmark against the bare per-cell loop over 10 to 10,000 entries.
+
+    Parsing the numeric strings dominates both: the sums grouped by meal
+    cost about as much as the loop, and scale linearly. The timings are
+    printed (run with -s).
+    """
+    timings = {}
+    for size in (10, 100, 1000, 10000):
+        diary = synthetic_diary(size)
+        number = max(1, 10000 // size)
+        per_cell = min(
+            timeit.repeat(lambda: per_cell_sum(diary), number=number, repeat=5)
+        )
+        summed = min(
+            timeit.repeat(lambda: sum_food_entries(diary), number=number, repeat=5)
+        )
+        timings[size] = summed / number
+        print(
+            f"\n{size:>5} entries: per-cell {per_cell / number * 1e3:.3f} ms, "
+            f"by meal {summed / number * 1e3:.3f} ms "
+            f"({per_cell / summed:.1f}x)",
+            end="",
+        )
+        # Grouping by meal and counting invalid cells cost a little extra
+        assert summed < per_cell * 1.5
+
+    # 1000x the entries costs well under 1000x * 3 the time
+    assert timings[10000] < timings[10] * 1000 * 3
+
+
+def cached_year() -> FatSecretDiaryCache:
+    """Return a diary cache of 365 days of 20 entries."""
+    cache = FatSecretDiaryCache(MagicMock(), "entry_123")
+    first = date_cls(2025, 1, 1)
+    for seed in range(365):
+        cache.set(first + timedelta(days=seed), synthetic_diary(20, seed))
+    return cache
+
+
+def test_cached_day_totals_match_resummed_entries():
+    cache = cached_year()
+
+    assert {day: cache.totals(day) for day, _ in cache.items()} == {
+        day: sum_food_entries(entries) for day, entries in cache.items()
+    }
+
+
+@pytest.mark.benchmark
+def test_multi_day_aggregation_benchmark():
+    """Benchmark: a year of cached days is re-aggregated from per-day totals."""
+    cache = cached_year()
+
+    def resum():
+        return {day: sum_food_entries(entries) for day, entries in cache.items()}
+
+    def cached():
+        return {day: cache.totals(day) for day, _ in cache.items()}
+
+    full = min(timeit.repeat(resum, number=1, repeat=3))
+    memo = min(timeit.repeat(cached, number=1, repeat=3))
+    print(
+        f"\n365 days x 20 entries: re-summed {full * 1e3:.1f} ms, "
+        f"per-day totals {memo * 1e3:.2f} ms ({full / memo:.0f}x)"
+    )
+    assert memo < full
+
+
+def test_meal_totals_grouped_in_the_same_pass():
+    sums = NutrientSums(
+        [
+            {"meal": "Breakfast", "calories": "100"},
+            {"meal": "Dinner", "calories": "300", "protein": "20"},
+            {"meal": "breakfast", "calories": "50"},
+            {"meal": "Snacks", "calories": "10"},
+            {"calories": "5"},
+        ]
+    )
+
+    meals = sums.meal_totals()
+    assert list(meals) == ["breakfast", "lunch", "dinner", "other"]
+    assert meals["breakfast"]["calories"] == 150.0
+    assert meals["lunch"]["calories"] == 0.0
+    assert meals["dinner"]["protein"] == 20.0
+    assert meals["other"]["calories"] == 15.0
+    assert sums.totals()["calories"] == 465.0
@@ -3,7 +3,9 @@ from unittest.mock import AsyncMock, patch, MagicMock
 import pytest
 
 from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import AbortFlow
 from custom_components.fatsecret import config_flow
+from tests.fatsecret_simulator import AUTHORIZE_PATH
 
 CONF_CONSUMER_KEY = config_flow.CONF_CONSUMER_KEY
 CONF_CONSUMER_SECRET = config_flow.CONF_CONSUMER_SECRET
@@ -101,13 +103,54 @@ async def test_step_authorize_with_input_success():
 
     # Mock _get_access_token para devolver tokens de prueba
     flow._get_access_token = AsyncMock(return_value=("access_token", "access_secret"))
+    flow.hass = MagicMock()
+    flow.hass.config_entries.async_entries.return_value = []
+    flow.hass.config_entries.async_entry_for_domain_unique_id.return_value = None
+    flow.context = {"source": config_flow.config_entries.SOURCE_USER}
 
     result = await flow.async_step_authorize(user_input)
 
     # async_create_entry devuelve dict con type=create_entry
     assert result["type"] == "create_entry"
+    assert result["title"] == "FatSecret"
     assert result["data"][CONF_TOKEN] == "access_token"
     assert result["data"][CONF_TOKEN_SECRET] == "access_secret"
+    assert flow.unique_id == config_flow.account_unique_id("access_token")
+
+
+@pytest.mark.asyncio
+async def test_step_authorize_takes_the_first_free_title():
+    flow = config_flow.FatSecretConfigFlow()
+    flow._get_access_token = AsyncMock(return_value=("access_token", "access_secret"))
+    flow.hass = MagicMock()
+    # "FatSecret 2" was removed
+    flow.hass.config_entries.async_entries.return_value = [
+        MagicMock(title="FatSecret"),
+        MagicMock(title="FatSecret 3"),
+    ]
+    flow.hass.config_entries.async_entry_for_domain_unique_id.return_value = None
+    flow.context = {"source": config_flow.config_entries.SOURCE_USER}
+
+    result = await flow.async_step_authorize({"verifier": "verif123"})
+
+    assert result["title"] == "FatSecret 2"
+
+
+@pytest.mark.asyncio
+async def test_step_authorize_aborts_on_an_account_already_added():
+    flow = config_flow.FatSecretConfigFlow()
+    flow._get_access_token = AsyncMock(return_value=("access_token", "access_secret"))
+    flow.hass = MagicMock()
+    # The same account authorized again: FatSecret returns its access token
+    flow.hass.config_entries.async_entry_for_domain_unique_id.return_value = (
+        MagicMock(title="FatSecret")
+    )
+    flow.context = {"source": config_flow.config_entries.SOURCE_USER}
+
+    with pytest.raises(AbortFlow, match="already_configured"):
+        await flow.async_step_authorize({"verifier": "verif123"})
+    lookup = flow.hass.config_entries.async_entry_for_domain_unique_id
+    assert lookup.call_args[0][1] == config_flow.account_unique_id("access_token")
 
 
 @pytest.mark.asyncio
@@ -135,11 +178,14 @@ async def test_step_authorize_with_input_error():
 @pytest.mark.asyncio
 async def test_get_request_token_success():
     flow = config_flow.FatSecretConfigFlow()
+    flow.hass = MagicMock()
     flow.consumer_key = "my_key"
     flow.consumer_secret = "my_secret"
 
     # Mock de la respuesta de session.get
     class MockResponse:
+        headers = {}
+
         async def __aenter__(self):
             return self
 
@@ -163,8 +209,10 @@ async def test_get_request_token_success():
         def get(self, url, params=None):
             return MockResponse()
 
-    # Patch aiohttp.ClientSession para que devuelva nuestro mock
-    with patch("aiohttp.ClientSession", return_value=MockSession()):
+    # Patch the shared Home Assistant session para que devuelva nuestro mock
+    with patch.object(
+        config_flow, "async_get_clientsession", return_value=MockSession()
+    ):
         await flow._get_request_token()
 
     assert flow.request_token == "req_token"
@@ -174,11 +222,14 @@ async def test_get_request_token_success():
 @pytest.mark.asyncio
 async def test_get_request_token_failure():
     flow = config_flow.FatSecretConfigFlow()
+    flow.hass = MagicMock()
     flow.consumer_key = "my_key"
     flow.consumer_secret = "my_secret"
 
     # Mock de la respuesta de session.get
     class MockResponse:
+        headers = {}
+
         async def __aenter__(self):
             return self
 
@@ -202,9 +253,11 @@ async def test_get_request_token_failure():
         def get(self, url, params=None):
             return MockResponse()
 
-    # Patch aiohttp.ClientSession para que devuelva nuestro mock
+    # Patch the shared Home Assistant session para que devuelva nuestro mock
     try:
-        with patch("aiohttp.ClientSession", return_value=MockSession()):
+        with patch.object(
+            config_flow, "async_get_clientsession", return_value=MockSession()
+        ):
             await flow._get_request_token()
     except ValueError as e:
         assert str(e) == "Failed to obtain request token: {}"
@@ -218,6 +271,7 @@ async def test_get_request_token_failure():
 @pytest.mark.asyncio
 async def test_get_access_token():
     flow = config_flow.FatSecretConfigFlow()
+    flow.hass = MagicMock()
     flow.consumer_key = "my_key"
     flow.consumer_secret = "my_secret"
     flow.request_token = "req_token"
@@ -225,6 +279,8 @@ async def test_get_access_token():
 
     # Mock de la respuesta de session.get
     class MockResponse:
+        headers = {}
+
         async def __aenter__(self):
             return self
 
@@ -248,8 +304,148 @@ async def test_get_access_token():
         def get(self, url, params=None):
             return MockResponse()
 
-    with patch("aiohttp.ClientSession", return_value=MockSession()):
+    with patch.object(
+        config_flow, "async_get_clientsession", return_value=MockSession()
+    ):
         token, secret = await flow._get_access_token("verif123")
 
     assert token == "access_token"
     assert secret == "access_secret"
+
+
+@pytest.mark.asyncio
+async def test_flow_keeps_one_client_and_its_clock_offset(
+    fatsecret_simulator, client_session
+):
+    """The offset learned from the request token applies to the access token."""
+    flow = config_flow.FatSecretConfigFlow()
+    flow.hass = MagicMock()
+    flow.consumer_key = fatsecret_simulator.consumer_key
+    flow.consumer_secret = fatsecret_simulator.consumer_secret
+    with patch.object(
+        config_flow, "async_get_clientsession", return_value=client_session
+    ):
+        client = flow._api_client()
+    simulator_client = fatsecret_simulator.client(client_session)
+    client.request_token_url = simulator_client.request_token_url
+    client.access_token_url = simulator_client.access_token_url
+    fatsecret_simulator.clock_skew = 3600
+
+    await flow._get_request_token()
+    async with client_session.get(
+        fatsecret_simulator.base_url + AUTHORIZE_PATH,
+        params={"oauth_token": flow.request_token},
+    ) as resp:
+        verifier = await resp.text()
+    token, _ = await flow._get_access_token(verifier)
+
+    assert flow._api_client() is client
+    assert token in fatsecret_simulator.tokens
+    # Rejected once for its timestamp, then resent with the learned offset
+    assert fatsecret_simulator.requests["request_token"] == 2
+    assert fatsecret_simulator.requests["access_token"] == 1
+
+    # New credentials get a new client
+    flow.consumer_key = "other"
+    with patch.object(
+        config_flow, "async_get_clientsession", return_value=client_session
+    ):
+        assert flow._api_client() is not client
+
+
+# -----------------------------
+# Tests para el options flow
+# -----------------------------
+@pytest.mark.asyncio
+async def test_options_flow_budget():
+    entry = MagicMock()
+    entry.options = {}
+    flow = config_flow.FatSecretConfigFlow.async_get_options_flow(entry)
+    flow._config_entry = entry
+
+    result = await flow.async_step_init()
+    assert result["type"] == "form"
+    assert result["step_id"] == "init"
+    defaults = result["data_schema"]({})
+    assert defaults[config_flow.CONF_HOURLY_BUDGET] == (
+        config_flow.FATSECRET_DEFAULT_HOURLY_BUDGET
+    )
+
+    result = await flow.async_step_init(
+        {config_flow.CONF_HOURLY_BUDGET: 100, config_flow.CONF_DAILY_BUDGET: 1000}
+    )
+    assert result["type"] == "create_entry"
+    assert result["data"][config_flow.CONF_DAILY_BUDGET] == 1000
+
+
+# -----------------------------
+# Tests para reauth
+# -----------------------------
+@pytest.mark.asyncio
+async def test_reauth_updates_existing_entry():
+    flow = config_flow.FatSecretConfigFlow()
+    flow.hass = MagicMock()
+    flow.context = {"source": config_flow.config_entries.SOURCE_REAUTH}
+
+    result = await flow.async_step_reauth(
+        {CONF_CONSUMER_KEY: "my_key", CONF_CONSUMER_SECRET: "my_secret"}
+    )
+    assert result["type"] == "form"
+    assert result["step_id"] == "reauth_confirm"
+    assert flow.consumer_key == "my_key"
+
+    flow._get_request_token = AsyncMock()
+    result = await flow.async_step_reauth_confirm({})
+    assert result["step_id"] == "authorize"
+
+    flow._get_access_token = AsyncMock(return_value=("new_token", "new_secret"))
+    reauth_entry = MagicMock()
+    flow._get_reauth_entry = MagicMock(return_value=reauth_entry)
+    flow.async_update_reload_and_abort = MagicMock(return_value={"type": "abort"})
+
+    result = await flow.async_step_authorize({"verifier": "verif123"})
+
+    assert result["type"] == "abort"
+    data_updates = flow.async_update_reload_and_abort.call_args[1]["data_updates"]
+    assert flow.async_update_reload_and_abort.call_args[1][
+        "unique_id"
+    ] == config_flow.account_unique_id("new_token")
+    assert data_updates[CONF_TOKEN] == "new_token"
+    assert data_updates[CONF_TOKEN_SECRET] == "new_secret"
+
+
+@pytest.mark.asyncio
+async def test_options_flow_tracked_fields_update_entities():
+    entry = MagicMock()
+    entry.entry_id = "entry_1"
+    entry.options = {config_flow.CONF_TRACKED_FIELDS: ["calories", "protein"]}
+    flow = config_flow.FatSecretConfigFlow.async_get_options_flow(entry)
+    flow._config_entry = entry
+    flow.hass = MagicMock()
+
+    result = await flow.async_step_init()
+    defaults = result["data_schema"]({})
+    assert defaults[config_flow.CONF_TRACKED_FIELDS] == ["calories", "protein"]
+
+    registry = MagicMock()
+    registry.async_get_entity_id.side_effect = (
+        lambda domain, platform, unique_id: f"sensor.{unique_id}"
+    )
+    registry.async_get.return_value.disabled_by = None
+    with patch.object(config_flow.er, "async_get", return_value=registry):
+        result = await flow.async_step_init(
+            {config_flow.CONF_TRACKED_FIELDS: ["calories", "fat"]}
+        )
+
+    assert result["type"] == "create_entry"
+    # Only the nutrients whose tracking changed are touched
+    updates = {
+        call[0][0]: call[1]["disabled_by"]
+        for call in registry.async_update_entity.call_args_list
+    }
+    assert updates == {
+        "sensor.fatsecret_entry_1_fat": None,
+        "sensor.fatsecret_entry_1_protein": (
+            config_flow.er.RegistryEntryDisabler.INTEGRATION
+        ),
+    }
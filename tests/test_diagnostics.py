@@ -0,0 +1,40 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.fatsecret.FatSecretCoordinator import FatSecretCoordinator
+from custom_components.fatsecret.const import (
+    CONF_CONSUMER_KEY,
+    CONF_CONSUMER_SECRET,
+    CONF_TOKEN,
+    CONF_TOKEN_SECRET,
+    DOMAIN,
+)
+from custom_components.fatsecret.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_redact_credentials():
+    entry = MagicMock()
+    entry.entry_id = "entry_123"
+    entry.data = {
+        CONF_CONSUMER_KEY: "key",
+        CONF_CONSUMER_SECRET: "secret",
+        CONF_TOKEN: "token",
+        CONF_TOKEN_SECRET: "token_secret",
+    }
+    entry.options = {}
+    entry.as_dict.return_value = {"entry_id": "entry_123", "data": dict(entry.data)}
+    hass = MagicMock()
+    coordinator = FatSecretCoordinator(hass, entry)
+    coordinator.metrics.record_refresh(0.25)
+    hass.data = {DOMAIN: {entry.entry_id: coordinator}}
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert set(diagnostics["entry"]["data"].values()) == {"**REDACTED**"}
+    assert diagnostics["metrics"]["refresh"]["count"] == 1
+    assert diagnostics["retries"]["calls"] == 0
+    assert diagnostics["budget"]["remaining"] > 0
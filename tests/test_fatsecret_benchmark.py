@@ -0,0 +1,139 @@
+import os
+
+import pytest
+
+from custom_components.fatsecret import retry_helpers
+from custom_components.fatsecret.const import (
+    FATSECRET_DEFAULT_FETCH_CONCURRENCY,
+    FATSECRET_MAX_FETCH_CONCURRENCY,
+)
+from tests.fatsecret_benchmark import (
+    async_run_cycles,
+    async_run_range_benchmark,
+    async_run_refresh_benchmark,
+    make_coordinator,
+)
+
+# Raise to benchmark longer runs, e.g. FATSECRET_BENCH_CYCLES=20000
+CYCLES = int(os.environ.get("FATSECRET_BENCH_CYCLES", "1000"))
+# Days of the multi-day fetch benchmark, e.g. FATSECRET_BENCH_RANGES=30,90,365
+RANGES = [
+    int(days)
+    for days in os.environ.get("FATSECRET_BENCH_RANGES", "30,90,365").split(",")
+]
+# Round trip of the simulated API, in seconds
+RANGE_LATENCY = 0.01
+
+
+@pytest.mark.asyncio
+async def test_refresh_cycles(fatsecret_simulator, client_session):
+    """Each refresh over HTTP succeeds with a single request."""
+    coordinator = make_coordinator(fatsecret_simulator, client_session)
+
+    _, failed = await async_run_cycles(
+        coordinator, fatsecret_simulator, 50, edit_every=10
+    )
+
+    assert failed == 0
+    assert fatsecret_simulator.requests["food_entries"] == 50
+
+
+@pytest.mark.asyncio
+async def test_refresh_cycles_with_faults(
+    fatsecret_simulator, client_session, monkeypatch
+):
+    """Server errors and used nonces are retried within the refresh."""
+    monkeypatch.setattr(retry_helpers, "backoff_delay", lambda *args: 0)
+    coordinator = make_coordinator(fatsecret_simulator, client_session)
+    fatsecret_simulator.server_error_rate = 0.05
+    fatsecret_simulator.inject(7, 7, 502)
+
+    _, failed = await async_run_cycles(
+        coordinator, fatsecret_simulator, 100, edit_every=10
+    )
+
+    # Three attempts per refresh: only the injected errors make one fail
+    assert failed == 1
+    assert coordinator.retry_stats.recovered > 0
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_refresh_benchmark(fatsecret_simulator, client_session):
+    """Benchmark refresh cycles over HTTP; the report is printed (run with -s)."""
+    coordinator = make_coordinator(fatsecret_simulator, client_session)
+
+    report = await async_run_refresh_benchmark(
+        coordinator, fatsecret_simulator, CYCLES
+    )
+    print(f"\n{report}", end="")
+
+    assert report.failed_refreshes == 0
+    assert report.requests_per_refresh == 1.0
+    # Only the diary grows: nothing is retained per refresh
+    assert report.allocated_kib < 1024
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_refresh_benchmark_with_faults(
+    fatsecret_simulator, client_session, monkeypatch
+):
+    """Server errors and used nonces are retried: a few extra requests only."""
+    monkeypatch.setattr(retry_helpers, "backoff_delay", lambda *args: 0)
+    coordinator = make_coordinator(fatsecret_simulator, client_session)
+    fatsecret_simulator.server_error_rate = 0.05
+    fatsecret_simulator.inject(7, 7, 502)
+
+    report = await async_run_refresh_benchmark(
+        coordinator, fatsecret_simulator, CYCLES // 4
+    )
+    print(f"\n{report}", end="")
+
+    # Three attempts per refresh: a refresh fails only on three errors in a
+    # row, like the injected ones on the very first refresh
+    assert report.failed_refreshes <= 1 + CYCLES // 400
+    assert 1.0 < report.requests_per_refresh < 1.2
+    assert coordinator.retry_stats.recovered > 0
+
+
+@pytest.mark.asyncio
+async def test_range_fetch(fatsecret_simulator, client_session):
+    """A concurrent backfill requests each day once."""
+    report = await async_run_range_benchmark(
+        fatsecret_simulator,
+        client_session,
+        30,
+        FATSECRET_DEFAULT_FETCH_CONCURRENCY,
+    )
+
+    assert report.requests == 30
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+@pytest.mark.parametrize("days", RANGES)
+async def test_range_benchmark(fatsecret_simulator, client_session, days):
+    """Fetch a range of days one at a time, then concurrently; run with -s."""
+    fatsecret_simulator.latency = RANGE_LATENCY
+
+    reports = [
+        await async_run_range_benchmark(
+            fatsecret_simulator, client_session, days, concurrency
+        )
+        for concurrency in (
+            1,
+            FATSECRET_DEFAULT_FETCH_CONCURRENCY,
+            FATSECRET_MAX_FETCH_CONCURRENCY,
+        )
+    ]
+    for report in reports:
+        print(f"\n{report}", end="")
+
+    serial, *concurrent = reports
+    assert all(report.requests == days for report in reports)
+    # Serial fetches pay every round trip, concurrent ones overlap them; what
+    # is left is the CPU time of the client and the simulator, which share
+    # the event loop
+    assert serial.wall_ms >= days * RANGE_LATENCY * 1e3
+    assert all(report.wall_ms < serial.wall_ms / 2 for report in concurrent)
@@ -0,0 +1,106 @@
+from datetime import date as date_cls
+
+import pytest
+
+from custom_components.fatsecret.FatSecretApiClient import FatSecretApiError
+from tests.fatsecret_simulator import AUTHORIZE_PATH
+
+DAY = date_cls(2026, 6, 1)
+
+
+@pytest.fixture
+def simulator(fatsecret_simulator):
+    """Simulator serving two entries on DAY."""
+    fatsecret_simulator.diary[DAY] = [
+        {"food_entry_id": "1", "calories": "100", "meal": "Breakfast"},
+        {"food_entry_id": "2", "calories": "250.5", "meal": "Lunch"},
+    ]
+    return fatsecret_simulator
+
+
+async def fetch(api, day=DAY) -> list[dict]:
+    entries = []
+    await api.async_get_food_entries(day, entries.append)
+    return entries
+
+
+@pytest.mark.asyncio
+async def test_signed_request_returns_the_diary(simulator, client_session):
+    api = simulator.client(client_session)
+
+    entries = await fetch(api)
+
+    assert [entry["food_entry_id"] for entry in entries] == ["1", "2"]
+    assert await fetch(api, date_cls(2026, 6, 2)) == []
+    assert simulator.responses["ok"] == 2
+
+
+@pytest.mark.asyncio
+async def test_wrong_secret_is_an_invalid_signature(simulator, client_session):
+    api = simulator.client(client_session)
+    api = type(api)(
+        client_session,
+        simulator.consumer_key,
+        "wrong",
+        api.token,
+        api.token_secret,
+        food_entries_url=api.food_entries_url,
+    )
+
+    with pytest.raises(FatSecretApiError) as err:
+        await fetch(api)
+    assert err.value.code == 8
+
+
+@pytest.mark.asyncio
+async def test_oauth_dance_issues_a_working_token(simulator, client_session):
+    api = simulator.client(client_session)
+
+    request_token, request_secret = await api.async_get_request_token()
+    async with client_session.get(
+        simulator.base_url + AUTHORIZE_PATH, params={"oauth_token": request_token}
+    ) as resp:
+        verifier = await resp.text()
+    token, _ = await api.async_get_access_token(
+        request_token, request_secret, verifier
+    )
+
+    assert len(await fetch(simulator.client(client_session, token))) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("code", range(2, 10))
+async def test_injected_error_codes(simulator, client_session, code):
+    api = simulator.client(client_session)
+    simulator.inject(code)
+    if code == 6:
+        # An expired timestamp is resent once: fail that one too
+        simulator.inject(code)
+
+    with pytest.raises(FatSecretApiError) as err:
+        await fetch(api)
+
+    assert err.value.code == code
+    assert simulator.requests["food_entries"] == (2 if code == 6 else 1)
+
+
+@pytest.mark.asyncio
+async def test_injected_server_error(simulator, client_session):
+    api = simulator.client(client_session)
+    simulator.inject(503)
+
+    with pytest.raises(FatSecretApiError) as err:
+        await fetch(api)
+    assert err.value.status == 503
+    assert len(await fetch(api)) == 2
+
+
+@pytest.mark.asyncio
+async def test_clock_skew_is_learned_from_the_rejection(simulator, client_session):
+    api = simulator.client(client_session)
+    simulator.clock_skew = 3600
+
+    assert len(await fetch(api)) == 2
+
+    assert simulator.responses["error_6"] == 1
+    assert api.clock_offset == pytest.approx(3600, abs=2)
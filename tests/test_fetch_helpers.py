@@ -0,0 +1,85 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from custom_components.fatsecret.fetch_helpers import async_fetch_in_order
+
+
+async def collect(iterator) -> list:
+    return [item async for item in iterator]
+
+
+@pytest.mark.asyncio
+async def test_results_in_key_order_with_bounded_concurrency():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fetch(key: int) -> int:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Later keys finish first
+        await asyncio.sleep((10 - key) / 1000)
+        in_flight -= 1
+        return key * key
+
+    results = await collect(async_fetch_in_order(list(range(10)), fetch, 3))
+
+    assert results == [(key, key * key) for key in range(10)]
+    assert max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_first_error_in_key_order_cancels_the_rest():
+    started = []
+
+    async def fetch(key: int) -> int:
+        started.append(key)
+        if key in (1, 2):
+            raise ValueError(key)
+        if key > 0:
+            await asyncio.sleep(10)
+        return key
+
+    results = []
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    with pytest.raises(ValueError) as err:
+        async for item in async_fetch_in_order(list(range(20)), fetch, 4):
+            results.append(item)
+
+    assert results == [(0, 0)]
+    assert err.value.args == (1,)
+    # The sleeping calls were cancelled rather than awaited
+    assert loop.time() - start < 1
+    assert len(started) < 20
+
+
+@pytest.mark.asyncio
+async def test_closing_early_cancels_running_calls():
+    cancelled = []
+
+    async def fetch(key: int) -> int:
+        try:
+            await asyncio.sleep(0 if key == 0 else 1)
+        except asyncio.CancelledError:
+            cancelled.append(key)
+            raise
+        return key
+
+    async with aclosing(async_fetch_in_order([0, 1, 2], fetch, 3)) as results:
+        async for key, _ in results:
+            assert key == 0
+            break
+    await asyncio.sleep(0)
+
+    assert cancelled == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_no_keys():
+    async def fetch(key):
+        raise AssertionError
+
+    assert await collect(async_fetch_in_order([], fetch, 4)) == []
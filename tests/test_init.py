@@ -1,8 +1,9 @@
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock, call, patch, MagicMock
 
 import custom_components.fatsecret.__init__ as fatsecret_init
-from custom_components.fatsecret.const import DOMAIN
+from custom_components.fatsecret.config_flow import account_unique_id
+from custom_components.fatsecret.const import CONF_TOKEN, DOMAIN
 
 
 @pytest.mark.asyncio
@@ -23,14 +24,22 @@ async def test_async_setup_entry():
         MockCoordinator.return_value = mock_coordinator
 
         # Simular refresh inicial
-        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.async_restore = AsyncMock(return_value=True)
+        mock_coordinator.async_refresh = MagicMock()
+        mock_coordinator.async_track_day_boundary = MagicMock()
 
         result = await fatsecret_init.async_setup_entry(hass, entry)
 
     # Comprobaciones
     assert result is True
     MockCoordinator.assert_called_once_with(hass, entry)
-    mock_coordinator.async_config_entry_first_refresh.assert_awaited_once()
+    mock_coordinator.async_restore.assert_awaited_once()
+    mock_coordinator.async_track_day_boundary.assert_called_once()
+    # Setup does not wait for the API: the first refresh runs in the background
+    mock_coordinator.async_config_entry_first_refresh.assert_not_awaited()
+    entry.async_create_background_task.assert_called_once_with(
+        hass, mock_coordinator.async_refresh.return_value, f"{DOMAIN}_first_refresh"
+    )
     assert DOMAIN in hass.data
     assert hass.data[DOMAIN][entry.entry_id] == mock_coordinator
     hass.config_entries.async_forward_entry_setups.assert_awaited_once_with(
@@ -79,3 +88,39 @@ async def test_async_unload_entry_integration_not_loaded():
     # No debe lanzar excepción
     result = await fatsecret_init.async_unload_entry(hass, entry)
     assert result is True
+
+
+@pytest.mark.asyncio
+async def test_async_migrate_entry_namespaces_unique_ids():
+    entry = MagicMock()
+    entry.entry_id = "entry_123"
+    entry.version = 1
+    entry.minor_version = 1
+    entry.data = {CONF_TOKEN: "token"}
+    hass = MagicMock()
+
+    legacy = [
+        "fatsecret_calories",
+        "fatsecret_request_budget",
+        "fatsecret_entry_123_fat",
+    ]
+    updates = {}
+
+    async def migrate_entries(hass_, entry_id, callback):
+        for unique_id in legacy:
+            updates[unique_id] = callback(MagicMock(unique_id=unique_id))
+
+    with patch.object(fatsecret_init.er, "async_migrate_entries", migrate_entries):
+        assert await fatsecret_init.async_migrate_entry(hass, entry) is True
+
+    assert updates == {
+        "fatsecret_calories": {"new_unique_id": "fatsecret_entry_123_calories"},
+        "fatsecret_request_budget": {
+            "new_unique_id": "fatsecret_entry_123_request_budget"
+        },
+        "fatsecret_entry_123_fat": None,
+    }
+    assert hass.config_entries.async_update_entry.call_args_list == [
+        call(entry, minor_version=2),
+        call(entry, unique_id=account_unique_id("token"), minor_version=3),
+    ]
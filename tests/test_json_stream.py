@@ -0,0 +1,59 @@
+import json
+import pytest
+
+from custom_components.fatsecret.json_stream import async_parse_food_entries
+
+
+async def chunked(body: bytes, size: int):
+    for i in range(0, len(body), size):
+        yield body[i : i + size]
+
+
+async def parse(payload, size=5):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    entries = []
+    rest = await async_parse_food_entries(chunked(body, size), entries.append)
+    return entries, rest
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 3, 7, 4096])
+async def test_entries_streamed_across_chunks(size):
+    """Entries split at any byte, multibyte characters included, are decoded."""
+    food_entry = [
+        {"food_entry_name": "Crème brûlée 🍮", "calories": "300"},
+        {"food_entry_name": "Tea", "calories": "0", "meal": "Breakfast"},
+    ]
+    payload = {"food_entries": {"food_entry": food_entry}}
+
+    entries, rest = await parse(payload, size)
+
+    assert entries == food_entry
+    assert rest == {"food_entries": {"food_entry": []}}
+
+
+@pytest.mark.asyncio
+async def test_single_entry_object():
+    entries, _ = await parse({"food_entries": {"food_entry": {"calories": "100"}}})
+    assert entries == [{"calories": "100"}]
+
+
+@pytest.mark.asyncio
+async def test_empty_day_and_error_payload():
+    assert await parse({"food_entries": None}) == ([], {"food_entries": None})
+
+    error = {"error": {"code": 9, "message": "Invalid access token"}}
+    assert await parse(error) == ([], error)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"<html>Service Unavailable</html>",
+        b'{"food_entries": {"food_entry": [{"calories": "1"}, {"cal',
+    ],
+)
+async def test_invalid_json(body):
+    with pytest.raises(ValueError):
+        await parse(body)
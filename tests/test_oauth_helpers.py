@@ -0,0 +1,111 @@
+import re
+import timeit
+
+import pytest
+
+from custom_components.fatsecret import oauth_helpers
+from custom_components.fatsecret.oauth_helpers import (
+    NonceProvider,
+    OAuthSigner,
+    oauth_build_authorization_header,
+    oauth_build_base_string,
+    oauth_generate_nonce,
+    oauth_generate_signature,
+)
+
+
+def test_nonces_are_unique_and_url_safe():
+    nonces = [oauth_generate_nonce() for _ in range(10000)]
+
+    assert len(set(nonces)) == len(nonces)
+    assert all(re.fullmatch(r"[0-9a-f]+", nonce) for nonce in nonces)
+
+
+def test_nonce_collision_draws_again(monkeypatch):
+    provider = NonceProvider(window=4)
+    tokens = iter(["aaaa", "aaaa", "bbbb"])
+    monkeypatch.setattr(
+        oauth_helpers.secrets, "token_hex", lambda nbytes: next(tokens)
+    )
+    monkeypatch.setattr(provider, "_counter", iter([0, 0, 0]))
+
+    assert provider.generate() == "aaaa0"
+    # Same random part and counter: rejected, a new nonce is drawn
+    assert provider.generate() == "bbbb0"
+
+
+def test_nonce_window_is_bounded():
+    provider = NonceProvider(window=3)
+    for _ in range(10):
+        provider.generate()
+
+    assert len(provider._recent) == 3
+    assert provider._recent_set == set(provider._recent)
+
+
+STATIC_PARAMS = {
+    "oauth_consumer_key": "key",
+    "oauth_signature_method": "HMAC-SHA1",
+    "oauth_version": "1.0",
+    "oauth_token": "token",
+}
+QUERY_PARAMS = {"format": "json", "date": "20628"}
+URL = "https://platform.fatsecret.com/rest/food-entries/v2"
+
+
+def legacy_authorization_header(nonce: str, timestamp: str) -> str:
+    oauth_params = {
+        **STATIC_PARAMS,
+        "oauth_nonce": nonce,
+        "oauth_timestamp": timestamp,
+    }
+    base_string = oauth_build_base_string(
+        "GET", URL, {**oauth_params, **QUERY_PARAMS}
+    )
+    oauth_params["oauth_signature"] = oauth_generate_signature(
+        base_string, "secret/+=", "token secret"
+    )
+    return oauth_build_authorization_header(oauth_params)
+
+
+def header_params(header: str) -> dict:
+    return dict(re.findall(r'(\w+)="([^"]*)"', header))
+
+
+def test_signer_matches_legacy_helpers():
+    signer = OAuthSigner("GET", URL, STATIC_PARAMS, "secret/+=", "token secret")
+
+    for nonce, timestamp in (("abc123", "1750000000"), ("n o/n+ce", "1")):
+        assert header_params(
+            signer.authorization_header(nonce, timestamp, QUERY_PARAMS)
+        ) == header_params(legacy_authorization_header(nonce, timestamp))
+
+
+@pytest.mark.benchmark
+def test_signer_benchmark():
+    """Micro-benchmark: the precomputed signer beats the per-call helpers."""
+    signer = OAuthSigner("GET", URL, STATIC_PARAMS, "secret/+=", "token secret")
+    iterations = 2000
+
+    legacy = min(
+        timeit.repeat(
+            lambda: legacy_authorization_header("abc123", "1750000000"),
+            number=iterations,
+            repeat=5,
+        )
+    )
+    precomputed = min(
+        timeit.repeat(
+            lambda: signer.authorization_header(
+                "abc123", "1750000000", QUERY_PARAMS
+            ),
+            number=iterations,
+            repeat=5,
+        )
+    )
+
+    print(
+        f"\nOAuth signing, {iterations} requests: helpers {legacy * 1000:.1f} ms, "
+        f"OAuthSigner {precomputed * 1000:.1f} ms ({legacy / precomputed:.1f}x)"
+    )
+    assert precomputed < legacy
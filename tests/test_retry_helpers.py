@@ -0,0 +1,88 @@
+import pytest
+from unittest.mock import AsyncMock
+
+import aiohttp
+
+from custom_components.fatsecret.FatSecretApiClient import (
+    FatSecretApiError,
+    FatSecretBudgetExceeded,
+)
+from custom_components.fatsecret.retry_helpers import (
+    ErrorClass,
+    RetryStats,
+    async_call_with_retry,
+    backoff_delay,
+    classify_error,
+)
+
+
+@pytest.mark.parametrize(
+    "err,expected",
+    [
+        # Already resent once by the client
+        (FatSecretApiError("expired timestamp", code=6), ErrorClass.FATAL),
+        (FatSecretApiError("used nonce", code=7), ErrorClass.RETRYABLE),
+        (FatSecretApiError("invalid signature", code=8), ErrorClass.AUTH),
+        (FatSecretApiError("invalid token", code=9), ErrorClass.AUTH),
+        (FatSecretApiError("missing parameter", code=2), ErrorClass.FATAL),
+        (FatSecretApiError("HTTP error 503", status=503), ErrorClass.RETRYABLE),
+        (FatSecretApiError("HTTP error 429", status=429), ErrorClass.RETRYABLE),
+        (FatSecretApiError("HTTP error 401", status=401), ErrorClass.FATAL),
+        (FatSecretBudgetExceeded("budget"), ErrorClass.FATAL),
+        (aiohttp.ClientConnectionError(), ErrorClass.RETRYABLE),
+        (TimeoutError(), ErrorClass.RETRYABLE),
+        (ValueError("bad"), ErrorClass.FATAL),
+    ],
+)
+def test_classify_error(err, expected):
+    assert classify_error(err) is expected
+
+
+def test_backoff_delay_is_bounded():
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt, 2, 30) <= min(30, 2 * 2**attempt)
+
+
+@pytest.mark.asyncio
+async def test_retry_recovers_from_transient_errors():
+    stats = RetryStats()
+    func = AsyncMock(
+        side_effect=[
+            aiohttp.ClientConnectionError(),
+            FatSecretApiError("used nonce", code=7),
+            {"ok": True},
+        ]
+    )
+
+    result = await async_call_with_retry(func, stats, attempts=3, base_delay=0)
+
+    assert result == {"ok": True}
+    assert func.await_count == 3
+    assert stats == RetryStats(
+        calls=1, retries=2, recovered=1, failures=0, last_error="used nonce"
+    )
+
+
+@pytest.mark.asyncio
+async def test_retry_gives_up_after_attempts():
+    stats = RetryStats()
+    func = AsyncMock(side_effect=FatSecretApiError("HTTP error 500", status=500))
+
+    with pytest.raises(FatSecretApiError):
+        await async_call_with_retry(func, stats, attempts=3, base_delay=0)
+
+    assert func.await_count == 3
+    assert stats.retries == 2
+    assert stats.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_fatal_errors_are_not_retried():
+    stats = RetryStats()
+    func = AsyncMock(side_effect=FatSecretApiError("invalid signature", code=8))
+
+    with pytest.raises(FatSecretApiError):
+        await async_call_with_retry(func, stats, attempts=3, base_delay=0)
+
+    func.assert_awaited_once()
+    assert stats.retries == 0
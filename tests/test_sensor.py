@@ -2,8 +2,20 @@ import pytest
 from unittest.mock import Mock, AsyncMock, MagicMock
 
 from custom_components.fatsecret.sensor import async_setup_entry
-from custom_components.fatsecret.const import DOMAIN, FATSECRET_FIELDS
-from custom_components.fatsecret.FatSecretSensor import FatSecretSensor
+from custom_components.fatsecret.const import (
+    DOMAIN,
+    FATSECRET_FIELDS,
+    FATSECRET_ROLLING_WINDOWS,
+)
+from custom_components.fatsecret.FatSecretMetrics import FatSecretMetrics
+from custom_components.fatsecret.FatSecretSensor import (
+    METRICS_SENSORS,
+    FatSecretBudgetSensor,
+    FatSecretFoodLogSensor,
+    FatSecretMetricsSensor,
+    FatSecretRollingSensor,
+    FatSecretSensor,
+)
 from custom_components.fatsecret.FatSecretCoordinator import FatSecretCoordinator
 
 
@@ -13,9 +25,15 @@ async def test_async_setup_entry_creates_sensors():
     hass = MagicMock()
     entry = Mock()
     entry.entry_id = "test_entry"
+    entry.title = "FatSecret"
 
     # Create a mock coordinator and store in hass.data
     mock_coordinator = Mock(spec=FatSecretCoordinator)
+    mock_coordinator.api = Mock()
+    mock_coordinator.config_entry = entry
+    mock_coordinator.rolling = {days: Mock() for days in FATSECRET_ROLLING_WINDOWS}
+    mock_coordinator.tracked_fields = frozenset({"calories", "protein"})
+    mock_coordinator.metrics = FatSecretMetrics()
     hass.data = {}
     hass.data[DOMAIN] = {entry.entry_id: mock_coordinator}
 
@@ -28,15 +46,41 @@ async def test_async_setup_entry_creates_sensors():
     async_add_entities.assert_called_once()
     sensors_added = async_add_entities.call_args[0][0]
 
-    # There should be one sensor per field
-    assert len(sensors_added) == len(FATSECRET_FIELDS)
+    # One sensor per field, one rolling sensor per field and window, plus the
+    # food log, the request budget and the request metrics
+    fields = len(FATSECRET_FIELDS)
+    windows = len(FATSECRET_ROLLING_WINDOWS)
+    metrics = len(METRICS_SENSORS)
+    assert len(sensors_added) == fields * (1 + windows) + 2 + metrics
+    assert isinstance(sensors_added[-metrics - 2], FatSecretFoodLogSensor)
+    assert isinstance(sensors_added[-metrics - 1], FatSecretBudgetSensor)
+    diagnostics = sensors_added[-metrics:]
+    assert all(isinstance(sensor, FatSecretMetricsSensor) for sensor in diagnostics)
+    assert not any(sensor.entity_registry_enabled_default for sensor in diagnostics)
 
-    # All sensors should be instances of FatSecretSensor
-    for sensor in sensors_added:
+    rolling = sensors_added[fields : -metrics - 2]
+    assert all(isinstance(sensor, FatSecretRollingSensor) for sensor in rolling)
+    assert not any(sensor.entity_registry_enabled_default for sensor in rolling)
+
+    # Entities of different entries never collide
+    unique_ids = [sensor.unique_id for sensor in sensors_added]
+    assert len(set(unique_ids)) == len(unique_ids)
+    assert all(uid.startswith(f"{DOMAIN}_test_entry_") for uid in unique_ids)
+
+    # All field sensors should be instances of FatSecretSensor
+    for sensor in sensors_added[:fields]:
         assert isinstance(sensor, FatSecretSensor)
         # Each sensor should reference the mock coordinator
         assert sensor.coordinator == mock_coordinator
 
+    # Untracked nutrients get a sensor, disabled by default
+    enabled = {
+        sensor.unique_id.rsplit("_", 1)[-1]
+        for sensor in sensors_added[:fields]
+        if sensor.entity_registry_enabled_default
+    }
+    assert enabled == {"calories", "protein"}
+
 
 @pytest.mark.asyncio
 async def test_async_setup_entry_no_coordinator():
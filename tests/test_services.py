@@ -0,0 +1,239 @@
+import asyncio
+import pytest
+from datetime import date as date_cls
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+from custom_components.fatsecret.FatSecretCoordinator import FatSecretCoordinator
+from custom_components.fatsecret.FatSecretRateLimiter import FatSecretRequestBudget
+from custom_components.fatsecret.FatSecretApiClient import FatSecretBudgetExceeded
+from custom_components.fatsecret.services import (
+    GET_FOOD_LOG_SCHEMA,
+    GET_NUTRITION_SCHEMA,
+    async_setup_services,
+)
+from custom_components.fatsecret.const import (
+    ATTR_FOOD_LOG,
+    DOMAIN,
+    FATSECRET_DEFAULT_FETCH_CONCURRENCY,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+from .test_FatSecretCoordinator import MockConfigEntry
+
+
+def setup_services(*entry_ids: str) -> tuple[MagicMock, dict]:
+    """Register the services on a mocked hass with one coordinator per entry."""
+    hass = MagicMock()
+    coordinators = {}
+    for entry_id in entry_ids:
+        entry = MockConfigEntry()
+        entry.entry_id = entry_id
+        coordinators[entry_id] = FatSecretCoordinator(hass, entry)
+    hass.data = {DOMAIN: coordinators}
+    async_setup_services(hass)
+    return hass, coordinators
+
+
+def get_service_handler(hass: MagicMock, service: str):
+    """Return the handler registered for a service on a mocked hass."""
+    for call in hass.services.async_register.call_args_list:
+        if call[0][1] == service:
+            # handler is the 3rd positional arg passed to async_register
+            return call[0][2]
+    raise AssertionError(f"Service {service} was not registered")
+
+
+@pytest.mark.asyncio
+async def test_services_registered_once_for_all_entries():
+    hass, _ = setup_services("entry_1", "entry_2")
+
+    registered = [c[0][:2] for c in hass.services.async_register.call_args_list]
+    assert registered == [
+        (DOMAIN, "update_fatsecret"),
+        (DOMAIN, "backfill_fatsecret"),
+        (DOMAIN, "get_food_log"),
+        (DOMAIN, "get_nutrition"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_service_targets_entries():
+    hass, coordinators = setup_services("entry_1", "entry_2")
+    for coordinator in coordinators.values():
+        coordinator.async_refresh = AsyncMock()
+    handler = get_service_handler(hass, "update_fatsecret")
+
+    await handler(Mock(data={}))
+    assert all(c.async_refresh.await_count == 1 for c in coordinators.values())
+
+    await handler(Mock(data={"config_entry_id": "entry_2"}))
+    assert coordinators["entry_1"].async_refresh.await_count == 1
+    assert coordinators["entry_2"].async_refresh.await_count == 2
+
+    with pytest.raises(ServiceValidationError):
+        await handler(Mock(data={"config_entry_id": "unknown"}))
+
+
+@pytest.mark.asyncio
+async def test_services_without_loaded_entry():
+    hass, _ = setup_services()
+
+    with pytest.raises(ServiceValidationError):
+        await get_service_handler(hass, "update_fatsecret")(Mock(data={}))
+
+
+@pytest.mark.asyncio
+async def test_backfill_service_validates_range():
+    hass, coordinators = setup_services("entry_1")
+    coordinator = coordinators["entry_1"]
+    coordinator.async_backfill = AsyncMock()
+    handler = get_service_handler(hass, "backfill_fatsecret")
+
+    call = Mock(data={"start_date": date_cls(2020, 1, 1)})
+    with pytest.raises(ServiceValidationError):
+        await handler(call)
+
+    call = Mock(
+        data={"start_date": date_cls(2025, 2, 1), "end_date": date_cls(2025, 1, 1)}
+    )
+    with pytest.raises(ServiceValidationError):
+        await handler(call)
+
+    call = Mock(
+        data={"start_date": date_cls(2025, 1, 1), "end_date": date_cls(2025, 1, 31)}
+    )
+    await handler(call)
+    coordinator.async_backfill.assert_awaited_once_with(
+        date_cls(2025, 1, 1), date_cls(2025, 1, 31)
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_service_debounced_when_budget_low():
+    hass, coordinators = setup_services("entry_1")
+    coordinator = coordinators["entry_1"]
+    coordinator.async_refresh = AsyncMock()
+    coordinator.async_request_refresh = AsyncMock()
+    coordinator.api.budget = FatSecretRequestBudget(10, 100)
+    for _ in range(10):
+        coordinator.api.budget.try_acquire()
+
+    await get_service_handler(hass, "update_fatsecret")(Mock(data={}))
+
+    coordinator.async_request_refresh.assert_awaited_once()
+    coordinator.async_refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_update_calls_share_one_refresh():
+    """Service calls made while a refresh is in flight are coalesced."""
+    hass, coordinators = setup_services("entry_1")
+    coordinator = coordinators["entry_1"]
+    release = asyncio.Event()
+
+    async def slow_refresh():
+        await release.wait()
+
+    coordinator.async_refresh = AsyncMock(side_effect=slow_refresh)
+    handler = get_service_handler(hass, "update_fatsecret")
+
+    calls = [asyncio.create_task(handler(Mock(data={}))) for _ in range(5)]
+    while coordinator.forced_refreshes_coalesced < 4:
+        await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*calls)
+
+    coordinator.async_refresh.assert_awaited_once()
+    assert coordinator.forced_refreshes_executed == 1
+    assert coordinator.forced_refreshes_coalesced == 4
+
+    # Once finished, the next call triggers a new refresh
+    await handler(Mock(data={}))
+    assert coordinator.async_refresh.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_food_log_pages_cached_entries():
+    """Entries are read from memory and the diary cache, a page at a time."""
+    hass, coordinators = setup_services("entry_1")
+    coordinator = coordinators["entry_1"]
+    coordinator.api.async_get_food_entries = AsyncMock()
+    day = date_cls(2025, 1, 1)
+    coordinator.diary.set(
+        day,
+        [
+            {"food_entry_id": str(i), "food_entry_name": f"Food {i}", "calories": "10"}
+            for i in range(5)
+        ],
+    )
+    handler = get_service_handler(hass, "get_food_log")
+
+    call = Mock(data=GET_FOOD_LOG_SCHEMA({"date": "2025-01-01", "offset": 3}))
+    response = (await handler(call))["entry_1"]
+
+    assert response["cached"] is True
+    assert response["total"] == 5
+    assert [entry["id"] for entry in response["entries"]] == ["3", "4"]
+    assert response["entries"][0]["name"] == "Food 3"
+    assert response["entries"][0]["calories"] == 10.0
+
+    # Today's entries are those of the served totals
+    coordinator._fingerprint_day = date_cls.today()
+    coordinator.data = {ATTR_FOOD_LOG: ()}
+    call = Mock(data=GET_FOOD_LOG_SCHEMA({"date": date_cls.today().isoformat()}))
+    assert (await handler(call))["entry_1"]["cached"] is True
+
+    call = Mock(data=GET_FOOD_LOG_SCHEMA({"date": "2024-01-01"}))
+    response = (await handler(call))["entry_1"]
+    assert response["cached"] is False
+    assert response["entries"] == []
+    coordinator.api.async_get_food_entries.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_nutrition_fetches_missing_days_concurrently():
+    """Cached days are answered locally, missing ones fetched a few at a time."""
+    hass, coordinators = setup_services("entry_1")
+    coordinator = coordinators["entry_1"]
+    coordinator.diary.set(date_cls(2025, 1, 1), [{"calories": "100", "protein": "5"}])
+    in_flight = []
+    max_in_flight = 0
+
+    async def get_food_entries(day, on_entry):
+        nonlocal max_in_flight
+        in_flight.append(day)
+        max_in_flight = max(max_in_flight, len(in_flight))
+        await asyncio.sleep(0)
+        in_flight.remove(day)
+        on_entry({"calories": "200", "protein": "10"})
+
+    coordinator.api.async_get_food_entries = AsyncMock(side_effect=get_food_entries)
+    handler = get_service_handler(hass, "get_nutrition")
+
+    data = {"start_date": "2025-01-01", "end_date": "2025-01-10", "fields": "protein"}
+    response = (await handler(Mock(data=GET_NUTRITION_SCHEMA(data))))["entry_1"]
+
+    assert response["fetched_days"] == 9
+    assert 1 < max_in_flight <= FATSECRET_DEFAULT_FETCH_CONCURRENCY
+    assert len(response["days"]) == 10
+    assert response["days"]["2025-01-01"] == {"protein": 5.0}
+    assert response["totals"] == {"protein": 95.0}
+    assert response["daily_average"] == {"protein": 9.5}
+
+    # Everything is cached now: no more requests
+    await handler(Mock(data=GET_NUTRITION_SCHEMA(data)))
+    assert coordinator.api.async_get_food_entries.await_count == 9
+
+
+@pytest.mark.asyncio
+async def test_get_nutrition_budget_exhausted():
+    hass, coordinators = setup_services("entry_1")
+    coordinator = coordinators["entry_1"]
+    coordinator.api.async_get_food_entries = AsyncMock(
+        side_effect=FatSecretBudgetExceeded("exhausted")
+    )
+    handler = get_service_handler(hass, "get_nutrition")
+
+    data = {"start_date": "2025-01-01", "end_date": "2025-01-03"}
+    with pytest.raises(HomeAssistantError):
+        await handler(Mock(data=GET_NUTRITION_SCHEMA(data)))
@@ -0,0 +1,58 @@
+from datetime import date as date_cls
+from unittest.mock import MagicMock, patch
+
+from custom_components.fatsecret import statistics_helpers
+from custom_components.fatsecret.const import FATSECRET_FIELDS
+
+
+ENTRY = MagicMock(entry_id="01JABCDEF", title="FatSecret")
+
+DAILY_TOTALS = {
+    date_cls(2026, 6, 2): {"calories": 1800.0},
+    date_cls(2026, 6, 1): {"calories": 2000.0},
+}
+
+
+def test_build_field_statistics_cumulative_sum():
+    metadata, rows = statistics_helpers.build_field_statistics(
+        ENTRY, "calories", DAILY_TOTALS
+    )
+
+    assert metadata["statistic_id"] == "fatsecret:01jabcdef_calories"
+    assert metadata["name"] == "FatSecret Calories"
+    assert metadata["source"] == "fatsecret"
+    assert metadata["has_sum"] is True
+    assert metadata["unit_of_measurement"] == FATSECRET_FIELDS["calories"]["unit"]
+
+    # Rows are ordered by day, start at midnight and accumulate the sum
+    assert [row["start"].date() for row in rows] == sorted(DAILY_TOTALS)
+    assert all(row["start"].hour == 0 for row in rows)
+    assert [row["state"] for row in rows] == [2000.0, 1800.0]
+    assert [row["sum"] for row in rows] == [2000.0, 3800.0]
+
+
+def test_import_daily_statistics_one_batch_per_field():
+    hass = MagicMock()
+    hass.config.components = {"recorder"}
+
+    with patch.object(
+        statistics_helpers, "async_add_external_statistics"
+    ) as mock_add:
+        statistics_helpers.async_import_daily_statistics(hass, ENTRY, DAILY_TOTALS)
+
+    assert mock_add.call_count == len(FATSECRET_FIELDS)
+    for call in mock_add.call_args_list:
+        assert len(call[0][2]) == len(DAILY_TOTALS)
+
+
+def test_import_daily_statistics_without_recorder():
+    hass = MagicMock()
+    hass.config.components = set()
+
+    with patch.object(
+        statistics_helpers, "async_add_external_statistics"
+    ) as mock_add:
+        statistics_helpers.async_import_daily_statistics(hass, ENTRY, DAILY_TOTALS)
+
+    mock_add.assert_not_called()
+